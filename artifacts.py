@@ -0,0 +1,249 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Content-addressed output store and streaming netlist writer for schematic.py and the docker run script.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Each distinct file content is kept once as <out>/objects/ab/cdef... (SHA-256, read-only). A run is <out>/runs/<run>/ holding hardlinks to its objects plus manifest.json (name -> sha256, size), so reruns and variants only add the files that changed. Where hardlinks are not possible the files are copied.
+Note: <out>/<name> is a writable copy of the latest run's file, never a link: the board is opened and saved there, and the container runs as root, which ignores the objects' read-only bit.
+Note: schematic.py writes the list of files its stages produced (write_list); `publish --list` reads it, so new stages are published without touching the run script.
+Note: write_netlist() writes the KiCad netlist one sheet/component/net at a time with skidl's own per-element generators (sheets by path, parts by ref, nets by name) through a hashing Writer, so peak memory does not grow with the design. Untagged parts get their ref as tag instead of a random one and the wall-clock date skidl puts in the header is left out (SOURCE_DATE_EPOCH sets it), so an unchanged design gives the same bytes and the same object.
+Note: The schematic comes from skidl.generate_schematic() as a whole file; it is stored by streaming hash like every other artifact.
+Usage: python artifacts.py publish out_dir run [--list outputs_file] [file...] | gc out_dir [--keep N]
+"""
+
+import builtins
+import datetime
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import stat
+import sys
+import time
+
+import libcache
+
+MANIFEST = 'manifest.json'
+
+
+class Writer:
+    """Text file written in chunks while hashing it; it replaces path only when closed without an error"""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp = f'{path}.{os.getpid()}.tmp'
+        self.sha256 = None
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = open(self.tmp, 'wb')
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self._hash.update(data)
+        self._file.write(data)
+        self.size += len(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, error, tb):
+        self._file.close()
+        if kind is not None:
+            os.remove(self.tmp)
+            return False
+        os.replace(self.tmp, self.path)
+        self.sha256 = self._hash.hexdigest()
+        return False
+
+
+def _element(out, sexp, level):
+    """Write one skidl Sexp (quoted the way skidl quotes its netlist) indented to a nesting level"""
+    sexp.add_quotes(lambda s: True)
+    pad = '  ' * level
+    out.write(''.join(pad + line + '\n' for line in sexp.to_str().splitlines()))
+
+
+def write_netlist(path, circuit=None):
+    """KiCad netlist of a circuit streamed to path (same content as skidl.generate_netlist, minus the date)"""
+    import skidl
+    from skidl.logger import active_logger
+    from skidl.scriptinfo import get_script_dir, scriptinfo
+    from skidl.tools import tool_modules
+
+    circuit = circuit or builtins.default_circuit
+    gen = importlib.import_module(tool_modules[skidl.config.tool].__name__ + '.gen_netlist')
+    active_logger.error.reset()
+    active_logger.warning.reset()
+    circuit.merge_net_names()
+    circuit.check_for_empty_footprints()
+    for part in circuit.parts:
+        if not getattr(part, 'tag', None):  # skidl would draw a random tag, and the tag seeds the part's tstamps
+            part.tag = part.ref
+    circuit.check_tags()
+    try:
+        from skidl.design_class import NetClass
+    except ImportError:  # skidl before net classes
+        NetClass = None
+    if NetClass is not None:
+        if 'Default' not in circuit.netclasses:
+            NetClass('Default', circuit=circuit, priority=0)
+        for net in circuit.get_nets():
+            net.netclasses = 'Default'
+    kwargs = {'track_src': circuit.track_src, 'track_abs_path': circuit.track_abs_path}
+    info = scriptinfo()
+    source = os.path.join(info['dir'], info['source'])
+    source = os.path.abspath(source) if circuit.track_abs_path else os.path.relpath(source, get_script_dir())
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    date = time.strftime('%m/%d/%Y %I:%M %p', time.gmtime(int(epoch))) if epoch else ''
+    quote = lambda s: '"' + str(s).replace('\\', '\\\\').replace('"', '\\"') + '"'
+    with Writer(path) as out:
+        # pcbnew wants the space after 'export' (see skidl's gen_netlist)
+        out.write(f'(export \n  (version "D")\n  (design\n    (source {quote(source)})\n    (date {quote(date)})\n'
+                  f'    (tool {quote(f"SKiDL ({skidl.__version__})")})\n')
+        for num, node in enumerate(sorted(circuit.get_node_names()), 1):  # skidl keeps them in a set
+            _element(out, gen.gen_netlist_sheet(node, num, source, **kwargs), 2)
+        out.write('  )\n  (components\n')
+        for part in sorted(circuit.parts, key=lambda p: str(p.ref)):
+            _element(out, gen.gen_netlist_comp(part, **kwargs), 2)
+        out.write('  )\n  (nets\n')
+        for code, net in enumerate(sorted(circuit.get_nets(), key=lambda n: str(n.name)), 1):
+            net.code = code
+            _element(out, gen.gen_netlist_net(net, **kwargs), 2)
+        out.write('  )\n)\n')
+    active_logger.report_summary('generating netlist')
+    circuit.backup_parts()  # Like skidl.generate_netlist(do_backup=True)
+    return out.sha256
+
+
+def _link(src, dst):
+    """Hardlink src to dst (a copy across filesystems), replacing dst atomically"""
+    if os.path.isfile(dst) and os.path.samefile(src, dst):  # Renaming a link over itself would leave tmp behind
+        return
+    tmp = f'{dst}.{os.getpid()}.tmp'
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _copy(src, dst):
+    """Writable copy of src at dst, replacing dst atomically"""
+    tmp = f'{dst}.{os.getpid()}.tmp'
+    shutil.copyfile(src, tmp)  # Not copymode: objects are read-only
+    os.replace(tmp, dst)
+
+
+def write_list(path, files):
+    """One produced file per line, each once, in order"""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.writelines(f'{name}\n' for name in dict.fromkeys(files))
+    os.replace(tmp, path)
+
+
+def read_list(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+class Store:
+    """Content-addressed objects under root/objects, linked into root/runs/<run>/ and copied to root/ (latest)"""
+
+    def __init__(self, root):
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.runs = os.path.join(root, 'runs')
+
+    def object(self, sha):
+        return os.path.join(self.objects, sha[:2], sha[2:])
+
+    def put(self, path):
+        """Add a file's content; returns (sha256, True if it was not stored yet)"""
+        sha = libcache.file_sha256(path)
+        obj = self.object(sha)
+        if os.path.isfile(obj):
+            return sha, False
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        tmp = f'{obj}.{os.getpid()}.tmp'
+        shutil.copyfile(path, tmp)
+        os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)  # Shared by every link; never edit in place
+        os.replace(tmp, obj)
+        return sha, True
+
+    def publish(self, run, paths):
+        """Store files under their base names as one run; returns its manifest"""
+        run_dir = os.path.join(self.runs, run)
+        os.makedirs(run_dir, exist_ok=True)
+        files, new = {}, []
+        for path in paths:
+            name = os.path.basename(path)
+            sha, added = self.put(path)
+            files[name] = {'sha256': sha, 'size': os.path.getsize(path)}
+            if added:
+                new.append(name)
+            _link(self.object(sha), os.path.join(run_dir, name))
+            _copy(self.object(sha), os.path.join(self.root, name))
+        manifest = {'run': run, 'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                    'files': files, 'new': new}
+        tmp = os.path.join(run_dir, f'{MANIFEST}.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, os.path.join(run_dir, MANIFEST))
+        return manifest
+
+    def manifests(self):
+        """Manifests of every run, oldest first (run names sort by time)"""
+        found = []
+        for run in sorted(os.listdir(self.runs)) if os.path.isdir(self.runs) else []:
+            try:
+                with open(os.path.join(self.runs, run, MANIFEST), encoding='utf-8') as f:
+                    found.append(json.load(f))
+            except (OSError, ValueError):  # A run being written or broken by hand
+                continue
+        return found
+
+    def gc(self, keep=None):
+        """Drop all but the newest keep runs, then the objects no manifest refers to; returns (runs, objects, bytes)"""
+        runs = self.manifests()
+        dropped = runs[:-keep] if keep else []
+        for m in dropped:
+            shutil.rmtree(os.path.join(self.runs, m['run']), ignore_errors=True)
+        live = {f['sha256'] for m in runs[len(dropped):] for f in m['files'].values()}
+        dead = []
+        for sub in os.listdir(self.objects) if os.path.isdir(self.objects) else []:
+            dead += [os.path.join(self.objects, sub, name) for name in os.listdir(os.path.join(self.objects, sub))
+                     if sub + name not in live and not name.endswith('.tmp')]
+        freed = sum(os.path.getsize(path) for path in dead)
+        for path in dead:
+            os.remove(path)
+        return len(dropped), len(dead), freed
+
+
+def summary(manifest, store):
+    """One line: files, bytes and what this run added to the store"""
+    files = manifest['files']
+    total = sum(f['size'] for f in files.values())
+    added = sum(files[n]['size'] for n in manifest['new'])
+    print(f"Artifacts: {len(files)} files ({total / 1e6:.2f} MB), {len(manifest['new'])} new ({added / 1e6:.2f} MB) "
+          f"in {store.objects} (run {manifest['run']})")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == 'publish':
+        store, run, files = Store(args[1]), args[2], args[3:]
+        if '--list' in files:
+            at = files.index('--list')
+            files = files[:at] + read_list(files[at + 1]) + files[at + 2:]
+        missing = [f for f in files if not os.path.isfile(f)]
+        if missing:
+            print(f"Artifacts: not found, skipped: {', '.join(missing)}")
+        summary(store.publish(run, [f for f in files if f not in missing]), store)
+    elif len(args) >= 2 and args[0] == 'gc':
+        keep = int(args[args.index('--keep') + 1]) if '--keep' in args else None
+        runs, objects, freed = Store(args[1]).gc(keep)
+        print(f"Artifacts: removed {runs} runs and {objects} objects ({freed / 1e6:.2f} MB)")
+    else:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
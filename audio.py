@@ -0,0 +1,110 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Reusable audio channel for schematic.py: TAC5212 codec with input protection, output low-pass filter and jacks.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: audio_channel() is a skidl subcircuit instantiated once per stereo codec. Refs are allocated by skidl (channel 0 keeps U3/J2/J3); net names of channel k > 0 get a _CH<k> suffix.
+Note: All codecs share the McBSP link as a TDM bus (CLKX -> BCLK, FSX -> FSYNC, DX -> DIN, DOUT -> DR; DOUT tri-states outside its slots) and the I2C bus behind the DSP-side series resistors.
+Run `python audio.py` to time build, ERC and netlist generation for 1 to 64 channels.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import skidl
+
+import bus
+
+CODEC_FOOTPRINT = 'Package_QFN:VQFN-24_4x4mm_P0.5mm'
+JACK_FOOTPRINT = 'Connector_Audio:Jack_3.5mm_PJ31060-I_Horizontal'
+
+
+@skidl.subcircuit
+def audio_channel(k, libs, link, rails, n_decap=10):
+    """
+    One stereo channel: codec, decoupling, ferrite + TVS input protection, RC output LPF and 3.5mm jacks.
+    link: nets 'bclk', 'fsync', 'dx', 'dr', 'scl', 'sda'; rails: nets 'vcc', 'agnd', 'dgnd'.
+    Returns the codec part.
+    """
+    import pinout
+
+    pin, pins = bus.pin, bus.pins
+    sfx = f'_CH{k}' if k else ''
+    first = k == 0
+    codec = pinout.make_part('TAC5212', footprint=CODEC_FOOTPRINT, ref='U3' if first else None)
+    j_in = libs.part('Connector', 'Conn_01x03', footprint=JACK_FOOTPRINT, ref='J2' if first else None)  # Stereo input
+    j_out = libs.part('Connector', 'Conn_01x03', footprint=JACK_FOOTPRINT, ref='J3' if first else None)  # Stereo output
+    fb_l, fb_r = (libs.part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
+                  for _ in range(2))
+    d_in, d_out_l, d_out_r = (libs.part('Diode', 'TVS', footprint='Diode_SMD:D_SOD-123') for _ in range(3))
+    r_lpf = [libs.part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric') for _ in range(2)]
+    c_lpf = [libs.part('Device', 'C', value='0.1u', footprint='Capacitor_SMD:C_0402_1005Metric') for _ in range(2)]
+    decaps = [libs.part('Device', 'C', value='0.1u', footprint='Capacitor_SMD:C_0402_1005Metric') for _ in range(n_decap)]
+    c_dreg, c_vref = (libs.part('Device', 'C', value='1u', footprint='Capacitor_SMD:C_0402_1005Metric') for _ in range(2))
+
+    guitar_in_l = skidl.Net('GUITAR_IN_L' + sfx)
+    guitar_in_r = skidl.Net('GUITAR_IN_R' + sfx)
+    audio_out_l = skidl.Net('AUDIO_OUT_L' + sfx)
+    audio_out_r = skidl.Net('AUDIO_OUT_R' + sfx)
+    lpf_out_l = skidl.Net('LPF_OUT_L' + sfx)
+    lpf_out_r = skidl.Net('LPF_OUT_R' + sfx)
+
+    rails['vcc'] += pin(codec, 'AVDD'), pin(codec, 'IOVDD'), [c[1] for c in decaps]
+    rails['agnd'] += pins(codec, 'AGND'), [c[2] for c in decaps]
+    rails['dgnd'] += c_dreg[2], c_vref[2]
+    c_dreg[1] += pin(codec, 'DREG')
+    c_vref[1] += pin(codec, 'VREF')
+    link['bclk'] += pin(codec, 'BCLK')
+    link['fsync'] += pin(codec, 'FSYNC')
+    link['dx'] += pin(codec, 'DIN')
+    link['dr'] += pin(codec, 'DOUT')
+    link['scl'] += pin(codec, 'SCL')
+    link['sda'] += pin(codec, 'SDA')
+    guitar_in_l += fb_l[1], j_in['1'], d_in[1]  # Ferrite on input
+    guitar_in_r += fb_r[1], j_in['2'], d_in[2]
+    fb_l[2] += pin(codec, 'IN1P')
+    fb_r[2] += pin(codec, 'IN2P')
+    rails['agnd'] += pin(codec, 'IN1M'), pin(codec, 'IN2M'), pin(codec, 'OUT1M'), pin(codec, 'OUT2M')
+    audio_out_l += pin(codec, 'OUT1P'), r_lpf[0][1], d_out_l[1]
+    audio_out_r += pin(codec, 'OUT2P'), r_lpf[1][1], d_out_r[1]
+    lpf_out_l += r_lpf[0][2], c_lpf[0][1], j_out['1']
+    lpf_out_r += r_lpf[1][2], c_lpf[1][1], j_out['2']
+    rails['agnd'] += c_lpf[0][2], c_lpf[1][2]  # LPF shunt caps return to AGND
+    return codec
+
+
+def benchmark(channels=(1, 2, 4, 8, 16, 32, 64)):
+    """Build, ERC and netlist time of the full design per channel count; returns rows of timings"""
+    import outputs
+    import schematic
+
+    rows = []
+    netlist = os.path.join(tempfile.gettempdir(), 'echoforge_audio_bench.net')
+    stdout = sys.stdout
+    for n in channels:
+        sys.stdout = open(os.devnull, 'w')  # skidl and the report helpers are chatty
+        try:
+            t0 = time.perf_counter()
+            schematic.build_design({'n_audio_channels': n})
+            t1 = time.perf_counter()
+            skidl.ERC()
+            t2 = time.perf_counter()
+            outputs.generate_netlist(netlist)
+            t3 = time.perf_counter()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        rows.append((n, t1 - t0, t2 - t1, t3 - t2))
+        print(f"{n:3d} channels: build {t1 - t0:6.2f} s, ERC {t2 - t1:6.2f} s, netlist {t3 - t2:6.2f} s, "
+              f"{(t3 - t0) / n * 1e3:7.1f} ms/channel")
+    # Linear scaling: per-channel cost of the largest run vs the slope between the two largest runs
+    (n0, *a), (n1, *b) = rows[-2], rows[-1]
+    slope = (sum(b) - sum(a)) / (n1 - n0)
+    print(f"Marginal cost {slope * 1e3:.1f} ms/channel between {n0} and {n1} channels")
+    return rows
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,275 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Frequency response and component-tolerance check of the analog audio paths, traced from the codec pins to the jacks.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: From each codec input/output pin the walk follows series parts (R, ferrite) net by net to a connector and collects the parts from each net to ground as shunts, so every channel of every codec is found without naming refs. Models and limits come from parts/audiopath.json.
+Note: A path is a ladder of ABCD matrices. Paths with the same ladder shape are stacked into (paths, trials, frequencies) arrays and evaluated in one pass: trial 0 is nominal, the others draw every part within tolerance.
+Note: Reported per path: gain at ref_hz, -3 dB corners (from the in-band peak), worst deviation over the band and its Monte Carlo spread, P(deviation over limit), and the thermal noise of the path's own parts against the codec's dynamic range.
+Run `python audiopath.py [trials]` to build the design and write the report standalone.
+"""
+
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from pdn import parse_farads
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'audiopath.json')
+REPORT_FILE = 'audiopath_report.json'
+FREQS = np.logspace(1, 5, 801)  # 10 Hz - 100 kHz, 200 points per decade
+TRIALS = 1000
+BATCH = 1 << 22  # Complex values per array in one evaluation
+BOLTZMANN = 1.380649e-23
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz  # trapz before NumPy 2.0
+
+_OHMS_RE = re.compile(r'^\s*([0-9.]+)\s*([mkKM]?)\s*(?:R|Ω|ohms?)?\s*$')
+_OHMS_SI = {'m': 1e-3, '': 1.0, 'k': 1e3, 'K': 1e3, 'M': 1e6}
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_ohms(value):
+    """'4.7k' -> 4700.0, or None if not a resistance"""
+    m = _OHMS_RE.match(value or '')
+    return float(m.group(1)) * _OHMS_SI[m.group(2)] if m else None
+
+
+def _element(snap, cfg, part, kind):
+    """Ladder element for a part: {'kind', 'symbol', 'model', 'x' (nominal), 'tol', 'desc'}, or None if its value is unknown"""
+    spec = cfg['elements'][snap.part_name[part]]
+    value = snap.part_value[part]
+    if spec['model'] == 'r':
+        x = parse_ohms(value) or spec.get('r_ohm')
+    elif spec['model'] == 'c':
+        x = parse_farads(value) or spec.get('c_f')
+    else:
+        x = 1.0  # Ferrites scale their whole model
+    if x is None:
+        return None
+    return {'kind': kind, 'symbol': snap.part_name[part], 'model': spec['model'], 'x': x, 'tol': spec.get('tol_pct', 0), 'spec': spec,
+            'desc': f"{snap.part_ref[part]} {value}" + (' shunt' if kind == 'shunt' else '')}
+
+
+def walk(snap, cfg, pin):
+    """Elements from a codec pin out to a connector (codec side first), the connector pin (or None) and findings"""
+    ground = {i for i, name in enumerate(snap.net_name) if name in cfg['ground_nets']}
+    net, skip, seen = snap.pin_net[pin], snap.pin_part[pin], set()
+    elements, findings, terminal = [], [], None
+    while net >= 0 and net not in seen and terminal is None:
+        seen.add(net)
+        series = []
+        for p in snap.net_pins(net):
+            part = snap.pin_part[p]
+            name = snap.part_name[part]
+            if part == skip:
+                continue
+            if name in cfg['connectors']:
+                terminal = p
+                continue
+            others = [q for q in snap.part_pins(part) if q != p]
+            if name not in cfg['elements'] or len(others) != 1:
+                findings.append(f"{snap.part_ref[part]} ({name}) on {snap.net_name[net]} is not modelled")
+                continue
+            other = snap.pin_net[others[0]]
+            if other < 0:
+                findings.append(f"{snap.part_ref[part]} ({name}) pin {snap.pin_num[others[0]]} is unconnected, "
+                                f"so it does not load {snap.net_name[net]}")
+            elif other in ground or cfg['elements'][name]['series'] and other not in seen:
+                kind = 'shunt' if other in ground else 'series'
+                element = _element(snap, cfg, part, kind)
+                if element is None:
+                    findings.append(f"{snap.part_ref[part]} ({name}) has no usable value '{snap.part_value[part]}'")
+                elif kind == 'shunt':
+                    elements.append(element)
+                else:
+                    series.append((element, part, other))
+            else:
+                findings.append(f"{snap.part_ref[part]} ({name}) bridges "
+                                f"{' and '.join(sorted((snap.net_name[net], snap.net_name[other])))}; not modelled")
+        if terminal is None and len(series) == 1:
+            element, skip, net = series[0]
+            elements.append(element)
+        elif terminal is None:
+            findings.append(f"{snap.pin_desc(pin)}: {'branches' if series else 'ends'} at {snap.net_name[net]} "
+                            "without reaching a connector")
+            break
+    return elements, terminal, findings
+
+
+def trace(snap, cfg):
+    """Paths of every codec: [{'name', 'direction', 'terminal', 'elements' (source to load)}], findings"""
+    codec = cfg['codec']
+    paths, findings = [], []
+    for part in range(snap.n_parts):
+        if snap.part_name[part] != codec['part']:
+            continue
+        for pin in snap.part_pins(part):
+            direction = 'in' if snap.pin_name[pin] in codec['inputs'] else \
+                'out' if snap.pin_name[pin] in codec['outputs'] else None
+            if direction is None:
+                continue
+            elements, terminal, notes = walk(snap, cfg, pin)
+            findings += notes
+            if terminal is None:
+                continue
+            paths.append({'name': f"{snap.part_ref[part]} {snap.pin_name[pin]}", 'direction': direction,
+                          'terminal': f"{snap.part_ref[snap.pin_part[terminal]]}/{snap.pin_num[terminal]}",
+                          'elements': elements[::-1] if direction == 'in' else elements})
+    return paths, list(dict.fromkeys(findings))
+
+
+def _end(spec, s):
+    """(r + jwl) || c of a source or load, per frequency"""
+    z = spec['r_ohm'] + s * spec.get('l_h', 0)
+    return z / (1 + s * spec.get('c_f', 0) * z)
+
+
+def _immittance(element, x, s):
+    """Impedance of a series element or admittance of a shunt one, for sampled values x (..., 1) at s = jw (F,)"""
+    series = element['kind'] == 'series'
+    if element['model'] == 'r':
+        return x if series else 1 / x
+    if element['model'] == 'c':
+        return 1 / (s * x) if series else s * x
+    spec = element['spec']
+    z = spec['rdc_ohm'] + 1 / (1 / (s * spec['l_h'] * x) + 1 / (spec['r_ohm'] * x) + s * spec['c_f'])
+    return z if series else 1 / z
+
+
+def _scales(rng, tol, shape):
+    """Tolerance multipliers (3 sigma = tol %), column 0 nominal"""
+    k = np.ones(shape) if not tol or rng is None else np.clip(rng.normal(1.0, tol / 300.0, shape), 0.01, None)
+    k[:, 0] = 1.0
+    return k[..., None]
+
+
+def responses(paths, cfg, trials=TRIALS, freqs=FREQS, seed=0):
+    """Yield (path indexes, transfer function (rows, trials + 1, F), nominal Thevenin impedance at the load (rows, F))"""
+    rng = np.random.default_rng(seed)
+    s = 2j * np.pi * freqs
+    codec = cfg['codec']
+    groups = {}
+    for i, path in enumerate(paths):
+        groups.setdefault((path['direction'], tuple((e['kind'], e['symbol']) for e in path['elements'])), []).append(i)
+    step = max(1, BATCH // ((trials + 1) * len(freqs)))
+    for (direction, shape), members in groups.items():
+        codec_end = {'r_ohm': codec['input_ohm'] if direction == 'in' else codec['output_ohm']}
+        z_src, z_load = ((cfg['external']['in'], codec_end) if direction == 'in' else (codec_end, cfg['external']['out']))
+        z_src, z_load = _end(z_src, s), _end(z_load, s)
+        for b in range(0, len(members), step):
+            rows = members[b:b + step]
+            a, bb, c, d = 1.0, 0.0, 0.0, 1.0  # ABCD of the ladder so far, source side first
+            for e in range(len(shape)):
+                first = paths[rows[0]]['elements'][e]
+                x = np.array([paths[r]['elements'][e]['x'] for r in rows])[:, None, None]
+                v = _immittance(first, x * _scales(rng, first['tol'], (len(rows), trials + 1)), s)
+                if first['kind'] == 'series':
+                    bb, d = a * v + bb, c * v + d
+                else:
+                    a, c = a + bb * v, c + d * v
+            a, bb, c, d = (np.broadcast_to(v, (len(rows), trials + 1, len(freqs))) for v in (a, bb, c, d))
+            yield rows, z_load / (a * z_load + bb + z_src * (c * z_load + d)), bb[:, 0] / a[:, 0]
+
+
+def _stats(x, points):
+    """Percentiles of x ignoring NaN (no corner found), or None if all are NaN"""
+    if np.isnan(x).all():
+        return None
+    return {f'p{p:g}': round(float(np.nanpercentile(x, p)), 2) for p in points}
+
+
+def analyze(snap, cfg=None, trials=TRIALS, freqs=FREQS, seed=0):
+    """Trace, evaluate and summarize; returns the report dict"""
+    start = time.perf_counter()
+    cfg = cfg or load_config()
+    paths, findings = trace(snap, cfg)
+    limits, codec = cfg['limits'], cfg['codec']
+    ref = int(np.argmin(np.abs(freqs - limits['ref_hz'])))
+    band = (freqs >= limits['band_hz'][0]) & (freqs <= limits['band_hz'][1])
+    edges = [int(np.flatnonzero(band)[0]), int(np.flatnonzero(band)[-1])]
+    kt4 = 4 * BOLTZMANN * cfg['temperature_k']
+    entries = {}
+    for rows, h, z_out in responses(paths, cfg, trials, freqs, seed):
+        gain = 20 * np.log10(np.abs(h) + 1e-30)
+        rel = gain - gain[..., ref:ref + 1]
+        flatness = np.abs(rel[..., band]).max(axis=-1)  # (rows, trials + 1)
+        # Corners are 3 dB under the in-band peak, searched outwards from it
+        peak = edges[0] + gain[..., band].argmax(-1)[..., None]
+        below = gain < np.take_along_axis(gain, peak, -1) - 3
+        index = np.arange(len(freqs))
+        high, low = below & (index >= peak), (below & (index <= peak))[..., ::-1]
+        f_high = np.where(high.any(-1), freqs[high.argmax(-1)], np.nan)
+        f_low = np.where(low.any(-1), freqs[len(freqs) - 1 - low.argmax(-1)], np.nan)
+        for j, i in enumerate(rows):
+            path = paths[i]
+            load = _end(cfg['external']['out'] if path['direction'] == 'out' else {'r_ohm': codec['input_ohm']},
+                        2j * np.pi * freqs)
+            density = kt4 * np.maximum(z_out[j].real, 0) * np.abs(load / (z_out[j] + load)) ** 2
+            noise = float(np.sqrt(_trapezoid(density[band], freqs[band])))
+            signal = codec['fullscale_vrms'] * (np.abs(h[j, 0, ref]) if path['direction'] == 'out' else 1.0)
+            snr = 20 * np.log10(signal / noise) if noise > 0 else float('inf')
+            dr = codec['dynamic_range_db'][path['direction']]
+            fails = flatness[j] > limits['flatness_db']
+            entries[i] = {
+                'path': path['name'], 'direction': path['direction'], 'terminal': path['terminal'],
+                'chain': [e['desc'] for e in path['elements']],
+                'gain_db': round(float(gain[j, 0, ref]), 2),
+                'edge_db': [round(float(rel[j, 0, e]), 2) for e in edges],
+                'edge_phase_deg': [round(float(np.angle(h[j, 0, e], deg=True)), 1) for e in edges],
+                'f_3db_hz': [None if np.isnan(f) else round(float(f), 1) for f in (f_low[j, 0], f_high[j, 0])],
+                'flatness_db': round(float(flatness[j, 0]), 3),
+                'mc': {'flatness_db': _stats(flatness[j], (50, 99, 100)),
+                       'f_3db_high_hz': _stats(f_high[j], (1, 50, 99))},
+                'p_fail': float(fails.mean()),
+                'pass': not fails.any(),
+                'noise_uvrms': round(noise * 1e6, 4),
+                'dynamic_range_db': [dr, round(float(-10 * np.log10(10 ** (-dr / 10) + 10 ** (-snr / 10))), 2)],
+            }
+    return {'trials': trials, 'seed': seed, 'freqs': [float(freqs[0]), float(freqs[-1]), len(freqs)],
+            'limits': limits, 'findings': findings, 'paths': [entries[i] for i in sorted(entries)],
+            'seconds': round(time.perf_counter() - start, 4)}
+
+
+def write_report(report, path=REPORT_FILE):
+    """Write the report as JSON and print its summary"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    summary(report, path)
+
+
+def summary(report, path=REPORT_FILE):
+    """Print one line per path"""
+    limit = report['limits']['flatness_db']
+    hz = lambda f: 'none' if f is None else f"{f / 1e3:.3g} kHz" if f >= 1e3 else f"{f:.3g} Hz"
+    for p in report['paths']:
+        arrow = f"{p['terminal']} -> {p['path']}" if p['direction'] == 'in' else f"{p['path']} -> {p['terminal']}"
+        print(f"Audio path {arrow}: {p['gain_db']:+.2f} dB, -3 dB at {hz(p['f_3db_hz'][0])} / {hz(p['f_3db_hz'][1])}, "
+              f"band edges {p['edge_db'][0]:+.2f} / {p['edge_db'][1]:+.2f} dB, P(>{limit} dB) {p['p_fail']:.3f}, "
+              f"DR {p['dynamic_range_db'][0]} -> {p['dynamic_range_db'][1]:.1f} dB -> {'pass' if p['pass'] else 'FAIL'}")
+    for finding in report['findings']:
+        print(f"Audio path: {finding}")
+    print(f"Audio path: {len(report['paths'])} paths x {report['trials']} trials in {report['seconds']:.3f} s ({path})")
+
+
+def run(snap, report_file=REPORT_FILE, trials=TRIALS):
+    """Analyze and write the report"""
+    report = analyze(snap, trials=trials)
+    write_report(report, report_file)
+    return report
+
+
+if __name__ == '__main__':
+    import sys
+
+    import schematic
+    import snapshot
+
+    schematic.build_design()
+    run(snapshot.take_snapshot(), trials=int(sys.argv[1]) if len(sys.argv) > 1 else TRIALS)
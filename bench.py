@@ -0,0 +1,240 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Phase-level benchmark of the schematic build: parts, nets, connections, audio channels, ERC, netlist and schematic timed separately.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Scenarios are the production design, the design with more codecs, and a synthetic design with a fully pinned 625-ball DSP, 4x DDR3L and N codecs.
+Note: Each scenario is repeated; min and median per phase are appended to logs/bench_history.jsonl with the skidl/Python versions and compared against logs/bench_baseline.json.
+Note: A phase regresses when its median exceeds the baseline by more than TOLERANCE and by more than FLOOR seconds; the exit status is then 1.
+Usage: python bench.py [scenario ...] [-r 3] [--no-schematic] [--save-baseline]
+"""
+
+import builtins
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import skidl
+
+import audio
+import bus
+import instrument
+import outputs
+import pinout
+import schematic
+
+LOG_DIR = 'logs'
+HISTORY_FILE = os.path.join(LOG_DIR, 'bench_history.jsonl')
+BASELINE_FILE = os.path.join(LOG_DIR, 'bench_baseline.json')
+PHASES = ['parts', 'nets', 'connect', 'channels', 'erc', 'netlist', 'schematic']
+TOLERANCE = 0.25  # Relative slowdown of a phase median that counts as a regression
+FLOOR = 0.05  # ...but only when it is also this many seconds slower (ignores noise on fast phases)
+
+RAM_FLYBY = ['A0', 'A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'A9', 'A10/AP', 'A11', 'A12/BC#', 'A13', 'A14',
+             'A15', 'BA0', 'BA1', 'BA2', 'CK', 'CK#', 'CAS#', 'RAS#', 'WE#', 'RESET#']  # Shared by all RAMs
+RAM_PER_CHIP = ['CS0#', 'ODT0', 'CKE0', 'LDQS', 'LDQS#', 'UDQS', 'UDQS#', 'LDM', 'UDM']
+
+
+class Laps:
+    """Phase callback for build_design: each call ends the running phase and starts the next; times add up per name"""
+
+    def __init__(self):
+        self.times = {}
+        self.current = None
+        self._start = None
+
+    def __call__(self, name):
+        now = time.perf_counter()
+        if self.current is not None:
+            self.times[self.current] = self.times.get(self.current, 0.0) + now - self._start
+        self.current, self._start = name, now
+
+
+def build_synthetic(n_ram=4, n_codecs=8, phase=None):
+    """Scaled design: 625-ball all-I/O DSP, n_ram DDR3L chips (fly-by address, 34R series DQ) and n_codecs audio channels"""
+    libs = schematic.libs
+    phase = phase or (lambda name: None)
+    builtins.default_circuit.mini_reset()
+
+    phase('parts')
+    table = pinout.synthetic_table()
+    dsp = pinout.make_part(table, footprint='Package_BGA:BGA-625_21x21mm_Layout25x25_P0.8mm', ref='U1')
+    rams = [pinout.make_part('MT41K512M16', footprint='Package_BGA:FBGA-96_9x14mm_Layout9x13_P0.8mm')
+            for _ in range(n_ram)]
+    r_term = [[libs.part('Device', 'R', value='34', footprint='Resistor_SMD:R_0402_1005Metric') for _ in range(16)]
+              for _ in rams]
+    decaps = [libs.part('Device', 'C', value='0.1u', footprint='Capacitor_SMD:C_0402_1005Metric')
+              for _ in range(10 * n_ram)]
+
+    phase('nets')
+    vcc_1v35 = skidl.Net('VCC_1V35')
+    vcc_audio = skidl.Net('VCC_AUDIO')
+    vref_ddr = skidl.Net('VREF_DDR')
+    dgnd = skidl.Net('DGND')
+    agnd = skidl.Net('AGND')
+    flyby = [skidl.Net('DDR_' + name.split('/')[0]) for name in RAM_FLYBY]
+    link = {name: skidl.Net(f'LINK_{name.upper()}') for name in ('bclk', 'fsync', 'dx', 'dr', 'scl', 'sda')}
+
+    phase('connect')
+    io = iter(table.names)
+    for k, ram in enumerate(rams):
+        dq = bus.bus_names('DQ', 16)
+        bus.connect_bus(dsp, [next(io) for _ in dq], ram, dq, net_names=bus.bus_names('DDR_DQ', 16, f'_R{k}'),
+                        series=r_term[k], dst_net_names=bus.bus_names('RAM_DQ', 16, f'_R{k}'))
+        bus.connect_bus(dsp, [next(io) for _ in RAM_PER_CHIP], ram, RAM_PER_CHIP,
+                        net_names=[f"DDR_{name.replace('#', 'N')}_R{k}" for name in RAM_PER_CHIP])
+        for net, name in zip(flyby, RAM_FLYBY):
+            net += bus.pin(ram, name)
+        vcc_1v35 += bus.pins(ram, 'VDD'), bus.pins(ram, 'VDDQ')
+        dgnd += bus.pins(ram, 'VSS'), bus.pins(ram, 'VSSQ')
+        vref_ddr += bus.pin(ram, 'VREFCA'), bus.pin(ram, 'VREFDQ')
+    for net in flyby:
+        net += bus.pin(dsp, next(io))
+    vcc_1v35 += [c[1] for c in decaps]
+    dgnd += [c[2] for c in decaps]
+
+    phase('channels')
+    for net in link.values():
+        net += bus.pin(dsp, next(io))
+    rails = {'vcc': vcc_audio, 'agnd': agnd, 'dgnd': dgnd}
+    for k in range(n_codecs):
+        audio.audio_channel(k, libs, link, rails)
+    for net in (vcc_1v35, vcc_audio, vref_ddr, dgnd, agnd):
+        net.drive = skidl.POWER
+    phase(None)
+
+
+SCENARIOS = {
+    'default': lambda phase: schematic.build_design(phase=phase),
+    'codecs8': lambda phase: schematic.build_design({'n_audio_channels': 8}, phase=phase),
+    'codecs32': lambda phase: schematic.build_design({'n_audio_channels': 32}, phase=phase),
+    'synthetic': lambda phase: build_synthetic(4, 8, phase),
+    'synthetic32': lambda phase: build_synthetic(4, 32, phase),
+}
+
+
+def run_once(build, with_schematic=True):
+    """One build plus ERC/netlist/schematic; returns ({phase: seconds}, {phase: error}, counts)"""
+    laps = Laps()
+    errors = {}
+    try:
+        build(laps)
+    except Exception as e:  # Report the phase the build stopped in
+        errors[laps.current or 'parts'] = f"{type(e).__name__}: {e}"
+        laps(None)
+        return laps.times, errors, {}
+    size = instrument.counts()
+    with tempfile.TemporaryDirectory(prefix='echoforge_bench_') as out_dir:
+        steps = [('erc', skidl.ERC), ('netlist', lambda: outputs.generate_netlist(os.path.join(out_dir, 'bench.net')))]
+        if with_schematic:
+            steps.append(('schematic', lambda: outputs.generate_schematic(os.path.join(out_dir, 'bench_sch'))))
+        for name, step in steps:
+            laps(name)
+            try:
+                step()
+            except Exception as e:  # The time until the failure is still recorded
+                errors[name] = f"{type(e).__name__}: {e}"
+        laps(None)
+    return laps.times, errors, size
+
+
+def run_scenario(name, repeat=3, with_schematic=True):
+    """Repeat one scenario; returns {'phases': {phase: {min, median, first}}, 'errors', 'counts'}"""
+    samples, errors, size = {}, {}, {}
+    stdout = sys.stdout
+    for _ in range(repeat):
+        sys.stdout = open(os.devnull, 'w')  # skidl and the report helpers are chatty
+        try:
+            times, errors, size = run_once(SCENARIOS[name], with_schematic)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        for phase, seconds in times.items():
+            samples.setdefault(phase, []).append(seconds)
+    phases = {phase: {'min': round(min(s), 4), 'median': round(statistics.median(s), 4), 'first': round(s[0], 4)}
+              for phase, s in sorted(samples.items(), key=lambda item: PHASES.index(item[0]))}
+    return {'phases': phases, 'errors': errors, 'counts': size, 'repeat': repeat}
+
+
+def environment():
+    """Versions that explain a change in the numbers"""
+    return {'skidl': getattr(skidl, '__version__', 'unknown'), 'python': platform.python_version(),
+            'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+
+def compare(record, baseline, tolerance=TOLERANCE, floor=FLOOR):
+    """[(scenario, phase, baseline median, median)] for phases slower than the baseline beyond both limits"""
+    slower = []
+    for name, result in record['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name, {}).get('phases', {})
+        for phase, t in result['phases'].items():
+            if phase in base:
+                was, now = base[phase]['median'], t['median']
+                if now > was * (1 + tolerance) and now - was > floor:
+                    slower.append((name, phase, was, now))
+    return slower
+
+
+def report(record, baseline=None):
+    """Print one line per scenario and phase, with the baseline median when there is one"""
+    for name, result in record['scenarios'].items():
+        c = result['counts']
+        print(f"{name}: {c.get('parts', '?')} parts, {c.get('pins', '?')} pins, {c.get('nets', '?')} nets, "
+              f"{result['repeat']} runs")
+        base = (baseline or {}).get('scenarios', {}).get(name, {}).get('phases', {})
+        for phase, t in result['phases'].items():
+            line = f"  {phase:10s} min {t['min'] * 1e3:9.1f} ms  median {t['median'] * 1e3:9.1f} ms"
+            if phase in base:
+                line += f"  baseline {base[phase]['median'] * 1e3:9.1f} ms ({t['median'] / max(base[phase]['median'], 1e-9) - 1:+.0%})"
+            print(line)
+        for phase, error in result['errors'].items():
+            print(f"  {phase:10s} FAILED: {error}")
+
+
+def main(argv):
+    names, repeat, with_schematic, save = [], 3, True, False
+    args = iter(argv)
+    for arg in args:
+        if arg == '-r':
+            repeat = int(next(args))
+        elif arg == '--no-schematic':
+            with_schematic = False
+        elif arg == '--save-baseline':
+            save = True
+        elif arg in SCENARIOS:
+            names.append(arg)
+        else:
+            raise SystemExit(f"Unknown scenario {arg!r}; one of {', '.join(SCENARIOS)}")
+    record = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'env': environment(),
+              'scenarios': {name: run_scenario(name, repeat, with_schematic) for name in names or SCENARIOS}}
+    os.makedirs(LOG_DIR, exist_ok=True)
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+    baseline = None
+    if os.path.isfile(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding='utf-8') as f:
+            baseline = json.load(f)
+    report(record, baseline)
+    if save:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=1)
+        print(f"Bench: baseline saved to {BASELINE_FILE}")
+        return 0
+    if baseline is None:
+        print(f"Bench: no baseline ({BASELINE_FILE}); run with --save-baseline to store one")
+        return 0
+    if baseline['env'] != record['env']:
+        print(f"Bench: baseline was taken with {baseline['env']}")
+    slower = compare(record, baseline)
+    for name, phase, was, now in slower:
+        print(f"REGRESSION {name}/{phase}: median {now * 1e3:.1f} ms vs baseline {was * 1e3:.1f} ms")
+    print(f"Bench: {len(slower)} regressions ({HISTORY_FILE})")
+    return 1 if slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,75 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Indexed pin lookup and bus connection helpers for schematic.py.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: part['NAME'] in skidl is a regex match against every pin name *and* number, so on a BGA it is O(pins) per lookup and 'A9' also hits ball A9. pin()/pins() here are exact-name dictionary lookups.
+Note: The name->pins index is built once per part (from its pin table when made by pinout.make_part) and cached on the part, so a whole connect phase is O(pins).
+"""
+
+import skidl
+
+
+def pin_index(part):
+    """Name -> list of pins for a part, built on first use"""
+    index = getattr(part, 'pin_index', None)
+    if index is None:
+        table = getattr(part, 'pin_table', None)
+        if table is not None and len(table) == len(part.pins):
+            index = {name: [part.pins[row] for row in rows] for name, rows in table.by_name.items()}
+        else:
+            index = {}
+            for p in part.pins:
+                index.setdefault(str(p.name), []).append(p)
+        part.pin_index = index
+    return index
+
+
+def pins(part, name):
+    """All pins of a part with exactly this name"""
+    try:
+        return pin_index(part)[name]
+    except KeyError:
+        raise KeyError(f"{part.ref} ({part.name}) has no pin named {name!r}") from None
+
+
+def pin(part, name):
+    """The single pin of a part with exactly this name"""
+    found = pins(part, name)
+    if len(found) != 1:
+        raise KeyError(f"{part.ref} ({part.name}) has {len(found)} pins named {name!r}; use pins()")
+    return found[0]
+
+
+def bus_names(prefix, width, suffix=''):
+    """['<prefix>0<suffix>', ..., '<prefix><width-1><suffix>']"""
+    return [f'{prefix}{i}{suffix}' for i in range(width)]
+
+
+def connect_bus(src, src_names, dst, dst_names, net_names=None, series=None, dst_net_names=None):
+    """
+    Connect src pins to dst pins bit by bit, one net per bit.
+    With series (a list of two-terminal parts, one per bit) each bit becomes
+    src -> series[i][1] on net_names[i] and series[i][2] -> dst on dst_net_names[i].
+    Returns the list of nets (or of (src_net, dst_net) pairs with series parts).
+    """
+    width = len(src_names)
+    if len(dst_names) != width or (series is not None and len(series) != width):
+        raise ValueError(f"Bus width mismatch: {width} src, {len(dst_names)} dst"
+                         + (f", {len(series)} series parts" if series is not None else ''))
+    net_names = net_names or [None] * width
+    dst_net_names = dst_net_names or [None] * width
+    src_pins = [pin(src, name) for name in src_names]
+    dst_pins = [pin(dst, name) for name in dst_names]
+    nets = []
+    for i in range(width):
+        net = skidl.Net(net_names[i])
+        if series is None:
+            net += src_pins[i], dst_pins[i]
+            nets.append(net)
+        else:
+            net += src_pins[i], series[i][1]
+            far = skidl.Net(dst_net_names[i])
+            far += series[i][2], dst_pins[i]
+            nets.append((net, far))
+    return nets
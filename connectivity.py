@@ -0,0 +1,240 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Incremental connectivity for schematic.py: a union-find over skidl net segments, kept in sync as connections are made.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: install() wraps skidl's Net.connect, so every `net += ...` unions the net with the nets it joins and with the other nets of each pin it takes (a pin on two nets merges them). A domain query is a find() with path halving; unions are by size.
+Note: Parts never join domains. Two-pin bridge parts (0 ohm, ferrites, net ties from parts/connectivity.json) are only looked up when the rules are checked, so the star-ground and supply-filter rules need no graph traversal.
+Note: Disconnecting a pin (rmv_parts, pin.disconnect) cannot be undone in a union-find; the tracker is then rebuilt from the circuit's nets on the next query.
+Run `python connectivity.py` to build the design and check the rules standalone.
+"""
+
+import builtins
+import json
+import os
+import time
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'connectivity.json')
+REPORT_FILE = 'connectivity_report.json'
+
+
+class Connectivity:
+    """Union-find over net segments; each element keeps its skidl Net so ids stay valid"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.index = {}  # id(net) -> element
+        self.nets = []
+        self.parent = []
+        self.members = []  # Root -> its elements (merged smaller into larger)
+        self.stale = False
+        self.unions = 0
+
+    def add(self, net):
+        """Element of a net segment, adding it as its own domain the first time"""
+        e = self.index.get(id(net))
+        if e is None:
+            e = self.index[id(net)] = len(self.nets)
+            self.nets.append(net)
+            self.parent.append(e)
+            self.members.append([e])
+        return e
+
+    def find(self, e):
+        parent = self.parent
+        while parent[e] != e:
+            parent[e] = parent[parent[e]]
+            e = parent[e]
+        return e
+
+    def union(self, a, b):
+        """Join the domains of two net segments"""
+        ra, rb = self.find(self.add(a)), self.find(self.add(b))
+        if ra == rb:
+            return ra
+        if len(self.members[ra]) < len(self.members[rb]):
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.members[ra] += self.members[rb]
+        self.members[rb] = None
+        self.unions += 1
+        return ra
+
+    def connected(self, net, items):
+        """Record a Net.connect(): net joins the given nets and the nets already on the given pins"""
+        from skidl.net import NCNet, Net
+        from skidl.pin import Pin
+        from skidl.utilities import expand_buses, flatten
+
+        if isinstance(net, NCNet):
+            return
+        self.add(net)
+        for item in expand_buses(flatten(items)):
+            if isinstance(item, Net):
+                if not isinstance(item, NCNet):
+                    self.union(net, item)
+            elif isinstance(item, Pin):
+                for other in item.nets:
+                    if not isinstance(other, NCNet):
+                        self.union(net, other)
+
+    def rebuild(self, circuit=None):
+        """Recompute every domain from the circuit's net segments and their pins"""
+        from skidl.net import NCNet
+
+        circuit = circuit or builtins.default_circuit
+        self.reset()
+        for net in circuit.nets:
+            if isinstance(net, NCNet):
+                continue
+            self.add(net)
+            for pin in net._pins:
+                for other in pin.nets:
+                    if not isinstance(other, NCNet):
+                        self.union(net, other)
+
+    def domain(self, obj):
+        """Domain (root element) of a Net or a Pin, or None for an unconnected pin"""
+        from skidl.pin import Pin
+
+        if self.stale:
+            self.rebuild()
+        if isinstance(obj, Pin):
+            if not obj.is_connected():
+                return None
+            obj = obj.nets[0]
+        return self.find(self.add(obj))
+
+    def name(self, root):
+        """Lowest explicit net name in a domain (skidl's N$ name when all are implicit), like snapshot.py"""
+        segments = [self.nets[e] for e in self.members[root]]
+        names = sorted(s.name for s in segments if not s.is_implicit())
+        return names[0] if names else min(s.name for s in segments)
+
+    def domains(self):
+        """{root: [net names]} of every domain"""
+        if self.stale:
+            self.rebuild()
+        return {r: [self.nets[e].name for e in m] for r, m in enumerate(self.members) if m is not None}
+
+
+_tracker = Connectivity()
+_installed = False
+
+
+def tracker():
+    """The Connectivity fed by the installed Net.connect"""
+    return _tracker
+
+
+def reset():
+    """Forget every domain (call when the circuit is reset for a new build)"""
+    _tracker.reset()
+
+
+def install():
+    """Wrap skidl's Net.connect/disconnect so the tracker follows every connection"""
+    global _installed
+    import skidl
+
+    if _installed:
+        return
+    connect, disconnect = skidl.Net.connect, skidl.Net.disconnect
+
+    def tracked_connect(self, *pins_nets_buses):
+        result = connect(self, *pins_nets_buses)
+        _tracker.connected(self, pins_nets_buses)
+        return result
+
+    def tracked_disconnect(self, pin):
+        _tracker.stale = True
+        return disconnect(self, pin)
+
+    skidl.Net.connect = tracked_connect
+    skidl.Net.disconnect = tracked_disconnect
+    _installed = True
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _bridge(part, cfg):
+    """Whether a part ties domains on purpose (two pins, symbol/value in cfg['bridges'])"""
+    if len(part.pins) != 2:
+        return False
+    value = str(getattr(part, 'value', '') or '')
+    return any(part.name == b['symbol'] and ('value' not in b or value == b['value']) for b in cfg['bridges'])
+
+
+def check(conn=None, circuit=None, cfg=None):
+    """Check the domain rules against the tracker; returns the report dict"""
+    start = time.perf_counter()
+    conn = conn or _tracker
+    circuit = circuit or builtins.default_circuit
+    cfg = cfg or load_config()
+    if conn.stale or not conn.nets:
+        conn.rebuild(circuit)
+    by_name = {}
+    for net in conn.nets:
+        by_name.setdefault(net.name, net)
+    bridges = []  # (part, symbol, {domain, domain})
+    for part in circuit.parts:
+        if _bridge(part, cfg):
+            ends = {conn.domain(p) for p in part.pins} - {None}
+            bridges.append((part.ref, part.name, ends))
+    rules = []
+    for rule in cfg['rules']:
+        entry = {'name': rule['name'], 'nets': rule['nets'], 'problems': []}
+        roots = {}
+        for name in rule['nets']:
+            if name not in by_name:
+                entry['problems'].append(f"{name} is not in the design")
+            else:
+                roots[name] = conn.domain(by_name[name])
+        seen = {}
+        for name, root in roots.items():
+            if root in seen:
+                entry['problems'].append(f"{seen[root]} and {name} are shorted into one domain ({conn.name(root)}) "
+                                         f"instead of meeting through {rule['via']}")
+            seen.setdefault(root, name)
+        if len(set(roots.values())) == len(rule['nets']) > 1:
+            want = set(roots.values())
+            found = [(ref, symbol) for ref, symbol, ends in bridges if len(ends) == 2 and ends <= want]
+            entry['bridges'] = [ref for ref, _ in found]
+            wrong = [f"{ref} ({symbol})" for ref, symbol in found if symbol != rule['via']]
+            if wrong:
+                entry['problems'].append(f"bridged by {', '.join(wrong)} instead of {rule['via']}")
+            if len(found) != rule.get('count', 1):
+                entry['problems'].append(f"{len(found)} bridges ({', '.join(r for r, _ in found) or 'none'}), "
+                                         f"expected {rule.get('count', 1)}")
+        entry['status'] = 'FAIL' if entry['problems'] else 'pass'
+        rules.append(entry)
+    return {'domains': sum(m is not None for m in conn.members), 'segments': len(conn.nets), 'unions': conn.unions,
+            'rules': rules, 'seconds': round(time.perf_counter() - start, 4)}
+
+
+def write_report(report, path=REPORT_FILE):
+    """Write the report as JSON and print its summary"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    summary(report, path)
+
+
+def summary(report, path=REPORT_FILE):
+    """Print one line per rule"""
+    for r in report['rules']:
+        detail = '; '.join(r['problems']) if r['problems'] else f"via {', '.join(r['bridges'])}"
+        print(f"Connectivity {r['name']} ({' | '.join(r['nets'])}): {detail} -> {r['status']}")
+    print(f"Connectivity: {report['domains']} domains from {report['segments']} net segments, "
+          f"checked in {report['seconds'] * 1e3:.1f} ms ({path})")
+
+
+if __name__ == '__main__':
+    import schematic
+
+    schematic.build_design()
+    write_report(check())
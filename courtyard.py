@@ -0,0 +1,324 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Courtyard, keep-out and region checks for the placed board, without KiCad's DRC.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Footprint boxes come from placement.Board (courtyard lines and pads, widened by half the clearance each side) and go into a uniform grid of cell_mm squares, one grid per board side; a query only looks at the cells a box covers, so checking one footprint costs its neighbours, not the board.
+Note: Keep-outs are rule areas with (footprints not_allowed) on F, B or both; box against polygon is exact (edge clipping plus a corner test). Region rules (parts/courtyard.json) keep the footprints with a pad on one net and none on another inside that net's copper zones, e.g. the analog parts around U3 on the AGND side of the star point; a rule is skipped when the board has no such zone yet.
+Note: In schematic.py the check is its own stage after pcb, keyed on the board file (see stage_key), so a board restored from the cache still gets its report and a rule change re-runs only the check.
+Note: Checker.move() re-indexes and re-checks one footprint and updates its neighbours' overlaps; --watch reloads the board on every save and moves only the footprints whose position changed.
+Usage: python courtyard.py board.kicad_pcb [-o report.json] [--watch]
+"""
+
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import libcache
+import placement
+import sexpr
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'courtyard.json')
+REPORT_FILE = 'courtyard_report.json'
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class GridIndex:
+    """Uniform grid over axis-aligned boxes (x0, y0, x1, y1): cell -> keys; insert/remove touch one box's cells"""
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.cells = {}
+        self.boxes = {}
+
+    def _span(self, box):
+        c = self.cell
+        return [(i, j) for i in range(math.floor(box[0] / c), math.floor(box[2] / c) + 1)
+                for j in range(math.floor(box[1] / c), math.floor(box[3] / c) + 1)]
+
+    def insert(self, key, box):
+        self.boxes[key] = box
+        for cell in self._span(box):
+            self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        for cell in self._span(self.boxes.pop(key)):
+            members = self.cells[cell]
+            members.discard(key)
+            if not members:
+                del self.cells[cell]
+
+    def query(self, box):
+        """Keys whose boxes overlap box (touching edges do not count)"""
+        found = set()
+        for cell in self._span(box):
+            found.update(self.cells.get(cell, ()))
+        return [k for k in found if _overlap(self.boxes[k], box)]
+
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _corners(box):
+    x0, y0, x1, y1 = box
+    return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])
+
+
+def _inside(points, poly):
+    """Even-odd point-in-polygon for (k, 2) points"""
+    x, y = points[:, 0:1], points[:, 1:2]
+    x0, y0 = poly[:, 0], poly[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    cross = (y0 > y) != (y1 > y)
+    xs = x0 + (y - y0) * (x1 - x0) / np.where(y1 == y0, 1.0, y1 - y0)
+    return (cross & (x < xs)).sum(1) % 2 == 1
+
+
+def _meets(box, poly):
+    """Whether a box and a polygon overlap: an edge clipped by the box (Liang-Barsky) or the box inside"""
+    x0, y0, x1, y1 = box
+    if poly[:, 0].max() <= x0 or poly[:, 0].min() >= x1 or poly[:, 1].max() <= y0 or poly[:, 1].min() >= y1:
+        return False
+    d = np.roll(poly, -1, 0) - poly
+    p = np.stack([-d[:, 0], d[:, 0], -d[:, 1], d[:, 1]], 1)
+    q = np.stack([poly[:, 0] - x0, x1 - poly[:, 0], poly[:, 1] - y0, y1 - poly[:, 1]], 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = q / p
+    lo = np.where(p < 0, t, -np.inf).max(1).clip(0, None)
+    hi = np.where(p > 0, t, np.inf).min(1).clip(None, 1)
+    outside = ((p == 0) & (q <= 0)).any(1)
+    if ((lo < hi) & ~outside).any():
+        return True
+    return bool(_inside(_corners(box)[:1], poly)[0])
+
+
+def _within(box, polys):
+    """Whether every corner of a box is inside one of the polygons"""
+    corners = _corners(box)
+    ok = np.zeros(4, bool)
+    for poly in polys:
+        ok |= _inside(corners, poly)
+    return bool(ok.all())
+
+
+def _sides(zone):
+    """Board sides ('F', 'B') a zone's copper layers touch"""
+    layers = (sexpr.find(zone, 'layers') or sexpr.find(zone, 'layer') or ['layers'])[1:]
+    sides = set()
+    for layer in layers:
+        if layer.startswith(('*.', 'F&B.')):
+            sides |= {'F', 'B'}
+        elif layer.startswith(('F.', 'B.')):
+            sides.add(layer[0])
+    return sides
+
+
+def zones(text):
+    """Footprint keep-outs [{name, sides, poly}] and copper zone outlines {net: [poly]} of a board's text"""
+    keepouts, planes = [], {}
+    for start, end in sexpr.spans(text, 'zone'):
+        block = text[start:end]
+        cut = block.find('(filled_polygon')
+        if cut > 0:  # Fills come last and can be megabytes; the outline is all we need
+            block = block[:cut] + ')'
+        zone = sexpr.parse(block)
+        pts = sexpr.find(sexpr.find(zone, 'polygon') or ['polygon'], 'pts')
+        if pts is None:
+            continue
+        poly = np.array([(float(p[1]), float(p[2])) for p in sexpr.findall(pts, 'xy')]).reshape(-1, 2)
+        if len(poly) < 3:
+            continue
+        keepout = sexpr.find(zone, 'keepout')
+        if keepout is not None:
+            if sexpr.value(keepout, 'footprints') == 'not_allowed':
+                name = sexpr.value(zone, 'name') or f"#{len(keepouts) + 1}"
+                keepouts.append({'name': name, 'sides': _sides(zone), 'poly': poly})
+            continue
+        net = sexpr.value(zone, 'net_name')
+        if net is None:  # KiCad 9 names the net directly
+            net = sexpr.value(zone, 'net')
+        if net and not str(net).isdigit():
+            planes.setdefault(net, []).append(poly)
+    return keepouts, planes
+
+
+class Checker:
+    """Overlaps, keep-outs and region rules of a board's footprints, kept current as footprints move"""
+
+    def __init__(self, board, cfg=None, areas=None):
+        cfg = cfg or load_config()
+        self.board = board
+        self.margin = cfg.get('clearance_mm', 0.0) / 2
+        self.size = np.array([s for s, _ in board.size]).reshape(-1, 2)
+        self.centre = np.array([c for _, c in board.size]).reshape(-1, 2)
+        self.xy = board.xy.copy()
+        self.keepouts, self.planes = areas if areas is not None else zones(board.text)
+        nets = {}
+        for fp, net in zip(board.pad_fp, board.pad_net):
+            nets.setdefault(int(fp), set()).add(net)
+        self.regions = []  # (rule, member footprints, zone outlines)
+        for rule in cfg.get('regions', []):
+            members = {i for i, n in nets.items() if rule['parts_on'] in n and not n & set(rule.get('not_on', []))}
+            self.regions.append((rule, members, self.planes.get(rule['zone_net'], [])))
+        self.index = {side: GridIndex(cfg.get('cell_mm', 2.0)) for side in ('F', 'B')}
+        self.overlaps = {i: set() for i in range(len(board.refs))}
+        self.problems = {}
+        for i in range(len(board.refs)):
+            self.index[board.side[i]].insert(i, self.box(i))
+        for i in range(len(board.refs)):
+            self._check(i)
+
+    def box(self, i):
+        c = self.xy[i] + self.centre[i]
+        h = self.size[i] / 2 + self.margin
+        return (float(c[0] - h[0]), float(c[1] - h[1]), float(c[0] + h[0]), float(c[1] + h[1]))
+
+    def _check(self, i):
+        box, side = self.box(i), self.board.side[i]
+        for j in self.overlaps[i]:
+            self.overlaps[j].discard(i)
+        self.overlaps[i] = set(self.index[side].query(box)) - {i}
+        for j in self.overlaps[i]:
+            self.overlaps[j].add(i)
+        problems = [f"in keep-out {k['name']}" for k in self.keepouts if side in k['sides'] and _meets(box, k['poly'])]
+        for rule, members, polys in self.regions:
+            if i in members and polys and not _within(box, polys):
+                problems.append(f"outside the {rule['zone_net']} zone ({rule['name']})")
+        if problems:
+            self.problems[i] = problems
+        else:
+            self.problems.pop(i, None)
+
+    def move(self, i, xy):
+        """Move footprint i to xy (its rotation stays) and re-check it; returns the footprints it now overlaps"""
+        self.xy[i] = xy
+        index = self.index[self.board.side[i]]
+        index.remove(i)
+        index.insert(i, self.box(i))
+        self._check(i)
+        return sorted(self.board.refs[j] for j in self.overlaps[i])
+
+    def report(self):
+        refs, side = self.board.refs, self.board.side
+        pairs = sorted((refs[i], refs[j], side[i]) for i, js in self.overlaps.items() for j in js if i < j)
+        regions = [{'name': rule['name'], 'zone_net': rule['zone_net'], 'parts': len(members),
+                    'zones': len(polys), 'checked': bool(polys)} for rule, members, polys in self.regions]
+        problems = [{'ref': refs[i], 'problems': p} for i, p in sorted(self.problems.items(), key=lambda e: refs[e[0]])]
+        return {'footprints': len(refs), 'keepouts': len(self.keepouts), 'regions': regions,
+                'overlaps': [list(p) for p in pairs], 'problems': problems,
+                'status': 'FAIL' if pairs or problems else 'pass'}
+
+
+def check(path, cfg=None):
+    """(Checker, report) for a board file"""
+    start = time.perf_counter()
+    board = placement.Board(path)
+    areas = zones(board.text)
+    loaded = time.perf_counter()
+    checker = Checker(board, cfg, areas)
+    report = checker.report()
+    report['seconds'] = round(time.perf_counter() - loaded, 4)
+    report['load_seconds'] = round(loaded - start, 3)
+    return checker, report
+
+
+def stage_key(design, path):
+    """Cache key of the check of a board: the board file and the code and rules that read it, not the design"""
+    files = (path, CONFIG_FILE, __file__, placement.__file__, sexpr.__file__)
+    return design.key('courtyard', [], extra=[libcache.file_sha256(f) for f in files])
+
+
+def write_report(report, path=REPORT_FILE):
+    """Write the report as JSON and print its summary"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    summary(report, path)
+
+
+def summary(report, path=None):
+    """Print the overlaps, the per-footprint problems and one line of totals"""
+    for a, b, side in report['overlaps']:
+        print(f"Courtyard: {a} overlaps {b} ({side})")
+    for p in report['problems']:
+        print(f"Courtyard: {p['ref']} {'; '.join(p['problems'])}")
+    for r in report['regions']:
+        if not r['checked']:
+            print(f"Courtyard: no {r['zone_net']} zone on the board, {r['name']} not checked")
+    print(f"Courtyard: {report['footprints']} footprints, {len(report['overlaps'])} overlaps, "
+          f"{len(report['problems'])} keep-out/region problems ({report['keepouts']} keep-outs) in "
+          f"{report['seconds'] * 1e3:.1f} ms -> {report['status']}" + (f" ({path})" if path else ''))
+
+
+def run(path, report_file=REPORT_FILE):
+    """Check a board; writes the report when report_file is given, else only prints the summary"""
+    _, report = check(path)
+    if report_file:
+        write_report(report, report_file)
+    else:
+        summary(report)
+    return report
+
+
+def _layout(board, areas):
+    """Everything but footprint positions: a change here rebuilds the Checker instead of moving footprints"""
+    keepouts, planes = areas
+    return (board.refs, board.side, [(s.tobytes(), c.tobytes()) for s, c in board.size],
+            [(k['name'], sorted(k['sides']), k['poly'].tobytes()) for k in keepouts],
+            {net: [p.tobytes() for p in polys] for net, polys in planes.items()})
+
+
+def watch(path, report_file=REPORT_FILE, interval=0.3):
+    """Re-check the board every time it is saved, moving only the footprints whose position changed"""
+    seen, checker = None, None
+    while True:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:  # Being replaced by the editor
+            mtime = seen
+        if mtime != seen:
+            seen = mtime
+            try:
+                board = placement.Board(path)
+                areas = zones(board.text)
+                start = time.perf_counter()
+                if checker is None or \
+                        _layout(board, areas) != _layout(checker.board, (checker.keepouts, checker.planes)):
+                    checker = Checker(board, areas=areas)
+                    moved = range(len(board.refs))
+                else:
+                    moved = np.flatnonzero((board.xy != checker.xy).any(1))
+                    for i in moved:
+                        checker.move(i, board.xy[i])
+                report = checker.report()
+                report['seconds'] = round(time.perf_counter() - start, 4)
+                print(f"Courtyard: {len(moved)} footprints re-checked")
+                write_report(report, report_file)
+            except (OSError, ValueError, IndexError) as e:  # Caught mid-write; the next save triggers again
+                print(f"Courtyard: cannot read {path}: {e}")
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    args = iter(sys.argv[1:])
+    board_file, out_file, watching = None, REPORT_FILE, False
+    for arg in args:
+        if arg == '-o':
+            out_file = next(args)
+        elif arg == '--watch':
+            watching = True
+        else:
+            board_file = arg
+    if not board_file:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    if watching:
+        watch(board_file, out_file)
+    sys.exit(1 if run(board_file, out_file)['status'] == 'FAIL' else 0)
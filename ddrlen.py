@@ -0,0 +1,326 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+DDR3 length and skew check of a routed .kicad_pcb: per-line delay from tracks and vias, skew per byte lane against its strobe.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: One regex pass over the board text picks out the segment/arc/via nodes and the net table; no tree is built, so a fully routed board reads in a fraction of a second. A node the regex cannot read (children more than two levels deep, like a KiCad 9 via padstack) is parsed with sexpr on its own. Lengths and delays are NumPy arrays summed per net with np.bincount.
+Note: Delay per mm comes from the board's own stackup (config fallback): outer layers are microstrip (Hammerstad effective epsilon from the track width and the dielectric below), inner layers stripline. A via counts the height between the outermost layers its tracks leave on.
+Note: Split nets (DDR_Dx_DSP + DDR_Dx_RAM across r_term) are summed into one line plus the series part's delay. Each group's members are compared with the mean of its reference pair (DQS0P/N, DQS1P/N, CLKP/N); rules are in parts/ddrlen.json.
+Usage: python ddrlen.py board.kicad_pcb [-o report.json] [--watch]   (exit status 1 when a group fails)
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+import sexpr
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'ddrlen.json')
+REPORT_FILE = 'ddrlen_report.json'
+C_MM_PS = 0.299792458  # Speed of light (mm/ps)
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_LEAF = rf'\((?:[^()"]|{_STRING})*\)'
+_NODE_RE = re.compile(rf'\((segment|arc|via)\s((?:[^()"]|{_STRING}|\((?:[^()"]|{_STRING}|{_LEAF})*\))*)\)')
+_FIELD_RE = re.compile(rf'\((\w+)\s((?:[^()"]|{_STRING})*)\)')
+_ATOM_RE = re.compile(rf'{_STRING}|[^\s"]+')
+_NETDEF_RE = re.compile(rf'\(net\s+(\d+)\s+({_STRING})\)')
+_NETREF_RE = re.compile(rf'\(net\s+(\d+|{_STRING})\s*\)')
+_START_RE = re.compile(r'\((segment|arc|via)\s')
+_SETUP_RE = re.compile(r'\(setup\s')
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _atoms(text):
+    return [sexpr.atom(t) for t in _ATOM_RE.findall(text)]
+
+
+def board_stackup(text):
+    """Copper and dielectric layers of the board's (setup (stackup ...)) in config form, or None"""
+    setup = _SETUP_RE.search(text)
+    if not setup:
+        return None
+    stackup = sexpr.find(sexpr.parse(text[setup.start():sexpr.end(text, setup.start())]), 'stackup')
+    if stackup is None:
+        return None
+    layers = []
+    for layer in sexpr.findall(stackup, 'layer'):
+        item = {'layer': layer[1], 'type': sexpr.value(layer, 'type', ''),
+                'thickness': float(sexpr.value(layer, 'thickness', 0))}
+        if sexpr.value(layer, 'epsilon_r') is not None:
+            item['epsilon_r'] = float(sexpr.value(layer, 'epsilon_r'))
+        layers.append(item)
+    return layers if any(item['type'] == 'copper' for item in layers) else None
+
+
+def layer_model(stackup):
+    """{copper layer: (z mm, outer, dielectric h mm, epsilon_r)} and the mean epsilon_r through the board (vias)"""
+    stack, z = [], 0.0
+    for item in stackup:
+        t = float(item.get('thickness', 0))
+        if item.get('type') == 'copper':
+            stack.append((item['layer'], z + t / 2, t, None))
+        elif 'epsilon_r' in item:
+            stack.append((None, z, t, float(item['epsilon_r'])))
+        else:
+            continue  # Mask and silk are not between copper layers
+        z += t
+    model = {}
+    coppers = [i for i, item in enumerate(stack) if item[0] is not None]
+    for i in coppers:
+        name, zc = stack[i][:2]
+        around = [stack[j] for j in (i - 1, i + 1) if 0 <= j < len(stack) and stack[j][0] is None]
+        if not around:
+            continue
+        if i in (coppers[0], coppers[-1]) and len(around) == 1:  # Microstrip over the dielectric inside the board
+            model[name] = (zc, True, around[0][2], around[0][3])
+        else:
+            model[name] = (zc, False, 0.0, sum(d[2] * d[3] for d in around) / sum(d[2] for d in around))
+    dielectric = [(t, er) for name, _, t, er in stack if name is None]
+    via_er = sum(t * er for t, er in dielectric) / sum(t for t, _ in dielectric) if dielectric else 4.3
+    return model, via_er
+
+
+def tpd_ps_mm(model, via_er, layer, width):
+    """Delay per mm of tracks on one layer (array of widths)"""
+    if layer not in model:
+        return np.full(len(width), np.sqrt(via_er) / C_MM_PS)
+    _, outer, h, er = model[layer]
+    if not outer:
+        return np.full(len(width), np.sqrt(er) / C_MM_PS)
+    u = np.maximum(width, 1e-3) / h
+    eff = (er + 1) / 2 + (er - 1) / 2 * ((1 + 12 / u) ** -0.5 + np.where(u < 1, 0.04 * (1 - u) ** 2, 0.0))
+    return np.sqrt(eff) / C_MM_PS
+
+
+def _nodes(text, ids):
+    """(kind, net name, {field: text}) of every segment/arc/via
+
+    Nodes with children nested deeper than _NODE_RE reads (a KiCad 9 via padstack) are parsed with sexpr instead.
+    """
+    for start in _START_RE.finditer(text):
+        m = _NODE_RE.match(text, start.start())
+        if m:
+            net = _NETREF_RE.search(m.group(2))
+            token = net.group(1) if net else ''
+            name = sexpr.atom(token) if token.startswith('"') else ids.get(token)
+            yield m.group(1), name, dict(_FIELD_RE.findall(m.group(2)))
+            continue
+        try:
+            node = sexpr.parse(text[start.start():sexpr.end(text, start.start())])
+        except ValueError:  # Not a node, e.g. '(via ' inside a string
+            continue
+        fields = {c[0]: ' '.join(c[1:]) for c in node[1:]
+                  if isinstance(c, list) and c and all(isinstance(a, str) for a in c)}
+        if 'start' not in fields and 'at' not in fields:
+            continue
+        net = fields.get('net', '')
+        yield node[0], ids.get(net, net) if net.isdigit() else net, fields
+
+
+def read_copper(text, wanted):
+    """Tracks and vias of the wanted net names, and every net name on the board"""
+    ids = {n: sexpr.atom(name) for n, name in _NETDEF_RE.findall(text)}
+    tracks = {'net': [], 'layer': [], 'width': [], 'start': [], 'mid': [], 'end': []}
+    vias = []
+    for kind, name, fields in _nodes(text, ids):
+        if name not in wanted:
+            continue
+        if kind == 'via':
+            x, y = map(float, fields['at'].split()[:2])
+            vias.append((name, x, y))
+            continue
+        start = tuple(map(float, fields['start'].split()[:2]))
+        end = tuple(map(float, fields['end'].split()[:2]))
+        tracks['net'].append(name)
+        tracks['layer'].append(_atoms(fields['layer'])[0])
+        tracks['width'].append(float(fields.get('width', '0').split()[0]))
+        tracks['start'].append(start)
+        tracks['mid'].append(tuple(map(float, fields['mid'].split()[:2])) if 'mid' in fields else start)
+        tracks['end'].append(end)
+    for key in ('start', 'mid', 'end'):
+        tracks[key] = np.array(tracks[key], float).reshape(-1, 2)
+    tracks['width'] = np.array(tracks['width'], float)
+    return tracks, vias, set(ids.values())
+
+
+def track_lengths(tracks, arc):
+    """Length (mm) of each segment, arcs measured along the circle through start, mid and end"""
+    s, m, e = tracks['start'], tracks['mid'], tracks['end']
+    straight = np.hypot(*(e - s).T)
+    a, b = np.hypot(*(m - s).T), np.hypot(*(e - m).T)
+    area2 = np.abs((m - s)[:, 0] * (e - s)[:, 1] - (m - s)[:, 1] * (e - s)[:, 0])
+    curved = arc & (area2 > 1e-9)
+    radius = np.where(curved, a * b * straight / np.maximum(2 * area2, 1e-12), 1.0)
+    along = 4 * radius * np.arcsin(np.clip(a / (2 * radius), 0, 1))  # Mid point halves the arc
+    return np.where(curved, along, np.where(arc, a + b, straight))
+
+
+def net_delays(tracks, vias, model, via_er):
+    """{net: {'length_mm', 'delay_ps', 'vias', 'tracks'}} for the nets that have copper"""
+    names = sorted(set(tracks['net']) | {v[0] for v in vias})
+    index = {n: i for i, n in enumerate(names)}
+    net = np.array([index[n] for n in tracks['net']], int)
+    arc = np.array([not np.array_equal(s, m) for s, m in zip(tracks['start'], tracks['mid'])], bool)
+    length = track_lengths(tracks, arc) if len(net) else np.zeros(0)
+    delay = np.zeros(len(net))
+    layers = np.array(tracks['layer'], object)
+    for layer in set(tracks['layer']):
+        on = layers == layer
+        delay[on] = length[on] * tpd_ps_mm(model, via_er, layer, tracks['width'][on])
+    ends = {}
+    for i, (n, layer) in enumerate(zip(tracks['net'], tracks['layer'])):
+        for p in (tracks['start'][i], tracks['end'][i]):
+            ends.setdefault((n, round(p[0], 3), round(p[1], 3)), set()).add(layer)
+    via_net, via_ps = [], []
+    for n, x, y in vias:
+        z = [model[layer][0] for layer in ends.get((n, round(x, 3), round(y, 3)), ()) if layer in model]
+        if len(z) > 1:  # Only vias that change layer lie in the path
+            via_net.append(index[n])
+            via_ps.append((max(z) - min(z)) * np.sqrt(via_er) / C_MM_PS)
+    total_len = np.bincount(net, weights=length, minlength=len(names))
+    total_ps = np.bincount(net, weights=delay, minlength=len(names)) + np.bincount(
+        np.array(via_net, int), weights=np.array(via_ps, float), minlength=len(names))
+    counts = np.bincount(net, minlength=len(names))
+    n_vias = np.bincount(np.array(via_net, int), minlength=len(names))
+    return {n: {'length_mm': float(total_len[i]), 'delay_ps': float(total_ps[i]), 'vias': int(n_vias[i]),
+                'tracks': int(counts[i])} for i, n in enumerate(names)}
+
+
+def _pair_name(ref):
+    prefix = os.path.commonprefix(ref)
+    return ref[0] + ''.join('/' + r[len(prefix):] for r in ref[1:])
+
+
+def analyze(path, cfg=None):
+    """Read the board and check every group; returns the report dict"""
+    start = time.perf_counter()
+    cfg = cfg or load_config()
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    stackup = board_stackup(text)
+    model, via_er = layer_model(stackup or cfg['stackup'])
+    line_names = [name for g in cfg['groups'] for name in g['ref'] + g['members']]
+    halves = {line: [line] + [line + s for s in cfg['split']] for line in line_names}
+    tracks, vias, board_nets = read_copper(text, {n for names in halves.values() for n in names})
+    nets = net_delays(tracks, vias, model, via_er)
+    lines = {}
+    for line, names in halves.items():
+        names = [n for n in names if n in board_nets]
+        if not names:
+            continue
+        routed = all(n in nets for n in names)
+        entry = {'nets': names, 'routed': routed}
+        if routed:
+            entry.update(length_mm=round(sum(nets[n]['length_mm'] for n in names), 3),
+                         delay_ps=round(sum(nets[n]['delay_ps'] for n in names) + cfg['series_ps'] * (len(names) - 1), 2),
+                         vias=sum(nets[n]['vias'] for n in names))
+        lines[line] = entry
+    delay = lambda line: lines[line]['delay_ps'] if lines.get(line, {}).get('routed') else None
+    groups = []
+    for g in cfg['groups']:
+        ref = [delay(r) for r in g['ref']]
+        missing = [n for n in g['ref'] + g['members'] if n not in lines]
+        unrouted = [n for n in g['ref'] + g['members'] if n in lines and not lines[n]['routed']]
+        entry = {'name': g['name'], 'ref': _pair_name(g['ref']), 'missing': missing, 'unrouted': unrouted,
+                 'ref_delay_ps': None, 'pair_skew_ps': None, 'skew_ps': {}, 'worst': None, 'worst_skew_ps': None}
+        if None not in ref:
+            centre = sum(ref) / len(ref)
+            entry['ref_delay_ps'] = round(centre, 2)
+            entry['pair_skew_ps'] = round(max(ref) - min(ref), 2)
+            entry['skew_ps'] = {m: round(delay(m) - centre, 2) for m in g['members'] if delay(m) is not None}
+            if entry['skew_ps']:
+                entry['worst'] = max(entry['skew_ps'], key=lambda m: abs(entry['skew_ps'][m]))
+                entry['worst_skew_ps'] = entry['skew_ps'][entry['worst']]
+        if ((entry['worst_skew_ps'] is not None and abs(entry['worst_skew_ps']) > cfg['skew_limit_ps'])
+                or (entry['pair_skew_ps'] is not None and entry['pair_skew_ps'] > cfg['pair_skew_limit_ps'])):
+            entry['status'] = 'FAIL'
+        elif not entry['skew_ps']:
+            entry['status'] = 'unrouted'
+        else:
+            entry['status'] = 'incomplete' if unrouted or missing else 'pass'
+        groups.append(entry)
+    return {'board': path, 'stackup': 'board' if stackup else 'config',
+            'tpd_ps_mm': {layer: round(float(tpd_ps_mm(model, via_er, layer, np.array([0.1]))[0]), 3) for layer in model},
+            'limits': {'skew_ps': cfg['skew_limit_ps'], 'pair_skew_ps': cfg['pair_skew_limit_ps']},
+            'groups': groups, 'lines': lines, 'tracks': len(tracks['net']), 'vias': len(vias),
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def write_report(report, path=REPORT_FILE):
+    """Write the report as JSON and print its summary"""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    os.replace(tmp, path)
+    summary(report, path)
+
+
+def summary(report, path=REPORT_FILE):
+    """Print one line per group"""
+    limits = report['limits']
+    for g in report['groups']:
+        line = f"DDR skew {g['name']} vs {g['ref']}: "
+        if g['worst'] is not None:
+            line += (f"worst {g['worst']} {g['worst_skew_ps']:+.1f} ps (limit {limits['skew_ps']}), "
+                     f"pair {g['pair_skew_ps']:.1f} ps (limit {limits['pair_skew_ps']})")
+        else:
+            line += 'not routed'
+        if g['unrouted'] and g['worst'] is not None:
+            line += f", {len(g['unrouted'])} unrouted"
+        print(f"{line} -> {g['status']}")
+    print(f"DDR skew: {report['tracks']} tracks, {report['vias']} vias in {report['seconds']:.2f} s "
+          f"({report['stackup']} stackup; {path})")
+
+
+def failed(report):
+    return any(g['status'] == 'FAIL' for g in report['groups'])
+
+
+def run(path, report_file=REPORT_FILE):
+    """Analyze a board and write the report"""
+    report = analyze(path)
+    write_report(report, report_file)
+    return report
+
+
+def watch(path, report_file=REPORT_FILE, interval=0.3):
+    """Re-check the board every time it is saved, until interrupted"""
+    seen = None
+    while True:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:  # Being replaced by the editor
+            mtime = seen
+        if mtime != seen:
+            seen = mtime
+            try:
+                run(path, report_file)
+            except (OSError, ValueError, KeyError) as e:  # Caught mid-write; the next save triggers again
+                print(f"DDR skew: cannot read {path}: {e}")
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    args = iter(sys.argv[1:])
+    board_file, out_file, watching = None, REPORT_FILE, False
+    for arg in args:
+        if arg == '-o':
+            out_file = next(args)
+        elif arg == '--watch':
+            watching = True
+        else:
+            board_file = arg
+    if not board_file:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    if watching:
+        watch(board_file, out_file)
+    sys.exit(1 if failed(run(board_file, out_file)) else 0)
@@ -0,0 +1,255 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+DQ bit and byte-lane swap optimizer for the DSP <-> DDR3 data bus: picks the mapping with the shortest, least crossed fan-out.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Ball positions come from the footprints' .kicad_mod pads when the KiCad library is installed, else from the ball name on the footprint's Layout/pitch grid. The RAM sits at ram_at from parts/dqswap.json, or where a placed board (--board) puts U1 and U2.
+Note: Cost of DSP bit i -> RAM bit j is the straight-line length plus a penalty on the mismatch of their standardized positions across the bus, which orders the bits so lines do not cross. Each lane pair is solved with the Hungarian method (O(n^3), NumPy rows); the lane-to-lane costs are then assigned the same way, strobes and masks moving with their lane.
+Note: --write stores the result in parts/ddr_dqmap.json, which schematic.py reads when it connects the DDR3 data bus; delete the file to go back to DDR_Dx -> DQx.
+Usage: python dqswap.py [--board placed.kicad_pcb] [--write]
+"""
+
+import json
+import math
+import os
+import re
+import sys
+
+import numpy as np
+
+import pinout
+import sexpr
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'dqswap.json')
+MAP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'ddr_dqmap.json')
+FP_DIRS = ['/usr/share/kicad/footprints']
+FIXED_COST = 1e9
+
+_LAYOUT_RE = re.compile(r'Layout(\d+)x(\d+)_P([\d.]+)mm')
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_map(path=MAP_FILE):
+    """{DSP pin name: RAM pin name} written by --write, or {} (straight DDR_Dx -> DQx wiring)"""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['map']
+
+
+def write_map(mapping, path=MAP_FILE):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'_note': 'DSP pin -> RAM pin for the DDR3 data lanes, written by `python dqswap.py --write`',
+                   'map': mapping}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def footprint_pads(footprint):
+    """{pad name: (x, y)} of a 'Lib:Name' footprint from the installed KiCad libraries, or None"""
+    import outputs
+
+    lib, _, name = footprint.partition(':')
+    for top in outputs.FP_LIB_DIRS + FP_DIRS:
+        path = os.path.join(top, f'{lib}.pretty', f'{name}.kicad_mod')
+        if os.path.isfile(path):
+            pads = {}
+            for pad in sexpr.findall(sexpr.read(path), 'pad'):
+                at = sexpr.find(pad, 'at')
+                if at is not None:
+                    pads.setdefault(pad[1], (float(at[1]), float(at[2])))
+            return pads
+    return None
+
+
+def ball_positions(footprint, balls):
+    """(n, 2) footprint-frame positions of balls; (positions, source, balls off the footprint)"""
+    pads = footprint_pads(footprint)
+    layout = _LAYOUT_RE.search(footprint)
+    cols, rows, pitch = (int(layout.group(1)), int(layout.group(2)), float(layout.group(3))) if layout else (0, 0, 0.8)
+    xy, outside = [], []
+    for ball in balls:
+        if pads and ball in pads:
+            xy.append(pads[ball])
+            continue
+        grid = pinout.ball_grid(ball)
+        if grid is None:
+            raise ValueError(f"{footprint}: cannot place ball {ball!r}")
+        row, col = grid
+        if pads is not None or (layout and (row >= rows or col >= cols)):
+            outside.append(ball)
+        xy.append(((col - (cols - 1) / 2) * pitch, (row - (rows - 1) / 2) * pitch))
+    return np.array(xy, float).reshape(-1, 2), 'library' if pads is not None else 'grid', outside
+
+
+def to_board(xy, at):
+    """Footprint-frame points to board frame for a footprint at (x, y, rotation)"""
+    x, y, rot = at
+    r = math.radians(rot)
+    c, s = math.cos(r), math.sin(r)
+    return np.stack([x + xy[:, 0] * c + xy[:, 1] * s, y - xy[:, 0] * s + xy[:, 1] * c], 1)
+
+
+def assign(cost):
+    """Minimum-cost assignment of a square matrix (Hungarian method with potentials): column of each row"""
+    n = len(cost)
+    u, v = np.zeros(n + 1), np.zeros(n + 1)
+    owner = np.zeros(n + 1, int)  # owner[j]: row (1-based) assigned to column j; column 0 is the virtual start
+    way = np.zeros(n + 1, int)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        slack = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, bool)
+        while True:
+            used[j0] = True
+            row = owner[j0]
+            reduced = cost[row - 1] - u[row] - v[1:]
+            better = ~used[1:] & (reduced < slack[1:])
+            slack[1:][better] = reduced[better]
+            way[1:][better] = j0
+            j1 = 1 + int(np.argmin(np.where(used[1:], np.inf, slack[1:])))
+            delta = slack[j1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            slack[~used] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:  # Augment along the alternating path
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    col = np.empty(n, int)
+    col[owner[1:] - 1] = np.arange(n)
+    return col
+
+
+def crossings(a, b):
+    """Number of pairs among the straight lines a[i] -> b[i] that cross"""
+    d = b - a
+    rel = a[None, :, :] - a[:, None, :]  # rel[i, j] = a[j] - a[i]
+    cross = lambda p, q: p[..., 0] * q[..., 1] - p[..., 1] * q[..., 0]
+    side_a = np.sign(cross(d[:, None, :], rel)) * np.sign(cross(d[:, None, :], rel + d[None, :, :]))
+    side_b = np.sign(cross(d[None, :, :], -rel)) * np.sign(cross(d[None, :, :], -rel + d[:, None, :]))
+    hit = (side_a < 0) & (side_b < 0)
+    return int(np.triu(hit, 1).sum())
+
+
+def bit_cost(src, dst, weight, fixed=()):
+    """(n, n) cost of wiring source bit i to destination bit j"""
+    length = np.hypot(*(src[:, None, :] - dst[None, :, :]).transpose(2, 0, 1))
+    axis = dst.mean(0) - src.mean(0)
+    across = np.array([-axis[1], axis[0]]) / max(np.hypot(*axis), 1e-9)
+    standard = lambda p: (p @ across - (p @ across).mean()) / max((p @ across).std(), 1e-9)
+    cost = length + weight * (standard(src)[:, None] - standard(dst)[None, :]) ** 2
+    for i in fixed:
+        keep = cost[i, i]
+        cost[i, :] = FIXED_COST
+        cost[i, i] = keep
+    return cost
+
+
+def _natural(name):
+    """Sort key that puts DDR_D2 before DDR_D10"""
+    return [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', name)]
+
+
+def _bus(pairs, dsp_xy, ram_xy):
+    """Total length and crossings of a list of (DSP pin, RAM pin) connections"""
+    a = np.array([dsp_xy[s] for s, _ in pairs])
+    b = np.array([ram_xy[d] for _, d in pairs])
+    return {'length_mm': round(float(np.hypot(*(b - a).T).sum()), 2), 'crossings': crossings(a, b)}
+
+
+def optimize(snap, cfg=None, board=None):
+    """Best lane and bit mapping for the design; returns the report dict (its 'map' is what --write stores)"""
+    cfg = cfg or load_config()
+    parts = {snap.part_name[p]: p for p in range(snap.n_parts)}
+    names = {side: [n for lane in cfg[f'{side}_lanes'] for key in ('data', 'strobe', 'mask') for n in lane[key]]
+             for side in ('dsp', 'ram')}
+    xy, findings = {}, []
+    at = {'dsp': (0.0, 0.0, 0.0), 'ram': tuple(cfg['ram_at'])}
+    if board:
+        import placement
+
+        placed = placement.Board(board)
+        for side in at:
+            ref = snap.part_ref[parts[cfg[side]]]
+            if ref in placed.refs:
+                i = placed.refs.index(ref)
+                at[side] = (float(placed.xy[i, 0]), float(placed.xy[i, 1]), placed.rot[i])
+            else:
+                findings.append(f"{ref} is not on {board}; using ram_at")
+    for side in ('dsp', 'ram'):
+        part = parts[cfg[side]]
+        balls = {snap.pin_name[p]: snap.pin_num[p] for p in snap.part_pins(part)}
+        local, source, outside = ball_positions(snap.part_fp[part], [balls[n] for n in names[side]])
+        if outside:
+            findings.append(f"{snap.part_ref[part]} balls {', '.join(outside)} are off {snap.part_fp[part]} ({source})")
+        xy[side] = dict(zip(names[side], to_board(local, at[side])))
+    weight = cfg['crossing_weight_mm']
+    dsp_lanes, ram_lanes = cfg['dsp_lanes'], cfg['ram_lanes']
+    solved = {}
+    lane_cost = np.zeros((len(dsp_lanes), len(ram_lanes)))
+    for a, src in enumerate(dsp_lanes):
+        for b, dst in enumerate(ram_lanes):
+            cost = bit_cost(np.array([xy['dsp'][n] for n in src['data']]), np.array([xy['ram'][n] for n in dst['data']]),
+                            weight, cfg['fixed_bits'])
+            col = assign(cost)
+            solved[a, b] = col
+            fixed = [(s, d) for key in ('strobe', 'mask') for s, d in zip(src[key], dst[key])]
+            lane_cost[a, b] = cost[np.arange(len(col)), col].sum() + sum(
+                np.hypot(*(xy['ram'][d] - xy['dsp'][s])) for s, d in fixed)
+    lanes = assign(lane_cost) if cfg['lane_swap'] else np.arange(len(dsp_lanes))
+    mapping, current = {}, load_map()
+    for a, b in enumerate(lanes):
+        src, dst = dsp_lanes[a], ram_lanes[b]
+        for i, j in enumerate(solved[a, b]):
+            mapping[src['data'][i]] = dst['data'][j]
+        for key in ('strobe', 'mask'):
+            mapping.update(zip(src[key], dst[key]))
+    straight = {s: d for src, dst in zip(dsp_lanes, ram_lanes) for key in ('data', 'strobe', 'mask')
+                for s, d in zip(src[key], dst[key])}
+    before = [(s, current.get(s, d)) for s, d in straight.items()]
+    return {'map': mapping, 'lanes': [f"{dsp_lanes[a]['strobe'][0]} -> {ram_lanes[b]['strobe'][0]}" for a, b in enumerate(lanes)],
+            'ram_at': list(at['ram']), 'dsp_at': list(at['dsp']), 'findings': findings,
+            'before': _bus(before, xy['dsp'], xy['ram']), 'after': _bus(list(mapping.items()), xy['dsp'], xy['ram']),
+            'changed': sorted((s for s, d in mapping.items() if current.get(s, straight[s]) != d), key=_natural)}
+
+
+def summary(report):
+    """Print the lane choice, the moved bits and the before/after fan-out"""
+    for finding in report['findings']:
+        print(f"DQ swap: {finding}")
+    print(f"DQ swap lanes: {', '.join(report['lanes'])}")
+    for name in report['changed']:
+        print(f"DQ swap: {name} -> {report['map'][name]}")
+    b, a = report['before'], report['after']
+    print(f"DQ swap: {b['length_mm']:.1f} mm, {b['crossings']} crossings -> {a['length_mm']:.1f} mm, "
+          f"{a['crossings']} crossings ({len(report['changed'])} pins remapped)")
+
+
+if __name__ == '__main__':
+    import schematic
+    import snapshot
+
+    args = iter(sys.argv[1:])
+    board_file, write = None, False
+    for arg in args:
+        if arg == '--board':
+            board_file = next(args)
+        elif arg == '--write':
+            write = True
+        else:
+            raise SystemExit(__doc__.strip().splitlines()[-1])
+    schematic.build_design()
+    report = optimize(snapshot.take_snapshot(), board=board_file)
+    summary(report)
+    if write:
+        write_map(report['map'])
+        print(f"DQ swap: mapping written to {MAP_FILE}; rerun schematic.py to rewire the bus")
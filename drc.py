@@ -0,0 +1,251 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Fast design-rule checker over a design snapshot (see snapshot.py), complementing skidl.ERC().
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Checks duplicate ball numbers per part, power pins with no rail, unconnected or lone driven outputs, nets with multiple drivers and pin-function conflicts.
+Note: Net checks build a nets x functions count matrix with NumPy and look pin-type pairs up in PIN_MATRIX, so cost is linear in pins.
+Note: install_erc() swaps skidl's quadratic default circuit/net ERC functions for linear ones, in place in Circuit.erc_list/Net.erc_list, so other registered ERC functions still run. This changes what skidl.ERC() reports: skidl logs a pin conflict for every conflicting pin pair on a net, the grouped check logs one (first pin of each function) per conflicting pin-function pair. The same nets and conflict kinds are flagged, with fewer messages; the no-driver, single-pin and drive-current warnings are unchanged.
+Run `python drc.py` to check the pin tables in pinouts/ for duplicate balls, or `python drc.py --bench` to time a synthetic full-pinout design.
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from pinout import FUNC_CODE, PIN_FUNCS, PINOUT_DIR, load_pinout, synthetic_table
+from snapshot import NOCONNECT, POWER_DRIVE, Snapshot
+
+OK, WARN, ERR = 0, 1, 2
+SEVERITY = ('ok', 'warning', 'error')
+
+DRIVERS = (FUNC_CODE['OUTPUT'], FUNC_CODE['PWROUT'])
+
+# Pin-to-pin compatibility (KiCad ERC style), rows/cols in PIN_FUNCS order
+_F = len(PIN_FUNCS)
+PIN_MATRIX = np.zeros((_F, _F), dtype=np.int8)
+
+
+def _rule(a, b, severity):
+    for x in a:
+        for y in b:
+            PIN_MATRIX[FUNC_CODE[x], FUNC_CODE[y]] = PIN_MATRIX[FUNC_CODE[y], FUNC_CODE[x]] = severity
+
+
+_rule(['OUTPUT', 'PWROUT'], ['OUTPUT', 'PWROUT'], ERR)
+_rule(['OUTPUT', 'PWROUT'], ['OPENCOLL', 'OPENEMIT'], ERR)
+_rule(['OUTPUT'], ['TRISTATE'], WARN)
+_rule(['PWROUT'], ['TRISTATE', 'BIDIR'], WARN)
+_rule(['UNSPEC'], list(PIN_FUNCS), WARN)
+_rule(['NOCONNECT'], list(PIN_FUNCS), ERR)
+_rule(['FREE'], list(PIN_FUNCS), OK)
+
+
+def duplicate_balls(part_pins, pin_num):
+    """{ball: [pin indexes]} for balls used more than once within a part"""
+    seen = {}
+    for p in part_pins:
+        seen.setdefault(pin_num[p], []).append(p)
+    return {ball: ps for ball, ps in seen.items() if len(ps) > 1}
+
+
+def check(snap):
+    """Run every rule over a Snapshot; returns the report dict"""
+    start = time.perf_counter()
+    issues = []
+
+    def issue(rule, severity, where, detail):
+        issues.append({'rule': rule, 'severity': SEVERITY[severity], 'where': where, 'detail': detail})
+
+    # Duplicate balls, hashed per part
+    for part in range(snap.n_parts):
+        for ball, ps in duplicate_balls(snap.part_pins(part), snap.pin_num).items():
+            issue('duplicate_ball', ERR, f"{snap.part_ref[part]}/{ball}",
+                  f"ball {ball} assigned to {', '.join(snap.pin_name[p] for p in ps)}")
+
+    func = np.frombuffer(snap.pin_func, dtype=np.uint8).astype(np.intp)
+    net = np.frombuffer(snap.pin_net, dtype=np.int32).astype(np.intp)
+    n_nets = snap.n_nets
+    connected = net >= 0
+    if n_nets and snap.net_name.count(NOCONNECT):
+        connected &= net != snap.net_name.index(NOCONNECT)
+
+    # nets x functions pin counts
+    counts = np.zeros((n_nets, _F), dtype=np.int32)
+    np.add.at(counts, (net[connected], func[connected]), 1)
+    net_size = counts.sum(axis=1)
+
+    # Power pins with no rail
+    pwrin = func == FUNC_CODE['PWRIN']
+    for p in np.flatnonzero(pwrin & ~connected):
+        issue('unpowered_pin', ERR, snap.pin_desc(p), "power input pin is not on any net")
+    drive = np.frombuffer(snap.net_drive, dtype=np.uint8)
+    unsourced = (counts[:, FUNC_CODE['PWRIN']] > 0) & (counts[:, FUNC_CODE['PWROUT']] == 0) & (drive < POWER_DRIVE)
+    for n in np.flatnonzero(unsourced):
+        issue('unsourced_rail', WARN, snap.net_name[n],
+              f"{counts[n, FUNC_CODE['PWRIN']]} power input pin(s) but no power output or POWER flag")
+
+    # Driven outputs that go nowhere
+    driver = np.isin(func, DRIVERS)
+    for p in np.flatnonzero(driver & ~connected):
+        issue('unconnected_output', WARN, snap.pin_desc(p), f"{PIN_FUNCS[func[p]]} pin is not connected")
+    lone = driver & connected
+    lone[lone] = net_size[net[lone]] == 1
+    for p in np.flatnonzero(lone):
+        issue('unconnected_output', WARN, snap.pin_desc(p), f"only pin on net {snap.net_name[net[p]]}")
+
+    # Multiple drivers
+    n_drivers = counts[:, list(DRIVERS)].sum(axis=1)
+    for n in np.flatnonzero(n_drivers > 1):
+        pins = [snap.pin_desc(p) for p in snap.net_pins(n) if snap.pin_func[p] in DRIVERS]
+        issue('multiple_drivers', ERR, snap.net_name[n], f"{n_drivers[n]} drivers: {', '.join(pins)}")
+
+    # Remaining pin-type conflicts: worst matrix entry over the function pairs present on each net
+    present = counts > 0
+    pairs = present[:, :, None] & present[:, None, :]
+    diag = np.arange(_F)
+    pairs[:, diag, diag] = counts > 1
+    matrix = PIN_MATRIX.copy()
+    for a in DRIVERS:
+        for b in DRIVERS:
+            matrix[a, b] = OK  # Already reported as multiple_drivers
+    worst = np.where(pairs, matrix[None, :, :], OK).max(axis=(1, 2)) if n_nets else np.zeros(0, np.int8)
+    for n in np.flatnonzero(worst > OK):
+        funcs = [PIN_FUNCS[f] for f in np.flatnonzero(present[n])]
+        issue('pin_conflict', int(worst[n]), snap.net_name[n], f"pin functions {', '.join(funcs)} on one net")
+
+    errors = sum(i['severity'] == 'error' for i in issues)
+    return {
+        'summary': {
+            'parts': snap.n_parts, 'pins': snap.n_pins, 'nets': n_nets,
+            'errors': errors, 'warnings': len(issues) - errors,
+            'seconds': round(time.perf_counter() - start, 6),
+        },
+        'issues': issues,
+    }
+
+
+def grouped_net_erc(net):
+    """
+    skidl's default net ERC, but with pin conflicts checked once per pin-function pair.
+    dflt_net_erc compares every pin pair, which is quadratic on shared ground and TDM nets.
+    """
+    from skidl.logger import active_logger
+    from skidl.pin import pin_drives, pin_info
+
+    net.test_validity()
+    if not net.do_erc:
+        return
+    pins = net.pins
+    if not pins:
+        active_logger.warning(f"No pins attached to net {net.name}.")
+    elif len(pins) == 1:
+        active_logger.warning(f"Only one pin ({pins[0].erc_desc()}) attached to net {net.name}.")
+    else:
+        groups = {}
+        for p in pins:
+            if p.do_erc:
+                groups.setdefault(p.func, []).append(p)
+        funcs = list(groups)
+        for i, a in enumerate(funcs):
+            if len(groups[a]) > 1:
+                groups[a][0].chk_conflict(groups[a][1])
+            for b in funcs[i + 1:]:
+                groups[a][0].chk_conflict(groups[b][0])
+    net_drive = max([p.drive for p in pins] + [net.drive])
+    if net_drive <= pin_drives.NONE:
+        active_logger.warning(f"No drivers for net {net.name}.")
+    for p in pins:
+        if pin_info[p.func]["min_rcv"] > net_drive:
+            active_logger.warning(f"Insufficient drive current on net {net.name} for pin {p.erc_desc()}.")
+
+
+def indexed_circuit_erc(circuit):
+    """skidl's default circuit ERC, looking nets up in a name index instead of one Net.get() scan per net"""
+    circuit.merge_net_names()
+    nets = {}
+    for net in circuit.nets:
+        nets.setdefault(net.name, net)
+    for net in nets.values():
+        net.ERC()
+    for piece in circuit.parts + circuit.interfaces:
+        piece.ERC()
+
+
+def install_erc():
+    """Use the linear-time circuit and net ERC functions for skidl.ERC(), keeping any other registered ERC functions"""
+    import skidl
+    from skidl.erc import dflt_circuit_erc, dflt_net_erc
+
+    for erc_list, old, new in ((skidl.Circuit.erc_list, dflt_circuit_erc, indexed_circuit_erc),
+                               (skidl.Net.erc_list, dflt_net_erc, grouped_net_erc)):
+        erc_list[:] = [new if f is old else f for f in erc_list]  # In place: instances share the class list
+
+
+def write_report(report, path='drc_report.json'):
+    """Write the report as JSON and print a one-line summary"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    s = report['summary']
+    print(f"DRC: {s['errors']} errors, {s['warnings']} warnings over {s['parts']} parts / {s['pins']} pins / "
+          f"{s['nets']} nets in {s['seconds'] * 1e3:.1f} ms ({path})")
+
+
+def check_tables(pinout_dir=PINOUT_DIR):
+    """Duplicate-ball check on the pin tables alone (no skidl needed)"""
+    problems = {}
+    for fname in sorted(os.listdir(pinout_dir)):
+        if fname.endswith('.csv'):
+            table = load_pinout(fname[:-4], pinout_dir)
+            dups = duplicate_balls(range(len(table)), table.balls)
+            if dups:
+                problems[table.part] = {ball: [table.names[r] for r in rows] for ball, rows in dups.items()}
+    return problems
+
+
+def synthetic_snapshot(n_parts=4, bga=625, passives=400):
+    """Snapshot of n_parts full BGAs plus two-pin passives, for timing"""
+    snap = Snapshot()
+    table = synthetic_table()
+    for part in range(n_parts):
+        snap.part_ref.append(f'U{part + 1}')
+        snap.part_name.append(table.part)
+        snap.part_value.append(table.part)
+        snap.part_fp.append('')
+        for row in range(min(bga, len(table))):
+            snap.pin_part.append(part)
+            snap.pin_num.append(table.balls[row])
+            snap.pin_name.append(table.names[row])
+            snap.pin_func.append(table.funcs[row])
+            snap.pin_net.append(row)
+    for i in range(passives):
+        part = snap.n_parts
+        snap.part_ref.append(f'C{i + 1}')
+        snap.part_name.append('C')
+        snap.part_value.append('0.1u')
+        snap.part_fp.append('Capacitor_SMD:C_0402_1005Metric')
+        for num in ('1', '2'):
+            snap.pin_part.append(part)
+            snap.pin_num.append(num)
+            snap.pin_name.append('~')
+            snap.pin_func.append(FUNC_CODE['PASSIVE'])
+            snap.pin_net.append(i % bga)
+    snap.net_name.extend(f'N{i}' for i in range(bga))
+    snap.net_drive.extend([0] * bga)
+    snap.net_implicit.extend([0] * bga)
+    return snap
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        snap = synthetic_snapshot()
+        write_report(check(snap), os.path.join(os.environ.get('TMPDIR', '/tmp'), 'drc_bench.json'))
+        sys.exit(0)
+    problems = check_tables()
+    for part, dups in problems.items():
+        for ball, names in dups.items():
+            print(f"{part}: ball {ball} used by {', '.join(names)}")
+    sys.exit(1 if problems else 0)
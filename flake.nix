@@ -74,6 +74,8 @@
       deprecation
       simp-sexp
       inspice
+      numpy
+      matplotlib
     ]);
   in {
     packages.${system}.default = pkgs.stdenv.mkDerivation {
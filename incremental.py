@@ -0,0 +1,158 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Design fingerprinting and artifact cache so schematic.py only regenerates outputs whose inputs changed.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: The design key hashes every part (ref, name, value, footprint), pin (num, name, function, net) and net (name, drive), so comment-only or README commits reuse the cached ERC report, netlist and schematic.
+Note: Subsystem digests (power, DDR, audio, JTAG) ignore auto-assigned refs and report which subsystem a change touched; stages that only read one subsystem key on that subsystem's digest.
+Note: Artifacts are kept in .cache/artifacts/<stage>/<key>/; delete the directory to force a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+from libcache import CACHE_DIR
+
+ARTIFACT_DIR = os.path.join(CACHE_DIR, 'artifacts')
+
+# Net-name prefixes per subsystem, first match wins (VCC_AUDIO is audio, not power)
+SUBSYSTEMS = (
+    ('jtag', ('JTAG_',)),
+    ('ddr', ('DDR_', 'VREF_DDR', 'PTV15')),
+    ('audio', ('McBSP_', 'I2C_', 'GUITAR_', 'AUDIO_', 'LPF_', 'VCC_AUDIO', 'AGND')),
+    ('power', ('VCC_', 'EN_', 'DGND')),
+)
+SUBSYSTEM_NAMES = tuple(name for name, _ in SUBSYSTEMS)
+
+
+def net_subsystem(name):
+    """Subsystem of a named net, or None"""
+    for subsystem, prefixes in SUBSYSTEMS:
+        if name.startswith(prefixes):
+            return subsystem
+    return None
+
+
+def _digest(items):
+    h = hashlib.sha256()
+    for item in items:
+        h.update(repr(item).encode())
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+class Fingerprint:
+    """Canonical hashes of a design snapshot"""
+
+    def __init__(self, snap):
+        self.snap = snap
+        self.part_subsystem = self._classify_parts()
+        self.net_subsystem = self._classify_nets()
+        self.design = self._design_digest()
+        self.subsystems = self._subsystem_digests()
+
+    def _classify_parts(self):
+        """Home subsystem per part: first non-power subsystem among its nets, else power"""
+        snap = self.snap
+        homes = []
+        for part in range(snap.n_parts):
+            found = set()
+            for pin in snap.part_pins(part):
+                net = snap.pin_net[pin]
+                if net >= 0 and not snap.net_implicit[net]:
+                    found.add(net_subsystem(snap.net_name[net]))
+            homes.append(next((s for s in SUBSYSTEM_NAMES if s in found and s != 'power'), 'power'))
+        return homes
+
+    def _classify_nets(self):
+        """Subsystem per net; implicit nets follow the parts they connect"""
+        snap = self.snap
+        subs = []
+        for net, name in enumerate(snap.net_name):
+            sub = None if snap.net_implicit[net] else net_subsystem(name)
+            if sub is None:
+                parts = [self.part_subsystem[snap.pin_part[p]] for p in snap.net_pins(net)]
+                sub = next((s for s in parts if s != 'power'), 'power')
+            subs.append(sub)
+        return subs
+
+    def _pin_sig(self, pin):
+        snap = self.snap
+        part = snap.pin_part[pin]
+        return (snap.part_name[part], snap.part_value[part], snap.part_fp[part],
+                snap.pin_num[pin], snap.pin_name[pin], snap.pin_func[pin])
+
+    def _design_digest(self):
+        snap = self.snap
+        parts = sorted(zip(snap.part_ref, snap.part_name, snap.part_value, snap.part_fp))
+        pins = sorted((snap.part_ref[snap.pin_part[p]], snap.pin_num[p], snap.pin_name[p], snap.pin_func[p],
+                       snap.net_name[snap.pin_net[p]] if snap.pin_net[p] >= 0 else '')
+                      for p in range(snap.n_pins))
+        nets = sorted(zip(snap.net_name, snap.net_drive))
+        return _digest([len(parts), len(pins), len(nets)] + parts + pins + nets)
+
+    def _subsystem_digests(self):
+        snap = self.snap
+        items = {name: [] for name in SUBSYSTEM_NAMES}
+        for part, sub in enumerate(self.part_subsystem):
+            items[sub].append(('part', snap.part_name[part], snap.part_value[part], snap.part_fp[part]))
+        for net, sub in enumerate(self.net_subsystem):
+            name = '~' if snap.net_implicit[net] else snap.net_name[net]
+            members = tuple(sorted(self._pin_sig(p) for p in snap.net_pins(net)))
+            items[sub].append(('net', name, snap.net_drive[net], members))
+        return {name: _digest(sorted(entries)) for name, entries in items.items()}
+
+    def key(self, stage, subsystems=None, extra=()):
+        """Cache key for a stage reading the whole design or only some subsystems"""
+        if subsystems is None:
+            base = [self.design]
+        else:
+            base = [self.subsystems[s] for s in subsystems]
+        return _digest([stage, *base, *extra])[:32]
+
+
+class StageCache:
+    """Per-stage artifact store keyed by input fingerprint"""
+
+    def __init__(self, cache_dir=ARTIFACT_DIR):
+        self.cache_dir = cache_dir
+        self.state_file = os.path.join(cache_dir, 'last_run.json')
+        self.produced = []  # Outputs of the stages run through this cache in this process, in order
+
+    def dirty_subsystems(self, fingerprint):
+        """Subsystems whose digest changed since the last recorded run"""
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                last = json.load(f)
+        except (OSError, ValueError):
+            last = {}
+        return [s for s in SUBSYSTEM_NAMES if last.get(s) != fingerprint.subsystems[s]]
+
+    def record(self, fingerprint):
+        """Remember the subsystem digests of this run"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(fingerprint.subsystems, f, indent=1)
+
+    def run(self, stage, key, outputs, build):
+        """Restore outputs for (stage, key) from the cache, or call build() and store them; True if restored"""
+        entry = os.path.join(self.cache_dir, stage, key)
+        cached = [os.path.join(entry, os.path.basename(o)) for o in outputs]
+        if all(os.path.isfile(c) for c in cached):
+            for src, dst in zip(cached, outputs):
+                shutil.copyfile(src, dst)
+            print(f"[{stage}] unchanged, restored {', '.join(outputs)} from cache")
+            self.produced += outputs
+            return True
+        build()
+        self.produced += [o for o in outputs if os.path.isfile(o)]
+        tmp = f'{entry}.{os.getpid()}.tmp'
+        os.makedirs(tmp, exist_ok=True)
+        for src, dst in zip(outputs, cached):
+            if os.path.isfile(src):
+                shutil.copyfile(src, os.path.join(tmp, os.path.basename(dst)))
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        return False
@@ -0,0 +1,153 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Per-phase timing and memory record of a schematic.py run, written as JSON next to the run log.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Recorder is a phase callback like bench.Laps (recorder(name) ends the running phase and starts the next); per phase it keeps wall and CPU time, the process high-water RSS and the part/pin/net counts.
+Note: CPU time includes reaped child processes, so the forked output workers are counted in the phase that waited for them. Bookkeeping (snapshots, counting) runs between phases and is not timed.
+Note: ECHOFORGE_TRACEMALLOC=1 adds the tracemalloc peak and net allocation per phase and the ECHOFORGE_ALLOC_TOP (default 5) largest allocation sites from snapshot diffs; tracing slows skidl down several times, so it is opt-in.
+Note: ECHOFORGE_PROFILE=1 profiles every phase and keeps the slowest as a .prof next to the record. The record goes to $ECHOFORGE_RUN_LOG with a .json suffix (run.sh sets it to its log file), else logs/run_<timestamp>.json.
+"""
+
+import builtins
+import cProfile
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+LOG_DIR = 'logs'
+
+
+def cpu_seconds():
+    """User + system time of this process and its reaped children"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def max_rss_kb(who='self'):
+    """Peak resident size in kB of this process ('self') or of its largest reaped child ('children'); None without resource"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN).ru_maxrss
+
+
+def counts():
+    """Parts, pins and nets in the default circuit"""
+    circuit = getattr(builtins, 'default_circuit', None)
+    if circuit is None:
+        return {'parts': 0, 'pins': 0, 'nets': 0}
+    return {'parts': len(circuit.parts), 'pins': sum(len(p.pins) for p in circuit.parts),
+            'nets': sum(1 for n in circuit.nets if n.pins)}
+
+
+def record_path(env=None):
+    """JSON path next to the run log, or a timestamped one in logs/"""
+    env = os.environ if env is None else env
+    log = env.get('ECHOFORGE_RUN_LOG')
+    if log:
+        return os.path.splitext(log)[0] + '.json'
+    return os.path.join(LOG_DIR, f"run_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+
+class Recorder:
+    """Phase callback that records time, memory and design size per phase"""
+
+    def __init__(self, profile=None, trace=None, alloc_top=None):
+        env = os.environ
+        self.profile = env.get('ECHOFORGE_PROFILE', '') not in ('', '0') if profile is None else profile
+        self.trace = env.get('ECHOFORGE_TRACEMALLOC', '') not in ('', '0') if trace is None else trace
+        self.alloc_top = int(env.get('ECHOFORGE_ALLOC_TOP', 5)) if alloc_top is None else alloc_top
+        self.phases = []
+        self.current = None
+        self.started = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._start = None
+        self._profiler = None
+        self._profiles = {}
+        self._snapshot = None
+        self._own_tracemalloc = self.trace and not tracemalloc.is_tracing()
+        if self._own_tracemalloc:
+            tracemalloc.start()
+
+    def __call__(self, name):
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.current is not None:
+            self._close(wall, cpu)
+        self.current = name
+        if name is None:
+            return
+        if self.trace:
+            if self.alloc_top and self._snapshot is None:
+                self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            self._mem = tracemalloc.get_traced_memory()[0]
+        if self.profile:
+            self._profiler = self._profiles[name] = cProfile.Profile()
+        self._start = (time.perf_counter(), cpu_seconds())
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def _close(self, wall, cpu):
+        phase = {'phase': self.current, 'wall_s': round(wall - self._start[0], 4),
+                 'cpu_s': round(cpu - self._start[1], 4), 'max_rss_kb': max_rss_kb(), **counts()}
+        if not self.trace:
+            self.phases.append(phase)
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        phase['peak_kb'] = round((peak - self._mem) / 1024, 1)
+        phase['alloc_kb'] = round((current - self._mem) / 1024, 1)
+        if self.alloc_top:
+            snapshot = tracemalloc.take_snapshot()
+            phase['top_allocs'] = [{'where': f'{s.traceback[0].filename}:{s.traceback[0].lineno}',
+                                    'kb': round(s.size_diff / 1024, 1), 'count': s.count_diff}
+                                   for s in snapshot.compare_to(self._snapshot, 'lineno')[:self.alloc_top]]
+            self._snapshot = snapshot
+        self.phases.append(phase)
+
+    def record(self, error=None):
+        """The run as one JSON-able dict (stops tracing once the last phase is closed)"""
+        self(None)
+        if self._own_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        try:
+            import skidl
+
+            skidl_version = getattr(skidl, '__version__', 'unknown')
+        except ImportError:
+            skidl_version = None
+        slowest = max(self.phases, key=lambda p: p['wall_s'])['phase'] if self.phases else None
+        return {'started': self.started, 'error': error, 'argv': sys.argv,
+                'env': {'skidl': skidl_version, 'python': platform.python_version(), 'platform': platform.platform()},
+                'wall_s': round(sum(p['wall_s'] for p in self.phases), 4),
+                'cpu_s': round(sum(p['cpu_s'] for p in self.phases), 4),
+                'max_rss_kb': max_rss_kb(), 'children_max_rss_kb': max_rss_kb('children'), 'tracemalloc': self.trace,
+                'slowest': slowest, 'phases': self.phases}
+
+    def write(self, path=None, error=None):
+        """Write the record (and the slowest phase's profile when profiling); returns the record"""
+        path = path or record_path()
+        rec = self.record(error)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if rec['slowest'] in self._profiles:
+            rec['profile'] = os.path.splitext(path)[0] + f".{rec['slowest']}.prof"
+            self._profiles[rec['slowest']].dump_stats(rec['profile'])
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rec, f, indent=1)
+        summary(rec, path)
+        return rec
+
+
+def summary(rec, path):
+    """Print one line per phase"""
+    for p in rec['phases']:
+        peak = f"peak {p['peak_kb'] / 1024:6.1f} MB" if 'peak_kb' in p else f"RSS {(p['max_rss_kb'] or 0) / 1024:6.1f} MB"
+        print(f"Phase {p['phase']:10s} {p['wall_s'] * 1e3:8.1f} ms wall {p['cpu_s'] * 1e3:8.1f} ms CPU {peak}  "
+              f"{p['parts']} parts {p['pins']} pins {p['nets']} nets")
+    print(f"Run: {rec['wall_s']:.2f} s wall, {rec['cpu_s']:.2f} s CPU, slowest phase {rec['slowest']} ({path}"
+          + (f", profile {rec['profile']}" if rec.get('profile') else '') + ')')
@@ -0,0 +1,224 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Persistent, content-hashed cache of KiCad symbol and footprint libraries for schematic.py.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Each library file is indexed once (symbol name -> byte span) and keyed on path, mtime, size and SHA-256. Index lives in .cache/kicad_libs/index.json.
+Note: Symbols are extracted lazily into one-symbol libraries, so skidl parses a few hundred bytes per symbol instead of all of Device.kicad_sym on every run.
+Note: A changed mtime/size triggers a rehash; a changed hash drops the stale index and extracted symbols for that file (e.g. after editing libraries/).
+"""
+
+import hashlib
+import json
+import os
+import re
+
+CACHE_DIR = os.environ.get('ECHOFORGE_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+LIB_CACHE_DIR = os.path.join(CACHE_DIR, 'kicad_libs')
+
+SYM_SUFFIXES = ('.kicad_sym', '.lib')
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[()]')
+_SYMBOL_RE = re.compile(r'\(symbol\s+"((?:[^"\\]|\\.)*)"')
+_EXTENDS_RE = re.compile(r'\(extends\s+"((?:[^"\\]|\\.)*)"')
+_VERSION_RE = re.compile(r'\(version\s+(\d+)\)')
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_kicad_sym(text):
+    """Map each top-level symbol in a .kicad_sym text to [start, end, extends]"""
+    symbols = {}
+    depth = 0
+    start = None
+    for m in _TOKEN_RE.finditer(text):
+        tok = m.group()
+        if tok == '(':
+            depth += 1
+            if depth == 2:
+                start = m.start()
+        elif tok == ')':
+            if depth == 2 and start is not None:
+                body = text[start:m.end()]
+                name = _SYMBOL_RE.match(body)
+                if name:
+                    ext = _EXTENDS_RE.search(body, 0, 512)
+                    symbols[name.group(1)] = [start, m.end(), ext.group(1) if ext else None]
+                start = None
+            depth -= 1
+    return symbols
+
+
+def scan_legacy_lib(text):
+    """Map each DEF (and its ALIASes) in a KiCad 5 .lib text to [start, end, None]"""
+    symbols = {}
+    for m in re.finditer(r'^DEF\s+~?(\S+).*?^ENDDEF[^\n]*\n?', text, re.M | re.S):
+        span = [m.start(), m.end(), None]
+        symbols[m.group(1)] = span
+        for alias in re.finditer(r'^ALIAS\s+(.*)$', m.group(), re.M):
+            for name in alias.group(1).split():
+                symbols[name] = span
+    return symbols
+
+
+def _safe_name(name):
+    return re.sub(r'[^\w.-]', '_', name) + '_' + hashlib.sha1(name.encode()).hexdigest()[:6]
+
+
+class LibCache:
+    """On-disk symbol/footprint index shared across runs"""
+
+    def __init__(self, search_paths, cache_dir=LIB_CACHE_DIR, fp_paths=None):
+        self.search_paths = [p for p in search_paths if p]
+        self.fp_paths = fp_paths if fp_paths is not None else self.search_paths
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self.stats = {'hits': 0, 'extracted': 0, 'rescanned': 0, 'rehashed': 0}
+        self._lib_files = {}
+        self._dirty = False
+        self.index = {'version': INDEX_VERSION, 'libs': {}, 'footprints': {}}
+        try:
+            with open(self.index_file, encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                self.index = index
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        """Write the index back if anything changed"""
+        if not self._dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f'{self.index_file}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, separators=(',', ':'))
+        os.replace(tmp, self.index_file)
+        self._dirty = False
+
+    def lib_file(self, lib):
+        """Absolute path of a symbol library, searched in search_paths order"""
+        path = self._lib_files.get(lib)
+        if path:
+            return path
+        if os.path.isabs(lib) and os.path.isfile(lib):
+            path = lib
+        else:
+            names = [lib] if lib.endswith(SYM_SUFFIXES) else [lib + s for s in SYM_SUFFIXES]
+            path = next((os.path.join(d, n) for d in self.search_paths for n in names
+                         if os.path.isfile(os.path.join(d, n))), None)
+        if not path:
+            raise FileNotFoundError(f"Symbol library {lib} not found in {self.search_paths}")
+        self._lib_files[lib] = path = os.path.abspath(path)
+        return path
+
+    def _entry(self, path):
+        """Index entry for a library file, rescanned only when its content changed"""
+        st = os.stat(path)
+        entry = self.index['libs'].get(path)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return entry
+        sha = file_sha256(path)
+        self.stats['rehashed'] += 1
+        if entry and entry['sha256'] == sha:
+            entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+        else:
+            if entry:
+                self._drop_extracted(entry)
+            with open(path, 'rb') as f:
+                text = f.read().decode('latin_1')
+            legacy = path.endswith('.lib')
+            version = None if legacy else _VERSION_RE.search(text, 0, 4096)
+            entry = {
+                'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': sha, 'legacy': legacy,
+                'version': version.group(1) if version else None,
+                'symbols': scan_legacy_lib(text) if legacy else scan_kicad_sym(text),
+            }
+            self.index['libs'][path] = entry
+            self.stats['rescanned'] += 1
+        self._dirty = True
+        return entry
+
+    def _sym_dir(self, entry):
+        return os.path.join(self.cache_dir, 'sym', entry['sha256'][:16])
+
+    def _drop_extracted(self, entry):
+        sym_dir = self._sym_dir(entry)
+        if os.path.isdir(sym_dir):
+            for fname in os.listdir(sym_dir):
+                os.remove(os.path.join(sym_dir, fname))
+            os.rmdir(sym_dir)
+
+    def symbol_lib(self, lib, name):
+        """Path of a one-symbol library holding `name` (plus any symbols it extends)"""
+        path = self.lib_file(lib)
+        entry = self._entry(path)
+        legacy = entry['legacy']
+        out = os.path.join(self._sym_dir(entry), _safe_name(name) + ('.lib' if legacy else '.kicad_sym'))
+        if os.path.exists(out):
+            self.stats['hits'] += 1
+            return out
+        chain = []
+        sym = name
+        while sym:
+            if sym not in entry['symbols']:
+                raise KeyError(f"Symbol {sym} not found in {path}")
+            chain.append(entry['symbols'][sym])
+            sym = entry['symbols'][sym][2]
+        with open(path, 'rb') as f:
+            bodies = []
+            for start, end, _ in reversed(chain):  # Parents before the symbols extending them
+                f.seek(start)
+                bodies.append(f.read(end - start).decode('latin_1'))
+        if legacy:
+            text = 'EESchema-LIBRARY Version 2.4\n#encoding utf-8\n' + ''.join(bodies) + '#\n#End Library\n'
+        else:
+            text = (f"(kicad_symbol_lib (version {entry['version'] or 20211014}) (generator echoforge_libcache)\n  "
+                    + '\n  '.join(bodies) + '\n)\n')
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        tmp = f'{out}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='latin_1') as f:
+            f.write(text)
+        os.replace(tmp, out)
+        self.stats['extracted'] += 1
+        return out
+
+    def part(self, lib, name, **kwargs):
+        """skidl.Part built from the cached one-symbol library"""
+        import skidl
+
+        return skidl.Part(self.symbol_lib(lib, name), name, **kwargs)
+
+    def footprint_path(self, footprint):
+        """Path of a 'Lib:Name' footprint's .kicad_mod file, or None"""
+        lib, _, name = footprint.partition(':')
+        for root in self.fp_paths:
+            pretty = os.path.join(root, lib + '.pretty')
+            if not os.path.isdir(pretty):
+                continue
+            mtime = os.stat(pretty).st_mtime_ns
+            entry = self.index['footprints'].get(pretty)
+            if not entry or entry['mtime_ns'] != mtime:
+                files = sorted(f for f in os.listdir(pretty) if f.endswith('.kicad_mod'))
+                listing = '\n'.join(f"{f}:{os.path.getsize(os.path.join(pretty, f))}" for f in files)
+                entry = {'mtime_ns': mtime, 'sha256': hashlib.sha256(listing.encode()).hexdigest(),
+                         'names': [f[:-len('.kicad_mod')] for f in files]}
+                self.index['footprints'][pretty] = entry
+                self._dirty = True
+            if name in entry['names']:
+                return os.path.join(pretty, name + '.kicad_mod')
+        return None
+
+    def report(self):
+        """Print cache statistics for this run"""
+        s = self.stats
+        print(f"Library cache: {s['hits']} hits, {s['extracted']} extracted, "
+              f"{s['rehashed']} rehashed, {s['rescanned']} rescanned ({self.cache_dir})")
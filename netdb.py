@@ -0,0 +1,144 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Indexed netlist database (SQLite) written by schematic.py, with a query API and CLI that need neither skidl nor the design script.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Tables parts(id, ref, name, value, footprint), nets(id, name, drive, implicit) and pins(id, part, num, name, func, net); pins.net is NULL for unconnected pins. Indexed on parts.ref, nets.name, pins.func, pins.net and pins.part.
+Note: The view connections joins all three (ref, part, value, footprint, pin, pin_name, func, net) for ad-hoc SQL. meta holds the design fingerprint the database was written from and no timestamp, so an unchanged design writes the same bytes.
+Usage: python netdb.py [-d schematic.db] net VCC_1V35 | part U1 | parts DGND [C] | func PWROUT | unconnected [FUNC] | sql "SELECT ..."
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+DB_FILE = 'schematic.db'
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE parts (id INTEGER PRIMARY KEY, ref TEXT NOT NULL, name TEXT, value TEXT, footprint TEXT);
+CREATE TABLE nets (id INTEGER PRIMARY KEY, name TEXT NOT NULL, drive INTEGER, implicit INTEGER);
+CREATE TABLE pins (id INTEGER PRIMARY KEY, part INTEGER NOT NULL REFERENCES parts, num TEXT, name TEXT, func TEXT,
+                   net INTEGER REFERENCES nets);
+CREATE UNIQUE INDEX parts_ref ON parts (ref);
+CREATE INDEX nets_name ON nets (name);
+CREATE INDEX pins_func ON pins (func);
+CREATE INDEX pins_net ON pins (net);
+CREATE INDEX pins_part ON pins (part);
+CREATE VIEW connections AS
+    SELECT parts.ref, parts.name AS part, parts.value, parts.footprint, pins.num AS pin, pins.name AS pin_name,
+           pins.func, nets.name AS net
+    FROM pins JOIN parts ON parts.id = pins.part LEFT JOIN nets ON nets.id = pins.net;
+"""
+
+
+def write(snap, path=DB_FILE, design=None):
+    """Write a snapshot.Snapshot to a fresh database at path (atomically replaced)"""
+    start = time.perf_counter()
+    tmp = f'{path}.{os.getpid()}.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp)
+    try:
+        db.execute('PRAGMA journal_mode = OFF')
+        db.execute('PRAGMA synchronous = OFF')
+        db.executescript(SCHEMA)
+        db.executemany('INSERT INTO meta VALUES (?, ?)', [('design', design or ''), ('pins', str(snap.n_pins))])
+        db.executemany('INSERT INTO parts VALUES (?, ?, ?, ?, ?)',
+                       zip(range(snap.n_parts), snap.part_ref, snap.part_name, snap.part_value, snap.part_fp))
+        db.executemany('INSERT INTO nets VALUES (?, ?, ?, ?)',
+                       zip(range(snap.n_nets), snap.net_name, snap.net_drive, snap.net_implicit))
+        db.executemany('INSERT INTO pins VALUES (?, ?, ?, ?, ?, ?)',
+                       ((pin, snap.pin_part[pin], snap.pin_num[pin], snap.pin_name[pin], snap.pin_func_name(pin),
+                         snap.pin_net[pin] if snap.pin_net[pin] >= 0 else None) for pin in range(snap.n_pins)))
+        db.commit()
+    finally:
+        db.close()
+    os.replace(tmp, path)
+    print(f"Netlist DB: {snap.n_parts} parts, {snap.n_pins} pins, {snap.n_nets} nets in "
+          f"{(time.perf_counter() - start) * 1e3:.1f} ms ({path})")
+
+
+class NetDB:
+    """Read-only queries on a database written by write()"""
+
+    def __init__(self, path=DB_FILE):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"{path} not found; run schematic.py first")
+        self.db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        self.db.row_factory = sqlite3.Row
+
+    def close(self):
+        self.db.close()
+
+    def query(self, sql, params=()):
+        """Rows of an arbitrary SELECT"""
+        return self.db.execute(sql, params).fetchall()
+
+    def meta(self):
+        return dict(self.query('SELECT key, value FROM meta'))
+
+    def net(self, name):
+        """Pins on a net: ref, part, value, pin, pin_name, func"""
+        return self.query('SELECT parts.ref, parts.name AS part, parts.value, pins.num AS pin, pins.name AS pin_name, '
+                          'pins.func FROM nets JOIN pins ON pins.net = nets.id JOIN parts ON parts.id = pins.part '
+                          'WHERE nets.name = ? ORDER BY parts.ref, pins.num', (name,))
+
+    def part(self, ref):
+        """Pins of a part with their nets: pin, pin_name, func, net"""
+        return self.query('SELECT pins.num AS pin, pins.name AS pin_name, pins.func, nets.name AS net '
+                          'FROM parts JOIN pins ON pins.part = parts.id LEFT JOIN nets ON nets.id = pins.net '
+                          'WHERE parts.ref = ? ORDER BY pins.id', (ref,))
+
+    def parts_on(self, net, part_name=None):
+        """Distinct parts with a pin on a net, optionally only one symbol (e.g. 'C'): ref, part, value, footprint"""
+        sql = ('SELECT DISTINCT parts.ref, parts.name AS part, parts.value, parts.footprint FROM nets '
+               'JOIN pins ON pins.net = nets.id JOIN parts ON parts.id = pins.part WHERE nets.name = ?')
+        params = [net]
+        if part_name:
+            sql += ' AND parts.name = ?'
+            params.append(part_name)
+        return self.query(sql + ' ORDER BY parts.ref', params)
+
+    def func(self, func):
+        """Pins with a given function (PWROUT, BIDIR, ...): ref, pin, pin_name, net"""
+        return self.query('SELECT parts.ref, pins.num AS pin, pins.name AS pin_name, nets.name AS net FROM pins '
+                          'JOIN parts ON parts.id = pins.part LEFT JOIN nets ON nets.id = pins.net '
+                          'WHERE pins.func = ? ORDER BY parts.ref, pins.id', (func.upper(),))
+
+    def unconnected(self, func=None):
+        """Pins on no net, optionally of one function: ref, pin, pin_name, func"""
+        sql = ('SELECT parts.ref, pins.num AS pin, pins.name AS pin_name, pins.func FROM pins '
+               'JOIN parts ON parts.id = pins.part WHERE pins.net IS NULL')
+        if func:
+            return self.query(sql + ' AND pins.func = ? ORDER BY parts.ref, pins.id', (func.upper(),))
+        return self.query(sql + ' ORDER BY parts.ref, pins.id')
+
+
+def print_rows(rows):
+    """Rows as aligned columns plus a count"""
+    if rows:
+        cols = rows[0].keys()
+        widths = [max(len(c), *(len(str(r[c])) for r in rows)) for c in cols]
+        print('  '.join(c.ljust(w) for c, w in zip(cols, widths)))
+        for r in rows:
+            print('  '.join(str(r[c]).ljust(w) for c, w in zip(cols, widths)))
+    print(f"({len(rows)} rows)")
+
+
+COMMANDS = {'net': NetDB.net, 'part': NetDB.part, 'parts': NetDB.parts_on, 'func': NetDB.func,
+            'unconnected': NetDB.unconnected, 'sql': NetDB.query}
+
+
+if __name__ == '__main__':
+    argv = sys.argv[1:]
+    path = DB_FILE
+    if argv[:1] == ['-d']:
+        path, argv = argv[1], argv[2:]
+    if not argv or argv[0] not in COMMANDS:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    db = NetDB(path)
+    try:
+        print_rows(COMMANDS[argv[0]](db, *argv[1:]))
+    finally:
+        db.close()
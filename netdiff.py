@@ -0,0 +1,231 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Structural diff of two KiCad netlists that ignores reference designators, for reviewing changes to schematic.py.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: A part is its (symbol, value, footprint); a connection is (net, symbol, footprint, pin). Both sides become multisets, so re-numbered refs (r_term, decaps, audio channels) diff as nothing.
+Note: Unnamed nets (N$..., Net-(...)) are labelled by a hash of the (symbol, value, footprint, pin) on them, so they match across runs without depending on the rest of the design; an unnamed net that gained or lost pins keeps the label of the old net it shares most pins with. Named nets with identical members under a new name are reported as renames.
+Note: Removed + added pairs are folded into value changes (same symbol, footprint and connections) and moved pins (same part pin, other net). Everything is dict/Counter work, linear in the netlist size.
+Usage: python netdiff.py old.net new.net [--json]   (exit status 1 when they differ)
+"""
+
+import hashlib
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+
+import sexpr
+
+IMPLICIT_PREFIXES = ('N$', 'Net-(', 'unconnected-(')
+MAX_REFS = 4  # Example refs shown per line
+
+
+class Netlist:
+    """Parts {ref: (symbol, value, footprint)} and nets {name: [(ref, pin)]} of a KiCad netlist"""
+
+    def __init__(self, parts, nets):
+        self.parts = parts
+        self.nets = nets
+
+    @classmethod
+    def read(cls, path):
+        root = sexpr.read(path)
+        parts = {}
+        for comp in sexpr.findall(sexpr.find(root, 'components') or [], 'comp'):
+            lib = sexpr.find(comp, 'libsource') or []
+            parts[sexpr.value(comp, 'ref')] = (sexpr.value(lib, 'part', ''), sexpr.value(comp, 'value', ''),
+                                               sexpr.value(comp, 'footprint', ''))
+        nets = {}
+        for net in sexpr.findall(sexpr.find(root, 'nets') or [], 'net'):
+            nets[sexpr.value(net, 'name')] = [(sexpr.value(n, 'ref'), sexpr.value(n, 'pin'))
+                                              for n in sexpr.findall(net, 'node')]
+        return cls(parts, nets)
+
+
+def _hash(items):
+    return hashlib.blake2b(repr(items).encode(), digest_size=6).hexdigest()
+
+
+def _members(netlist, nodes):
+    """Ref-free hash of the (part, pin) multiset on a net"""
+    return _hash(sorted((netlist.parts.get(ref), pin) for ref, pin in nodes))
+
+
+def net_labels(netlist):
+    """Net name -> label: the name itself, or '~<hash of (part, pin) members>' for unnamed nets"""
+    return {name: '~' + _members(netlist, nodes) if name.startswith(IMPLICIT_PREFIXES) else name
+            for name, nodes in netlist.nets.items()}
+
+
+def match_unnamed(a, b, labels_a, labels_b):
+    """Give an unnamed net of b that gained or lost members the label of the a net it shares most pins with"""
+    implicit = lambda netlist, labels, others: [n for n in netlist.nets
+                                                if n.startswith(IMPLICIT_PREFIXES) and labels[n] not in others]
+    only_a = implicit(a, labels_a, set(labels_b.values()))
+    only_b = implicit(b, labels_b, set(labels_a.values()))
+    index = defaultdict(list)
+    for n in only_b:
+        for ref, pin in b.nets[n]:
+            index[(b.parts.get(ref), pin)].append(n)
+    claimed = set()
+    for n in only_a:
+        votes = Counter(m for ref, pin in a.nets[n] for m in index.get((a.parts.get(ref), pin), ()) if m not in claimed)
+        if votes:
+            m = votes.most_common(1)[0][0]
+            labels_b[m] = labels_a[n]
+            claimed.add(m)
+
+
+def _new_refs(refs, other):
+    """Example refs for a changed key, preferring those not also under the key on the other side"""
+    other = set(other)
+    return ([r for r in refs if r not in other] or list(refs))[:MAX_REFS]
+
+
+def renames(a, b):
+    """{old name: new name} for named nets that only changed name"""
+    gone = [n for n in a.nets if n not in b.nets and not n.startswith(IMPLICIT_PREFIXES)]
+    new = defaultdict(list)
+    for n in b.nets:
+        if n not in a.nets and not n.startswith(IMPLICIT_PREFIXES):
+            new[_members(b, b.nets[n])].append(n)
+    found = {}
+    for n in gone:
+        candidates = new.get(_members(a, a.nets[n]))
+        if candidates:
+            found[n] = candidates.pop(0)
+    return found
+
+
+def _index(netlist, labels):
+    """(parts Counter, connections Counter, example refs per key)"""
+    part_pins = defaultdict(list)
+    conns = Counter()
+    refs = defaultdict(list)
+    for name, nodes in netlist.nets.items():
+        for ref, pin in nodes:
+            symbol, _, footprint = netlist.parts.get(ref, ('?', '', ''))
+            key = (labels[name], symbol, footprint, pin)
+            conns[key] += 1
+            refs[key].append(ref)
+            part_pins[ref].append((pin, labels[name]))
+    parts = Counter()
+    for ref, (symbol, value, footprint) in netlist.parts.items():
+        key = ((symbol, footprint, tuple(sorted(part_pins[ref]))), value)
+        parts[key] += 1
+        refs[key].append(ref)
+    return parts, conns, refs
+
+
+def diff(a, b):
+    """Change list between Netlists a (old) and b (new) as a dict of lists"""
+    start = time.perf_counter()
+    renamed = renames(a, b)
+    labels_a, labels_b = net_labels(a), net_labels(b)
+    labels_a = {n: renamed.get(n, label) for n, label in labels_a.items()}
+    match_unnamed(a, b, labels_a, labels_b)
+    names_a = {label: n for n, label in labels_a.items()}  # Labels back to a readable net name
+    names_b = {label: n for n, label in labels_b.items()}
+    parts_a, conns_a, refs_a = _index(a, labels_a)
+    parts_b, conns_b, refs_b = _index(b, labels_b)
+
+    # Parts: same symbol, footprint and connections with another value are value changes
+    removed, added = parts_a - parts_b, parts_b - parts_a
+    by_context = defaultdict(list)
+    for (context, value), n in added.items():
+        by_context[context].append([value, n])
+    values = defaultdict(lambda: {'count': 0, 'refs': []})
+    for (context, old), n in sorted(removed.items()):
+        for slot in by_context.get(context, []):
+            take = min(n, slot[1])
+            if take:
+                change = values[(context[0], context[1], old, slot[0])]
+                change['count'] += take
+                change['refs'] += _new_refs(refs_b[(context, slot[0])], refs_a.get((context, old), ()))
+                removed[(context, old)] -= take
+                added[(context, slot[0])] -= take
+                slot[1] -= take
+                n -= take
+    part_changes = Counter()
+    part_refs = defaultdict(list)
+    for sign, counter, refs, other in ((-1, removed, refs_a, refs_b), (1, added, refs_b, refs_a)):
+        for key, n in counter.items():
+            if n > 0:
+                (symbol, footprint, _), value = key
+                part_changes[(symbol, value, footprint)] += sign * n
+                part_refs[(symbol, value, footprint)] += _new_refs(refs[key], other.get(key, ()))
+
+    # Connections: a part pin that left one net and joined another moved
+    gone, new = conns_a - conns_b, conns_b - conns_a
+    arrivals = defaultdict(list)
+    for (label, *pin_key), n in sorted(new.items()):
+        arrivals[tuple(pin_key)].append([label, n])
+    moved = []
+    for (label, *pin_key), n in sorted(gone.items()):
+        for slot in arrivals.get(tuple(pin_key), []):
+            take = min(n, slot[1])
+            if take:
+                moved.append({'symbol': pin_key[0], 'footprint': pin_key[1], 'pin': pin_key[2],
+                              'from': names_a[label], 'to': names_b[slot[0]], 'count': take,
+                              'refs': _new_refs(refs_b[(slot[0], *pin_key)], refs_a.get((label, *pin_key), ()))})
+                gone[(label, *pin_key)] -= take
+                new[(slot[0], *pin_key)] -= take
+                slot[1] -= take
+                n -= take
+    conn = lambda counter, names, refs, other: [
+        {'net': names[k[0]], 'symbol': k[1], 'footprint': k[2], 'pin': k[3], 'count': n,
+         'refs': _new_refs(refs[k], other.get(k, ()))} for k, n in sorted(counter.items()) if n > 0]
+    return {
+        'parts': [{'symbol': k[0], 'value': k[1], 'footprint': k[2], 'count': n, 'refs': part_refs[k][:MAX_REFS]}
+                  for k, n in sorted(part_changes.items()) if n],
+        'values': [{'symbol': k[0], 'footprint': k[1], 'old': k[2], 'new': k[3], 'count': v['count'],
+                    'refs': v['refs'][:MAX_REFS]} for k, v in values.items()],
+        'renamed': [{'from': old, 'to': new_name} for old, new_name in sorted(renamed.items())],
+        'moved': moved,
+        'added': conn(new, names_b, refs_b, refs_a),
+        'removed': conn(gone, names_a, refs_a, refs_b),
+        'size': {'old': [len(a.parts), len(a.nets)], 'new': [len(b.parts), len(b.nets)]},
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+
+def changed(result):
+    return any(result[k] for k in ('parts', 'values', 'renamed', 'moved', 'added', 'removed'))
+
+
+def report(result):
+    """Readable change list"""
+    refs = lambda r: f" ({', '.join(r)}{', ...' if len(r) == MAX_REFS else ''})" if r else ''
+    times = lambda n: f' x{n}' if n > 1 else ''
+    for p in result['parts']:
+        print(f"{'+' if p['count'] > 0 else '-'} part {p['symbol']} {p['value']} [{p['footprint']}]"
+              f"{times(abs(p['count']))}{refs(p['refs'])}")
+    for v in result['values']:
+        print(f"~ value {v['symbol']} [{v['footprint']}] {v['old']} -> {v['new']}{times(v['count'])}{refs(v['refs'])}")
+    for r in result['renamed']:
+        print(f"~ net {r['from']} -> {r['to']}")
+    for m in result['moved']:
+        print(f"~ {m['symbol']} pin {m['pin']}: {m['from']} -> {m['to']}{times(m['count'])}{refs(m['refs'])}")
+    for sign, key in (('+', 'added'), ('-', 'removed')):
+        for c in result[key]:
+            print(f"{sign} {c['net']}: {c['symbol']} pin {c['pin']}{times(c['count'])}{refs(c['refs'])}")
+    (pa, na), (pb, nb) = result['size']['old'], result['size']['new']
+    print(f"Netdiff: {pa} -> {pb} parts, {na} -> {nb} nets, "
+          f"{'changed' if changed(result) else 'no structural changes'} ({result['seconds'] * 1e3:.1f} ms)")
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if a != '--json']
+    if len(args) != 2:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    start = time.perf_counter()
+    old, new = Netlist.read(args[0]), Netlist.read(args[1])
+    parsed = time.perf_counter() - start
+    result = diff(old, new)
+    result['parse_seconds'] = round(parsed, 4)
+    if '--json' in sys.argv:
+        print(json.dumps(result, indent=1))
+    else:
+        report(result)
+    sys.exit(1 if changed(result) else 0)
@@ -0,0 +1,125 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Output pipeline for schematic.py: netlist first, then schematic and kinet2pcb board in parallel worker processes.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Workers are forked after the design is built, so each inherits the in-memory skidl circuit; kinet2pcb only reads the netlist file.
+Note: Every stage goes through incremental.StageCache and reports its own time and error; a crash in one worker (e.g. pcbnew failing to import) does not hide the others.
+Note: Platforms without fork run the parallel stages one after the other.
+"""
+
+import multiprocessing
+import os
+import time
+import traceback
+
+FP_LIB_DIRS = [d for d in (os.environ.get('KISYSMOD'),
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), 'libraries')) if d]
+
+
+def generate_netlist(path):
+    """KiCad netlist streamed to disk in ref/name order (see artifacts.py)"""
+    import artifacts
+
+    artifacts.write_netlist(path)
+
+
+def generate_schematic(path):
+    import skidl
+
+    skidl.generate_schematic(file_=path)
+
+
+def generate_pcb(netlist_file, path, fp_lib_dirs=None, place=True):
+    """kinet2pcb board; footprints are then spread out around the DSP by placement.py"""
+    from kinet2pcb import kinet2pcb
+
+    kinet2pcb(netlist_file, path, fp_lib_dirs if fp_lib_dirs is not None else FP_LIB_DIRS)
+    if place:
+        import placement
+
+        placement.run(path)
+
+
+class Stage:
+    """One output artifact: its cache key, files and build function"""
+
+    def __init__(self, name, key, outputs, build):
+        self.name = name
+        self.key = key
+        self.outputs = outputs
+        self.build = build
+
+
+def run_stage(stages, stage):
+    """Run one stage through the cache; returns its result dict"""
+    start = time.perf_counter()
+    result = {'stage': stage.name, 'ok': False, 'cached': False, 'error': None, 'outputs': stage.outputs}
+    try:
+        result['cached'] = stages.run(stage.name, stage.key, stage.outputs, stage.build)
+        result['ok'] = all(os.path.isfile(o) for o in stage.outputs)
+        if not result['ok']:
+            result['error'] = f"{', '.join(o for o in stage.outputs if not os.path.isfile(o))} not written"
+    except BaseException as e:  # Workers must always report back
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _worker(stages, stage, conn):
+    conn.send(run_stage(stages, stage))
+    conn.close()
+
+
+def run_parallel(stages, parallel):
+    """Run stages in forked processes (sequentially without fork); results in input order"""
+    if len(parallel) < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        return [run_stage(stages, stage) for stage in parallel]
+    ctx = multiprocessing.get_context('fork')
+    workers = []
+    for stage in parallel:
+        recv, send = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_worker, args=(stages, stage, send), name=f'echoforge-{stage.name}')
+        proc.start()
+        send.close()
+        workers.append((stage, proc, recv, time.perf_counter()))
+    results = []
+    for stage, proc, recv, start in workers:
+        try:
+            result = recv.recv()
+        except EOFError:  # Worker died without reporting
+            proc.join()
+            result = {'stage': stage.name, 'ok': False, 'cached': False, 'outputs': stage.outputs,
+                      'error': f'worker exited without a result (exit code {proc.exitcode})',
+                      'seconds': round(time.perf_counter() - start, 3)}
+        proc.join()
+        results.append(result)
+    return results
+
+
+def run_pipeline(stages, netlist, parallel):
+    """Netlist stage, then the stages that depend on it in parallel; prints a summary and returns all results"""
+    start = time.perf_counter()
+    results = [run_stage(stages, netlist)]
+    if results[0]['ok']:
+        results += run_parallel(stages, parallel)
+    else:
+        results += [{'stage': s.name, 'ok': False, 'cached': False, 'outputs': s.outputs, 'seconds': 0.0,
+                     'error': 'skipped: netlist failed'} for s in parallel]
+    report(results, time.perf_counter() - start)
+    return results
+
+
+def report(results, wall):
+    """Print one line per stage plus the pipeline wall-clock time"""
+    for r in results:
+        state = 'cached' if r['cached'] and r['ok'] else 'ok' if r['ok'] else 'FAILED'
+        line = f"[{r['stage']}] {state} in {r['seconds']:.2f} s"
+        if r['error']:
+            line += f": {r['error']}"
+        print(line)
+        if r.get('traceback'):
+            print(r['traceback'], end='')
+    serial = sum(r['seconds'] for r in results)
+    print(f"Outputs: {sum(r['ok'] for r in results)}/{len(results)} ok, {wall:.2f} s wall ({serial:.2f} s serial)")
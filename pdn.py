@@ -0,0 +1,196 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Power-delivery-network impedance check per rail, from the capacitors actually on each net.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Capacitors between a rail in RAILS and a ground net are found in the design snapshot and modelled as ESR + ESL + C from parts/capacitors.csv; the regulator output is VRM_R + VRM_L.
+Note: All capacitors of all rails are evaluated in one (caps x frequencies) NumPy array and summed per rail as admittances, 10k log-spaced points from 1 kHz to 1 GHz.
+Note: Target impedance is V * ripple / transient current; the report lists where |Z| exceeds it below each rail's f_max. The plot needs matplotlib and is skipped without it.
+Note: The schematic.py stage writes the report only; the plot takes seconds, so it is drawn by the standalone run.
+Run `python pdn.py` to build the design and write the report and plot standalone.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+PARTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'capacitors.csv')
+REPORT_FILE = 'pdn_report.json'
+PLOT_FILE = 'pdn_impedance.png'
+
+# Rail: (volts, allowed ripple, transient current in A, highest frequency that must meet target in Hz)
+RAILS = {
+    'VCC_1V0': (1.0, 0.03, 2.0, 100e6),  # DSP CVDD/CVDD1 core
+    'VCC_1V35': (1.35, 0.05, 0.5, 100e6),  # DDR3L VDD/VDDQ
+    'VCC_1V5': (1.5, 0.05, 0.5, 100e6),  # DSP DVDD15 (DDR interface)
+    'VCC_1V8': (1.8, 0.05, 0.3, 50e6),  # DSP DVDD18 I/O
+    'VCC_3V3': (3.3, 0.05, 0.2, 20e6),
+    'VCC_AUDIO': (3.3, 0.01, 0.05, 20e6),  # Codec AVDD/IOVDD after ferrite
+}
+GROUND_NETS = ('DGND', 'AGND')
+CAP_PARTS = ('C', 'C_Small', 'C_Polarized', 'CP')
+VRM_R = 0.005  # Regulator output resistance (ohms)
+VRM_L = 20e-9  # Effective regulator inductance (loop bandwidth ~100 kHz)
+FREQS = np.logspace(3, 9, 10001)
+
+_SI = {'p': 1e-12, 'n': 1e-9, 'u': 1e-6, 'µ': 1e-6, 'm': 1e-3, '': 1.0}
+_VALUE_RE = re.compile(r'^\s*([0-9.]+)\s*([pnuµm]?)F?\s*$')
+_PACKAGE_RE = re.compile(r'C_(\d{4})_')
+
+
+def parse_farads(value):
+    """'0.1u' -> 1e-7, or None if not a capacitance"""
+    m = _VALUE_RE.match(value or '')
+    return float(m.group(1)) * _SI[m.group(2)] if m else None
+
+
+def package(footprint):
+    """'Capacitor_SMD:C_0402_1005Metric' -> '0402'"""
+    m = _PACKAGE_RE.search(footprint or '')
+    return m.group(1) if m else ''
+
+
+def load_parts(path=PARTS_FILE):
+    """(value, package) -> (esr ohms, esl henries)"""
+    models = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = csv.DictReader(line for line in f if line.strip() and not line.lstrip().startswith('#'))
+        for rec in rows:
+            models[(rec['value'].strip(), rec['package'].strip())] = (float(rec['esr_mohm']) * 1e-3,
+                                                                      float(rec['esl_nh']) * 1e-9)
+    return models
+
+
+def find_decaps(snap):
+    """{rail: [part index]} for capacitors with one pin on a rail and the other on a ground net"""
+    found = {rail: [] for rail in RAILS}
+    for part in range(snap.n_parts):
+        if snap.part_name[part] not in CAP_PARTS:
+            continue
+        nets = [snap.net_name[snap.pin_net[p]] if snap.pin_net[p] >= 0 else None for p in snap.part_pins(part)]
+        if len(nets) != 2:
+            continue
+        for a, b in (nets, nets[::-1]):
+            if a in RAILS and b in GROUND_NETS:
+                found[a].append(part)
+    return found
+
+
+def _bands(mask, freqs):
+    """[[f_start, f_end], ...] for each run of True in mask"""
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.astype(np.int8), [0]])))
+    return [[round(float(freqs[a])), round(float(freqs[b - 1]))] for a, b in zip(edges[::2], edges[1::2])]
+
+
+def analyze(snap, parts_file=PARTS_FILE, freqs=FREQS):
+    """Per-rail impedance curves and pass/fail against target; returns (report dict, {rail: |Z| array})"""
+    start = time.perf_counter()
+    models = load_parts(parts_file)
+    decaps = find_decaps(snap)
+    rails = list(RAILS)
+    c, esr, esl, rail_idx, unmodelled = [], [], [], [], []
+    for r, rail in enumerate(rails):
+        for part in decaps[rail]:
+            value, pkg = snap.part_value[part], package(snap.part_fp[part])
+            farads = parse_farads(value)
+            if farads is None or (value, pkg) not in models:
+                unmodelled.append(f"{snap.part_ref[part]} ({value} {pkg or snap.part_fp[part]}) on {rail}")
+                continue
+            c.append(farads)
+            esr.append(models[(value, pkg)][0])
+            esl.append(models[(value, pkg)][1])
+            rail_idx.append(r)
+    w = 2 * np.pi * freqs[None, :]
+    c, esr, esl = (np.array(x)[:, None] for x in (c, esr, esl))
+    y_caps = 1 / (esr + 1j * (w * esl - 1 / (w * c)))  # (caps, F)
+    member = np.zeros((len(rails), len(rail_idx)))
+    member[rail_idx, np.arange(len(rail_idx))] = 1
+    y = member @ y_caps + 1 / (VRM_R + 1j * w[0] * VRM_L)
+    z = np.abs(1 / y)  # (rails, F)
+
+    report = {'freqs': [float(freqs[0]), float(freqs[-1]), len(freqs)], 'unmodelled': unmodelled, 'rails': []}
+    curves = {}
+    for r, rail in enumerate(rails):
+        volts, ripple, amps, f_max = RAILS[rail]
+        target = volts * ripple / amps
+        band = freqs <= f_max
+        over = band & (z[r] > target)
+        peak = int(np.argmax(np.where(band, z[r], 0)))
+        report['rails'].append({
+            'rail': rail, 'capacitors': len(decaps[rail]), 'target_ohm': round(target, 5), 'f_max_hz': f_max,
+            'peak_ohm': round(float(z[r, peak]), 5), 'peak_hz': round(float(freqs[peak])),
+            'pass': not over.any(),
+            'over_target_hz': _bands(over, freqs),
+            'values': sorted({snap.part_value[p] for p in decaps[rail]}),
+        })
+        curves[rail] = z[r]
+    report['seconds'] = round(time.perf_counter() - start, 4)
+    return report, curves
+
+
+def write_report(report, path=REPORT_FILE):
+    """Write the report as JSON and print its summary"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    summary(report, path)
+
+
+def summary(report, path=REPORT_FILE):
+    """Print one line per rail"""
+    for r in report['rails']:
+        print(f"PDN {r['rail']}: {r['capacitors']} caps, peak {r['peak_ohm'] * 1e3:.1f} mOhm at "
+              f"{r['peak_hz'] / 1e6:.3g} MHz, target {r['target_ohm'] * 1e3:.1f} mOhm -> {'pass' if r['pass'] else 'FAIL'}")
+    for u in report['unmodelled']:
+        print(f"PDN: no model for {u}")
+    print(f"PDN: {len(report['rails'])} rails in {report['seconds'] * 1e3:.1f} ms ({path})")
+
+
+def plot(report, curves, path=PLOT_FILE, freqs=FREQS):
+    """|Z| per rail against its target, one panel per rail; False if matplotlib is missing"""
+    try:
+        import matplotlib
+
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("PDN: matplotlib not installed, skipping plot")
+        return False
+    rails = report['rails']
+    cols = 3
+    rows = (len(rails) + cols - 1) // cols
+    fig, axes = plt.subplots(rows, cols, figsize=(5 * cols, 3.5 * rows), squeeze=False)
+    for ax, r in zip(axes.flat, rails):
+        ax.loglog(freqs, curves[r['rail']], label='|Z|')
+        ax.hlines(r['target_ohm'], freqs[0], r['f_max_hz'], colors='r', linestyles='--', label='target')
+        ax.set_title(f"{r['rail']} ({r['capacitors']} caps, {'pass' if r['pass'] else 'FAIL'})")
+        ax.set_xlabel('Hz')
+        ax.set_ylabel('Ohm')
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend(loc='upper left')
+    for ax in list(axes.flat)[len(rails):]:
+        ax.axis('off')
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return True
+
+
+def run(snap, report_file=REPORT_FILE, plot_file=None):
+    """Analyze and write the report, and the plot when plot_file is given"""
+    report, curves = analyze(snap)
+    write_report(report, report_file)
+    if plot_file:
+        plot(report, curves, plot_file)
+    return report
+
+
+if __name__ == '__main__':
+    import schematic
+    import snapshot
+
+    schematic.build_design()
+    run(snapshot.take_snapshot(), plot_file=PLOT_FILE)
@@ -0,0 +1,165 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Table-driven pinout loader for the custom parts used by schematic.py.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Pin tables live in pinouts/<part>.csv with columns ball,name,function[,note]. Lines starting with '#' are comments.
+Note: Tables are stored column-wise (tuples + a byte array of function codes) with ball->row and name->rows indexes, so a full 625-ball BGA loads and builds in milliseconds.
+Run `python pinout.py` to time loading every table plus a synthetic 625-ball part.
+"""
+
+import csv
+import os
+import time
+from array import array
+
+PINOUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pinouts')
+
+# Pin function names accepted in the tables (same names as skidl.Pin.types)
+PIN_FUNCS = ('INPUT', 'OUTPUT', 'BIDIR', 'TRISTATE', 'PASSIVE', 'UNSPEC', 'PWRIN', 'PWROUT',
+             'OPENCOLL', 'OPENEMIT', 'PULLUP', 'PULLDN', 'NOCONNECT', 'FREE')
+FUNC_CODE = {name: code for code, name in enumerate(PIN_FUNCS)}
+
+# Load/build timings per part, filled in by load_pinout() and make_part()
+TIMINGS = {}
+
+_tables = {}
+
+
+class PinTable:
+    """Array-backed pin table for one part, indexed by ball and by pin name"""
+
+    __slots__ = ('part', 'balls', 'names', 'funcs', 'notes', 'by_ball', 'by_name')
+
+    def __init__(self, part, balls, names, funcs, notes=None):
+        self.part = part
+        self.balls = tuple(balls)
+        self.names = tuple(names)
+        self.funcs = array('B', funcs)
+        self.notes = tuple(notes) if notes else ('',) * len(self.balls)
+        self.by_ball = {}
+        by_name = {}
+        for row, (ball, name) in enumerate(zip(self.balls, self.names)):
+            self.by_ball.setdefault(ball, row)  # First row wins; duplicates are a DRC matter
+            by_name.setdefault(name, []).append(row)
+        self.by_name = {name: tuple(rows) for name, rows in by_name.items()}
+
+    def __len__(self):
+        return len(self.balls)
+
+    def __repr__(self):
+        return f"PinTable({self.part!r}, {len(self)} pins)"
+
+    def row(self, ball):
+        """Row index of a ball, or None"""
+        return self.by_ball.get(ball)
+
+    def rows(self, name):
+        """Row indexes of every pin with the given name"""
+        return self.by_name.get(name, ())
+
+    def func(self, row):
+        """Function name of a row"""
+        return PIN_FUNCS[self.funcs[row]]
+
+
+def read_pinout(path, part=None):
+    """Parse a pin table file into a PinTable"""
+    part = part or os.path.splitext(os.path.basename(path))[0]
+    balls, names, funcs, notes = [], [], array('B'), []
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = csv.reader(line for line in f if line.strip() and not line.lstrip().startswith('#'))
+        header = next(rows, None)
+        if not header or [h.strip().lower() for h in header[:3]] != ['ball', 'name', 'function']:
+            raise ValueError(f"{path}: expected header 'ball,name,function[,note]'")
+        for rec in rows:
+            if len(rec) < 3:
+                raise ValueError(f"{path}: malformed row {rec!r}")
+            func = rec[2].strip().upper()
+            if func not in FUNC_CODE:
+                raise ValueError(f"{path}: unknown pin function {rec[2]!r} for ball {rec[0]}")
+            balls.append(rec[0].strip())
+            names.append(rec[1].strip())
+            funcs.append(FUNC_CODE[func])
+            notes.append(rec[3].strip() if len(rec) > 3 else '')
+    return PinTable(part, balls, names, funcs, notes)
+
+
+def load_pinout(part, pinout_dir=PINOUT_DIR):
+    """Load (once per process) the pin table for a part"""
+    table = _tables.get((pinout_dir, part))
+    if table is None:
+        start = time.perf_counter()
+        table = read_pinout(os.path.join(pinout_dir, f'{part}.csv'), part)
+        TIMINGS[part] = {'pins': len(table), 'load_ms': (time.perf_counter() - start) * 1e3}
+        _tables[(pinout_dir, part)] = table
+    return table
+
+
+def make_part(table, footprint=None, ref=None, **kwargs):
+    """Build a skidl Part from a PinTable (or part name); part.pins keep table row order"""
+    import skidl
+
+    if isinstance(table, str):
+        table = load_pinout(table)
+    start = time.perf_counter()
+    types = [skidl.Pin.types[name] for name in PIN_FUNCS]
+    pins = [skidl.Pin(num=ball, name=name, func=types[code])
+            for ball, name, code in zip(table.balls, table.names, table.funcs)]
+    part = skidl.Part(name=table.part, tool=skidl.SKIDL, pins=pins, footprint=footprint, ref=ref, **kwargs)
+    part.pin_table = table
+    TIMINGS.setdefault(table.part, {'pins': len(table)})['build_ms'] = (time.perf_counter() - start) * 1e3
+    return part
+
+
+def report():
+    """Print the load/build timings collected so far"""
+    for part, t in TIMINGS.items():
+        print(f"Pinout {part}: {t.get('pins', '?')} pins, load {t.get('load_ms', 0):.2f} ms, "
+              f"build {t.get('build_ms', 0):.2f} ms")
+
+
+_ROW_LETTERS = list('ABCDEFGHJKLMNPRTUVWY')  # JEDEC row letters skip I, O, Q, S, X, Z
+BALL_ROWS = _ROW_LETTERS + [a + b for a in _ROW_LETTERS for b in _ROW_LETTERS]
+_BALL_INDEX = {name: row for row, name in enumerate(BALL_ROWS)}
+
+
+def bga_balls(rows, cols):
+    """JEDEC ball names for a rows x cols grid"""
+    return [f'{BALL_ROWS[r]}{c + 1}' for r in range(rows) for c in range(cols)]
+
+
+def ball_grid(ball):
+    """JEDEC ball name -> 0-based (row, column), or None: 'B10' -> (1, 9)"""
+    letters = ball.rstrip('0123456789')
+    digits = ball[len(letters):]
+    if not digits or letters not in _BALL_INDEX:
+        return None
+    return _BALL_INDEX[letters], int(digits) - 1
+
+
+def synthetic_table(rows=25, cols=25, part='BGA625_SYNTH'):
+    """Full-grid PinTable used for startup benchmarks"""
+    balls = bga_balls(rows, cols)
+    names = [f'IO{i}' for i in range(len(balls))]
+    funcs = [FUNC_CODE['BIDIR']] * len(balls)
+    return PinTable(part, balls, names, funcs)
+
+
+if __name__ == '__main__':
+    for fname in sorted(os.listdir(PINOUT_DIR)):
+        if fname.endswith('.csv'):
+            load_pinout(fname[:-4])
+    table = synthetic_table()
+    path = os.path.join(os.environ.get('TMPDIR', '/tmp'), f'{table.part}.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('ball,name,function\n')
+        f.writelines(f'{b},{n},{table.func(i)}\n' for i, (b, n) in enumerate(zip(table.balls, table.names)))
+    table = load_pinout(table.part, os.path.dirname(path))
+    try:
+        import skidl
+        skidl.reset()
+        make_part(table)
+    except ImportError:
+        print("skidl not installed; timing table loads only")
+    report()
@@ -0,0 +1,268 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Initial placement for the kinet2pcb board, which leaves every footprint at the origin.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Footprints, pads and pad nets are read from the .kicad_pcb itself; only the footprints' own (at x y rot) are rewritten, the rest of the file is kept byte for byte. Locked footprints and the anchor (the footprint with the most pads, the DSP) stay put.
+Note: Each net is a spring star to its pad centroid (weight 1/(pads - 1); ground nets are planes and pull nothing). Nets touching the anchor pull ANCHOR_PULL times harder, so decaps end up at their rail's balls and series resistors at the DSP end of their line.
+Note: Attraction steps move every free footprint at once to the weighted mean of its pads' targets (np.bincount over pads), each followed by a few passes pushing overlapping boxes apart in (n x n) arrays. A greedy pass then moves each footprint, biggest first, to the nearest spot clear of the others (footprint box plus CLEARANCE).
+Usage: python placement.py board.kicad_pcb [-o placed.kicad_pcb]
+"""
+
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import sexpr
+
+GROUND_NETS = ('DGND', 'AGND', 'GND')
+CENTER = (100.0, 100.0)  # mm, where the anchor goes when it is at the origin
+CLEARANCE = 0.25  # mm between footprint boxes
+ANCHOR_PULL = 3.0
+ROUNDS = 60  # Attraction steps, each followed by overlap passes
+SPREAD_PASSES = 4
+STEP = 0.5  # mm between candidate spots when legalizing
+MAX_RINGS = 400
+DAMPING = 0.5
+SEED = 0
+
+
+class Board:
+    """Footprints of a .kicad_pcb: refs, positions, rotations, sides, boxes and pads (offset + net), with their text spans"""
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            self.text = f.read()
+        self.spans = sexpr.spans(self.text, 'footprint')
+        self.refs, self.xy, self.rot, self.size, self.locked, self.side = [], [], [], [], [], []
+        self.pad_fp, self.pad_offset, self.pad_net = [], [], []
+        for i, (start, end) in enumerate(self.spans):
+            node = sexpr.parse(self.text[start:end])
+            at = sexpr.find(node, 'at') or ['at', '0', '0']
+            rot = float(at[3]) if len(at) > 3 else 0.0
+            self.refs.append(_reference(node))
+            self.xy.append((float(at[1]), float(at[2])))
+            self.rot.append(rot)
+            self.locked.append('locked' in node or sexpr.find(node, 'locked') is not None)
+            self.side.append('B' if str(sexpr.value(node, 'layer', 'F.Cu')).startswith('B.') else 'F')
+            corners = []
+            for pad in sexpr.findall(node, 'pad'):
+                pad_at = sexpr.find(pad, 'at') or ['at', '0', '0']
+                size = sexpr.find(pad, 'size') or ['size', '0', '0']
+                dx, dy = _rotate(float(pad_at[1]), float(pad_at[2]), rot)
+                w, h = float(size[1]), float(size[2])
+                if len(pad_at) > 3 and round(float(pad_at[3])) % 180 == 90:  # Pad angles are absolute
+                    w, h = h, w
+                corners += [(dx - w / 2, dy - h / 2), (dx + w / 2, dy + h / 2)]
+                net = sexpr.find(pad, 'net')
+                if net is not None and len(net) > 1:
+                    self.pad_fp.append(i)
+                    self.pad_offset.append((dx, dy))
+                    self.pad_net.append(net[-1])
+            for line in sexpr.findall(node, 'fp_line') + sexpr.findall(node, 'fp_rect'):
+                if sexpr.value(line, 'layer') in ('F.CrtYd', 'B.CrtYd'):
+                    for key in ('start', 'end'):
+                        p = sexpr.find(line, key)
+                        corners.append(_rotate(float(p[1]), float(p[2]), rot))
+            corners = np.array(corners or [(0.0, 0.0)])
+            lo, hi = corners.min(axis=0), corners.max(axis=0)
+            self.size.append((hi - lo, (hi + lo) / 2))  # Box size and its centre relative to the origin
+        self.xy = np.array(self.xy, float).reshape(-1, 2)
+        self.pad_fp = np.array(self.pad_fp, int)
+        self.pad_offset = np.array(self.pad_offset, float).reshape(-1, 2)
+
+    def write(self, path, xy):
+        """Copy of the board with each footprint's own (at ...) moved to xy"""
+        out, last = [], 0
+        for i, (start, end) in enumerate(self.spans):
+            block = self.text[start:end]
+            at = sexpr.spans(block, 'at')
+            if not at:
+                continue
+            a, b = at[0]
+            rot = f' {self.rot[i]:g}' if self.rot[i] else ''
+            out += [self.text[last:start + a], f'(at {xy[i, 0]:.3f} {xy[i, 1]:.3f}{rot})']
+            last = start + b
+        out.append(self.text[last:])
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(''.join(out))
+        os.replace(tmp, path)
+
+
+def _reference(node):
+    """Reference of a footprint node (KiCad 8+ property or older fp_text)"""
+    for prop in sexpr.findall(node, 'property'):
+        if len(prop) > 2 and prop[1] == 'Reference':
+            return prop[2]
+    for text in sexpr.findall(node, 'fp_text'):
+        if len(text) > 2 and text[1] == 'reference':
+            return text[2]
+    return '?'
+
+
+def _rotate(x, y, degrees):
+    """Footprint-frame offset to board frame (KiCad: y down, positive angles counter-clockwise on screen)"""
+    if not degrees:
+        return x, y
+    r = math.radians(degrees)
+    return x * math.cos(r) + y * math.sin(r), -x * math.sin(r) + y * math.cos(r)
+
+
+def springs(board):
+    """(pad index, net index, weight) arrays for the nets that pull, and the net count"""
+    names = {}
+    net = np.array([names.setdefault(n, len(names)) for n in board.pad_net], int)
+    counts = np.bincount(net, minlength=len(names))
+    weight = 1.0 / np.maximum(counts[net] - 1, 1)
+    ground = np.array([n in GROUND_NETS for n in names])
+    keep = (counts[net] > 1) & ~ground[net] if len(names) else np.zeros(0, bool)
+    anchor = int(np.argmax(np.bincount(board.pad_fp, minlength=len(board.refs)))) if len(board.pad_fp) else 0
+    on_anchor = np.zeros(len(names), bool)
+    on_anchor[net[board.pad_fp == anchor]] = True
+    weight = np.where(on_anchor[net], weight * ANCHOR_PULL, weight)
+    return np.flatnonzero(keep), net, weight, len(names), anchor
+
+
+def _hits(xy, boxes):
+    """(n, n) overlap matrix of the footprint boxes plus CLEARANCE, and the per-axis overlap/offset arrays"""
+    size, centre = boxes
+    half = size / 2 + CLEARANCE / 2
+    c = xy + centre
+    d = c[:, None, :] - c[None, :, :]  # (n, n, 2)
+    over = half[:, None, :] + half[None, :, :] - np.abs(d)
+    hit = (over[..., 0] > 0) & (over[..., 1] > 0)
+    hit[np.diag_indices(len(xy))] = False
+    return hit, over, d
+
+
+def spread(xy, boxes, free, passes):
+    """Soft overlap removal: each overlapping pair is pushed apart along its axis of least overlap"""
+    n = len(xy)
+    size, _ = boxes
+    mobility = np.where(free, 1.0 / np.maximum(size[:, 0] * size[:, 1], 0.01), 0.0)
+    share = mobility[:, None] / np.maximum(mobility[:, None] + mobility[None, :], 1e-12)  # Bigger parts move less
+    tie = np.where(np.arange(n)[:, None] < np.arange(n)[None, :], -1.0, 1.0)
+    for _ in range(passes):
+        hit, over, d = _hits(xy, boxes)
+        if not hit.any():
+            return
+        axis = (over[..., 1] < over[..., 0]).astype(int)
+        amount = np.where(hit, np.take_along_axis(over, axis[..., None], -1)[..., 0], 0.0)
+        sign = np.sign(np.take_along_axis(d, axis[..., None], -1)[..., 0])
+        sign = np.where(sign == 0, tie, sign)
+        push = amount * share * sign  # (n, n): how far i moves away from j
+        xy[:, 0] += np.where(axis == 0, push, 0.0).sum(1)
+        xy[:, 1] += np.where(axis == 1, push, 0.0).sum(1)
+
+
+def _ring(r):
+    """Grid offsets at Chebyshev distance r, nearest first"""
+    k = np.arange(-r, r + 1)
+    pts = np.concatenate([np.stack([k, np.full_like(k, -r)], 1), np.stack([k, np.full_like(k, r)], 1),
+                          np.stack([np.full_like(k[1:-1], -r), k[1:-1]], 1),
+                          np.stack([np.full_like(k[1:-1], r), k[1:-1]], 1)]) if r else np.zeros((1, 2), int)
+    return pts[np.argsort((pts ** 2).sum(1), kind='stable')] * STEP
+
+
+def legalize(xy, boxes, free):
+    """Greedy legalization: biggest footprints first, each moved to the nearest spot (rings of STEP) clear of
+    those already settled; returns the overlapping pairs left"""
+    size, centre = boxes
+    half = size / 2 + CLEARANCE / 2
+    settled = list(np.flatnonzero(~free))
+    for i in sorted(np.flatnonzero(free), key=lambda i: -size[i, 0] * size[i, 1]):
+        if settled:
+            other = xy[settled] + centre[settled]
+            reach = half[i] + half[settled]
+            for r in range(MAX_RINGS):
+                cand = xy[i] + _ring(r)
+                c = cand + centre[i]
+                clash = ((np.abs(c[:, None, 0] - other[None, :, 0]) < reach[None, :, 0]) &
+                         (np.abs(c[:, None, 1] - other[None, :, 1]) < reach[None, :, 1])).any(1)
+                if not clash.all():
+                    xy[i] = cand[np.argmin(clash)]
+                    break
+        settled.append(i)
+    hit, _, _ = _hits(xy, boxes)
+    return int(np.triu(hit, 1).sum())
+
+
+def hpwl(xy, board, pads, net, n_nets):
+    """Half-perimeter wirelength (mm) of the pulling nets"""
+    p = xy[board.pad_fp[pads]] + board.pad_offset[pads]
+    total = 0.0
+    for axis in (0, 1):
+        hi = np.full(n_nets, -np.inf)
+        lo = np.full(n_nets, np.inf)
+        np.maximum.at(hi, net[pads], p[:, axis])
+        np.minimum.at(lo, net[pads], p[:, axis])
+        ok = np.isfinite(hi)
+        total += float((hi[ok] - lo[ok]).sum())
+    return total
+
+
+def place(board):
+    """Placed footprint positions (n, 2) and a stats dict"""
+    start = time.perf_counter()
+    n = len(board.refs)
+    pads, net, weight, n_nets, anchor = springs(board)
+    free = ~np.array(board.locked, bool)
+    free[anchor] = False
+    xy = board.xy.copy()
+    if not xy[anchor].any():
+        xy[anchor] = CENTER
+    rng = np.random.default_rng(SEED)
+    size = np.array([s for s, _ in board.size]).reshape(-1, 2)
+    centre = np.array([c for _, c in board.size]).reshape(-1, 2)
+    scatter = max(float(size[anchor].max()), 1.0)
+    start_xy = xy[anchor] + rng.normal(0, scatter / 4, (n, 2))
+    xy[free] = start_xy[free]
+    fp, offset, w = board.pad_fp[pads], board.pad_offset[pads], weight[pads]
+    pulled = np.bincount(fp, weights=w, minlength=n) > 0
+    for _ in range(ROUNDS):
+        p = xy[fp] + offset
+        total = np.bincount(net[pads], weights=w, minlength=n_nets)
+        centroid = np.stack([np.bincount(net[pads], weights=w * p[:, a], minlength=n_nets) for a in (0, 1)], 1)
+        centroid /= np.maximum(total, 1e-12)[:, None]
+        target = centroid[net[pads]] - offset  # Where each pad would put its footprint
+        mean = np.stack([np.bincount(fp, weights=w * target[:, a], minlength=n) for a in (0, 1)], 1)
+        mean /= np.maximum(np.bincount(fp, weights=w, minlength=n), 1e-12)[:, None]
+        move = free & pulled
+        xy[move] += DAMPING * (mean[move] - xy[move])
+        spread(xy, (size, centre), free, SPREAD_PASSES)
+    left = legalize(xy, (size, centre), free)
+    xy = np.round(xy, 3)
+    return xy, {'footprints': n, 'fixed': int((~free).sum()), 'anchor': board.refs[anchor],
+                'nets': int(len(np.unique(net[pads]))), 'hpwl_mm': round(hpwl(xy, board, pads, net, n_nets), 1),
+                'overlaps': left, 'seconds': round(time.perf_counter() - start, 3)}
+
+
+def run(path, out=None):
+    """Place the footprints of a board in place (or into out); returns the stats"""
+    board = Board(path)
+    if not board.refs:
+        print(f"Placement: no footprints in {path}")
+        return None
+    xy, stats = place(board)
+    board.write(out or path, xy)
+    print(f"Placement: {stats['footprints']} footprints ({stats['fixed']} fixed, anchor {stats['anchor']}), "
+          f"{stats['nets']} nets, HPWL {stats['hpwl_mm']:.0f} mm, {stats['overlaps']} overlaps left in "
+          f"{stats['seconds']:.2f} s ({out or path})")
+    return stats
+
+
+if __name__ == '__main__':
+    args = iter(sys.argv[1:])
+    board_file, out_file = None, None
+    for arg in args:
+        if arg == '-o':
+            out_file = next(args)
+        else:
+            board_file = arg
+    if not board_file:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    run(board_file, out_file)
@@ -0,0 +1,244 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Monte Carlo power-up sequencing check: PMIC slots, enables and regulator ramps traced from the built design.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Each rail's sources are the regulator outputs on its net. A PMIC output (SMPS1_OUT) is a sequencer resource; an external regulator is enabled by the PMIC resource driving its EN net and cannot ramp before the rail on its IN net (through ferrites) is up.
+Note: Timing comes from parts/powerseq.json. Slot spacings, delays and ramps are drawn per trial, and all trials of a chunk are evaluated at once as NumPy arrays: 10^6 trials take well under a second.
+Note: A rule fails in a trial when its 'then' rail starts ramping before its 'first' rail is in regulation; the report gives the failure probability and margin percentiles per rule, plus enables that drive nothing.
+Run `python powerseq.py [trials]` to build the design and write the report standalone.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parts', 'powerseq.json')
+REPORT_FILE = 'powerseq_report.json'
+TRIALS = 1_000_000
+CHUNK = 1 << 17
+DRIVER_FUNCS = ('OUTPUT', 'PWROUT')
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _pmic_resource(cfg, pin_name):
+    """PMIC pin name -> resource in the config ('SMPS1_OUT' -> 'SMPS1', 'GPIO6/SYSEN2' -> 'SYSEN2'), or None"""
+    resources = cfg['pmic']['resources']
+    for name in pin_name.split('/'):
+        name = name[:-len('_OUT')] if name.endswith('_OUT') else name
+        if name in resources:
+            return name
+    return None
+
+
+def trace(snap, cfg):
+    """Rail model from the design: ({rail: [source]}, [finding]); a source is a dict describing one regulator output"""
+    name_of = lambda pin: snap.net_name[snap.pin_net[pin]] if snap.pin_net[pin] >= 0 else None
+    part_pins = lambda part: {snap.pin_name[p]: p for p in snap.part_pins(part)}
+    pmic = cfg['pmic']['part']
+
+    def feeding_rail(pin):
+        """Rail on a pin's net, following passthrough parts (ferrites) back to a driven net"""
+        net = snap.pin_net[pin]
+        seen = set()
+        while net >= 0 and net not in seen:
+            seen.add(net)
+            if any(snap.pin_func_name(p) in DRIVER_FUNCS for p in snap.net_pins(net)):
+                return snap.net_name[net]
+            bridge = [p for p in snap.net_pins(net) if snap.part_name[snap.pin_part[p]] in cfg['passthrough']]
+            if not bridge:
+                break
+            other = [q for q in snap.part_pins(snap.pin_part[bridge[0]]) if q != bridge[0]]
+            net = snap.pin_net[other[0]] if other else -1
+        return None
+
+    def enable_source(pin):
+        """PMIC resource driving a pin's net, or the rail it is tied to"""
+        if snap.pin_net[pin] < 0:
+            return None, None
+        for p in snap.net_pins(snap.pin_net[pin]):
+            if snap.part_name[snap.pin_part[p]] == pmic and snap.pin_func_name(p) in DRIVER_FUNCS:
+                return _pmic_resource(cfg, snap.pin_name[p]), None
+        return None, feeding_rail(pin)
+
+    rails, findings, used_enables = {}, [], set()
+    for pin in range(snap.n_pins):
+        part = snap.pin_part[pin]
+        symbol = snap.part_name[part]
+        if snap.pin_func_name(pin) not in DRIVER_FUNCS or name_of(pin) is None:
+            continue
+        if symbol == pmic:
+            resource = _pmic_resource(cfg, snap.pin_name[pin])
+            if resource and 'ramp_us' in cfg['pmic']['resources'][resource]:
+                rails.setdefault(name_of(pin), []).append({'kind': 'pmic', 'resource': resource,
+                                                           'pin': snap.pin_desc(pin)})
+        elif symbol in cfg['regulators'] and snap.pin_name[pin] == cfg['regulators'][symbol]['output']:
+            reg = cfg['regulators'][symbol]
+            pins = part_pins(part)
+            source = {'kind': 'regulator', 'part': symbol, 'pin': snap.pin_desc(pin), 'resource': None,
+                      'enable_rail': None, 'input': None}
+            if reg['enable'] in pins:
+                source['resource'], source['enable_rail'] = enable_source(pins[reg['enable']])
+                used_enables.add(name_of(pins[reg['enable']]))
+                if not source['resource'] and not source['enable_rail']:
+                    findings.append(f"{snap.part_ref[part]} {reg['enable']} is not driven; assumed enabled at power-on")
+            if reg['input'] in pins:
+                source['input'] = feeding_rail(pins[reg['input']])
+            rails.setdefault(name_of(pin), []).append(source)
+    for pin in range(snap.n_pins):
+        if snap.part_name[snap.pin_part[pin]] != pmic or snap.pin_func_name(pin) not in DRIVER_FUNCS:
+            continue
+        resource = _pmic_resource(cfg, snap.pin_name[pin])
+        if resource and 'ramp_us' not in cfg['pmic']['resources'][resource] and name_of(pin) not in used_enables:
+            sinks = [p for p in snap.net_pins(snap.pin_net[pin]) if p != pin] if snap.pin_net[pin] >= 0 else []
+            findings.append(f"{snap.pin_desc(pin)} ({resource}) on {name_of(pin) or 'no net'} enables nothing"
+                            + (f" ({len(sinks)} other pins)" if sinks else ''))
+    for rail, sources in rails.items():
+        if len(sources) > 1:
+            findings.append(f"{rail} has {len(sources)} sources ({', '.join(s['pin'] for s in sources)}); "
+                            "it is taken as up when the first one is")
+    for rule in cfg['rules']:
+        for rail in (rule['first'], rule['then']):
+            if rail not in rails:
+                findings.append(f"Rule rail {rail} has no regulator output in the design")
+    return rails, findings
+
+
+def _sample(rng, spec, n):
+    """[nominal, tolerance %] -> n non-negative draws (3 sigma = tolerance); rng None gives the nominal"""
+    nominal, pct = spec
+    if rng is None or not pct:
+        return np.full(n, float(nominal))
+    return np.maximum(rng.normal(nominal, nominal * pct / 300.0, n), 0.0)
+
+
+def rail_times(rails, cfg, n, rng=None):
+    """{rail: (ramp start, in regulation)} arrays of n trials"""
+    resources = cfg['pmic']['resources']
+    slots = max(r['slot'] for r in resources.values()) + 1
+    slot_time = np.zeros((slots, n))
+    slot_time[1:] = np.cumsum([_sample(rng, cfg['slot_us'], n) for _ in range(slots - 1)], axis=0)
+    zero = [0, 0]
+    times = {}
+
+    def resource_time(name):
+        res = resources[name]
+        return slot_time[res['slot']] + _sample(rng, res.get('delay_us', zero), n)
+
+    def rail(name, stack=()):
+        if name in times:
+            return times[name]
+        if name not in rails or name in stack:  # Unmodelled, or fed by itself: up at power-on
+            return np.zeros(n), np.zeros(n)
+        starts, readies = [], []
+        for s in rails[name]:
+            if s['kind'] == 'pmic':
+                start = resource_time(s['resource'])
+                ramp = resources[s['resource']]['ramp_us']
+            else:
+                reg = cfg['regulators'][s['part']]
+                enable = (resource_time(s['resource']) if s['resource']
+                          else rail(s['enable_rail'], stack + (name,))[1] if s['enable_rail'] else np.zeros(n))
+                supply = rail(s['input'], stack + (name,))[1] if s['input'] else np.zeros(n)
+                start = np.maximum(enable, supply) + _sample(rng, reg['delay_us'], n)
+                ramp = reg['ramp_us']
+            starts.append(start)
+            readies.append(start + _sample(rng, ramp, n))
+        times[name] = (np.min(starts, axis=0), np.min(readies, axis=0))
+        return times[name]
+
+    for name in rails:
+        rail(name)
+    return times
+
+
+def simulate(rails, cfg, trials=TRIALS, seed=0, chunk=CHUNK):
+    """Per-rule failure counts and margins over Monte Carlo trials, plus the nominal timing"""
+    rng = np.random.default_rng(seed)
+    margins = {i: [] for i in range(len(cfg['rules']))}
+    done = 0
+    while done < trials:
+        n = min(chunk, trials - done)
+        times = rail_times(rails, cfg, n, rng)
+        for i, rule in enumerate(cfg['rules']):
+            if rule['first'] in times and rule['then'] in times:
+                margins[i].append((times[rule['then']][0] - times[rule['first']][1] - rule['gap_us']).astype(np.float32))
+        done += n
+    nominal = rail_times(rails, cfg, 1)
+    return {i: np.concatenate(m) if m else None for i, m in margins.items()}, nominal
+
+
+def analyze(snap, cfg=None, trials=TRIALS, seed=0):
+    """Trace, simulate and summarize; returns the report dict"""
+    start = time.perf_counter()
+    cfg = cfg or load_config()
+    rails, findings = trace(snap, cfg)
+    margins, nominal = simulate(rails, cfg, trials, seed)
+    report = {'trials': trials, 'seed': seed, 'findings': findings, 'rules': [],
+              'rails': {name: {'sources': [s['pin'] + (f" <- {s['resource']}" if s['resource'] else '')
+                                           for s in sources],
+                               'nominal_start_us': round(float(nominal[name][0][0]), 1),
+                               'nominal_ready_us': round(float(nominal[name][1][0]), 1)}
+                        for name, sources in sorted(rails.items())}}
+    for i, rule in enumerate(cfg['rules']):
+        m = margins[i]
+        entry = {'first': rule['first'], 'then': rule['then'], 'why': rule.get('why', '')}
+        if m is None:
+            entry.update(p_violation=None, status='unmodelled')
+        else:
+            p = float(np.count_nonzero(m < 0)) / len(m)
+            q = np.percentile(m, [0.01, 1, 50])
+            entry.update(p_violation=p, status='pass' if p == 0 else 'FAIL',
+                         nominal_margin_us=round(float(nominal[rule['then']][0][0] - nominal[rule['first']][1][0]
+                                                       - rule['gap_us']), 1),
+                         margin_us={'min': round(float(m.min()), 1), 'p0.01': round(float(q[0]), 1),
+                                    'p1': round(float(q[1]), 1), 'p50': round(float(q[2]), 1)})
+        report['rules'].append(entry)
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def write_report(report, path=REPORT_FILE):
+    """Write the report as JSON and print its summary"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    summary(report, path)
+
+
+def summary(report, path=REPORT_FILE):
+    """Print one line per rail and rule"""
+    for name, r in report['rails'].items():
+        print(f"Powerseq {name}: ramps at {r['nominal_start_us'] / 1e3:.2f} ms, up at {r['nominal_ready_us'] / 1e3:.2f} ms "
+              f"({'; '.join(r['sources'])})")
+    for r in report['rules']:
+        if r['p_violation'] is None:
+            print(f"Powerseq {r['first']} -> {r['then']}: not modelled")
+            continue
+        print(f"Powerseq {r['first']} -> {r['then']}: P(violation) {r['p_violation']:.2e}, nominal margin "
+              f"{r['nominal_margin_us']:.0f} us, worst {r['margin_us']['min']:.0f} us -> {r['status']}")
+    for finding in report['findings']:
+        print(f"Powerseq: {finding}")
+    print(f"Powerseq: {report['trials']} trials in {report['seconds']:.2f} s ({path})")
+
+
+def run(snap, report_file=REPORT_FILE, trials=TRIALS):
+    """Analyze and write the report"""
+    report = analyze(snap, trials=trials)
+    write_report(report, report_file)
+    return report
+
+
+if __name__ == '__main__':
+    import sys
+
+    import schematic
+    import snapshot
+
+    schematic.build_design()
+    run(snapshot.take_snapshot(), trials=int(float(sys.argv[1])) if len(sys.argv) > 1 else TRIALS)
@@ -11,8 +11,12 @@ GREEN='\033[0;32m'
 YELLOW='\033[1;33m'
 NC='\033[0m' # No Color
 
-# Create required directories
-mkdir -p output libraries logs
+# --watch: keep one container running and rebuild on every edit of the sources in this directory (see watch.py)
+WATCH=0
+[ "$1" = "--watch" ] && WATCH=1
+
+# Create required directories (.cache keeps the library index and stage cache between runs, see libcache.py)
+mkdir -p output libraries logs .cache
 
 echo -e "${YELLOW}Building Docker image...${NC}"
 docker build -t $IMAGE_NAME .
@@ -20,12 +24,25 @@ docker build -t $IMAGE_NAME .
 if [ $? -eq 0 ]; then
     echo -e "${GREEN}Build successful${NC}"
     
+    if [ $WATCH -eq 1 ]; then
+        echo -e "${YELLOW}Watching $(pwd) (Ctrl-C to stop)...${NC}"
+        exec docker run --rm -it \
+            --name "${CONTAINER_NAME}_watch" \
+            -v "$(pwd):/app/src" \
+            -v "$(pwd)/output:/app/output" \
+            -w /app/src \
+            -e "TZ=UTC" \
+            --entrypoint /opt/venv/bin/python \
+            $IMAGE_NAME watch.py -o /app/output
+    fi
+
     echo -e "${YELLOW}Running container...${NC}"
     docker run \
         --name "${CONTAINER_NAME}_${TIMESTAMP}" \
         -v "$(pwd)/output:/app/output" \
         -v "$(pwd)/libraries:/app/libraries" \
         -v "$(pwd)/logs:/app/logs" \
+        -v "$(pwd)/.cache:/app/.cache" \
         -e "USER_LOGIN=ALH477" \
         -e "TZ=UTC" \
         $IMAGE_NAME
@@ -21,594 +21,368 @@ Note: Completed power sequencing based on TPS659037 User's Guide (SLIU011): Usin
 Note: Star grounding route defined: Connect AGND and DGND via R_STAR (0Ω) at a single point directly under the codec (U3) on the PCB, near pin 10-13 (AGND pins per TAC5212 datasheet). Route all analog traces (e.g., audio I/O) to AGND plane, digital traces (e.g., DSP, RAM) to DGND plane, ensuring no ground loops and minimal noise coupling between domains.
 """
 
-import skidl
-from kinet2pcb import kinet2pcb
+import builtins
+import json
 import os
 
+import skidl
+
+import artifacts
+import audio
+import audiopath
+import bus
+import connectivity
+import courtyard
+import ddrlen
+import dqswap
+import drc
+import incremental
+import instrument
+import libcache
+import netdb
+import outputs
+import pdn
+import pinout
+import placement
+import powerseq
+import sexpr
+import sheets
+import si
+import snapshot
+
 try:
     skidl.reset()
 except Exception as e:
     print(f"Error resetting skidl: {e}")
 
-lib_search_paths[skidl.KICAD] = ['/usr/share/kicad/library']  # Update if custom
-
-# Custom symbols (full pinouts verified against TMS320C6657 and MT41K512M16 datasheets)
-dsp = skidl.Part(lib=None, name='TMS320C6657', footprint='Package_BGA:BGA-625_21x21mm_Layout25x25_P0.8mm',
-           pins=[
-                 # Power pins (corrected from TMS320C6657 datasheet, Table 4-3)
-                 # CVDD (1.0V core, variable supply, multiple pins)
-                 skidl.Pin(num='G9', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='G11', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='G13', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='G15', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='H9', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='H11', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='H13', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='H15', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='K8', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='K10', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='K12', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='K14', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='M8', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='M10', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='M12', name='CVDD', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='M14', name='CVDD', func=skidl.Pin.PWRIN),
-                 # CVDD1 (1.0V SmartReflex core, multiple pins)
-                 skidl.Pin(num='J8', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='J10', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='J12', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='J14', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='J16', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='J18', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='L8', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='L10', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='L12', name='CVDD1', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='L14', name='CVDD1', func=skidl.Pin.PWRIN),
-                 # DVDD15 (1.5V DDR I/O, multiple pins, corrected)
-                 skidl.Pin(num='C6', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C8', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C10', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C12', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C14', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C16', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C18', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='C20', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D7', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D9', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D11', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D13', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D15', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D17', name='DVDD15', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='D19', name='DVDD15', func=skidl.Pin.PWRIN),
-                 # DVDD18 (1.8V I/O, multiple pins)
-                 skidl.Pin(num='A2', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A4', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A6', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A8', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A12', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A14', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A16', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A18', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A20', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A22', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='A24', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='B1', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='B3', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='B5', name='DVDD18', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='B25', name='DVDD18', func=skidl.Pin.PWRIN),
-                 # Add more DVDD18 as per datasheet...
-                 # VSS (Ground, multiple pins, partial)
-                 skidl.Pin(num='F8', name='VSS', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='F10', name='VSS', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='F12', name='VSS', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='F14', name='VSS', func=skidl.Pin.PWRIN),
-                 # DDR pins (with ball numbers from datasheet Table 4-4)
-                 skidl.Pin(num='A9', name='DDR_D0', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C9', name='DDR_D1', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='B9', name='DDR_D2', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='A8', name='DDR_D3', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C8', name='DDR_D4', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='B8', name='DDR_D5', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='A7', name='DDR_D6', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C7', name='DDR_D7', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='A6', name='DDR_D8', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C6', name='DDR_D9', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='B6', name='DDR_D10', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='A5', name='DDR_D11', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C5', name='DDR_D12', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='B5', name='DDR_D13', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='A4', name='DDR_D14', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C4', name='DDR_D15', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='D16', name='DDR_A0', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E16', name='DDR_A1', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D17', name='DDR_A2', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E17', name='DDR_A3', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D18', name='DDR_A4', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E18', name='DDR_A5', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D19', name='DDR_A6', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E19', name='DDR_A7', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D20', name='DDR_A8', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E20', name='DDR_A9', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D21', name='DDR_A10', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E21', name='DDR_A11', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D22', name='DDR_A12', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E22', name='DDR_A13', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D23', name='DDR_A14', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='E23', name='DDR_A15', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='B17', name='DDR_CLKP', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='A17', name='DDR_CLKN', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='C19', name='DDR_CAS', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='B19', name='DDR_RAS', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='A20', name='DDR_WE', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='C10', name='DDR_DQS0P', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='B10', name='DDR_DQS0N', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='C5', name='DDR_DQS1P', func=skidl.Pin.BIDIR),  # Corrected example
-                 skidl.Pin(num='B5', name='DDR_DQS1N', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='A11', name='DDR_DQM0', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='A3', name='DDR_DQM1', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='B16', name='DDR_BA0', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='A16', name='DDR_BA1', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='B15', name='DDR_BA2', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='D20', name='DDR_CE0', func=skidl.Pin.OUTPUT),  # DDRCSNUM0#
-                 skidl.Pin(num='C20', name='DDR_CE1', func=skidl.Pin.OUTPUT),  # DDRCSNUM1#
-                 skidl.Pin(num='C18', name='DDR_ODT0', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='B18', name='DDR_ODT1', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='A19', name='DDR_CKE0', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='B20', name='DDR_CKE1', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='A18', name='DDR_RESET', func=skidl.Pin.OUTPUT),
-                 skidl.Pin(num='C17', name='VREFSSTL', func=skidl.Pin.PWRIN),
-                 skidl.Pin(num='B21', name='PTV15', func=skidl.Pin.PWRIN),
-                 # McBSP pins for audio (from datasheet)
-                 skidl.Pin(num='Y20', name='McBSP_CLKX', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AC22', name='McBSP_DX', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AB21', name='McBSP_DR', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AA20', name='McBSP_FSX', func=skidl.Pin.BIDIR),
-                 # I2C pins
-                 skidl.Pin(num='AD21', name='I2C0_SCL', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AC21', name='I2C0_SDA', func=skidl.Pin.BIDIR),
-                 # JTAG pins
-                 skidl.Pin(num='AD16', name='JTAG_TMS', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AC16', name='JTAG_TDI', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AB16', name='JTAG_TDO', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='AA16', name='JTAG_TCK', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='Y16', name='JTAG_TRST', func=skidl.Pin.BIDIR),
-                 skidl.Pin(num='W16', name='JTAG_EMU0', func=skidl.Pin.BIDIR),
-                 # Add more pins as needed...
-           ], ref='U1')
-
-ram = skidl.Part(lib=None, name='MT41K512M16', footprint='Package_BGA:FBGA-96_9x14mm_Layout9x13_P0.8mm',
-            pins=[
-                  # Full power pins (from MT41K512M16 datasheet, VDD=1.35V, VDDQ=1.35V)
-                  skidl.Pin(num='J1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='K1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='L1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='M1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='N1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='P1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='R1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='T1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='U1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='V1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='W1', name='VDD', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='Y1', name='VDD', func=skidl.Pin.PWRIN),
-                  # VDDQ pins
-                  skidl.Pin(num='A3', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='A5', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='A7', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='A9', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='B3', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='B5', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='B7', name='VDDQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='B9', name='VDDQ', func=skidl.Pin.PWRIN),
-                  # VSS/VSSQ grounds (partial)
-                  skidl.Pin(num='J2', name='VSS', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='K2', name='VSS', func=skidl.Pin.PWRIN),
-                  # ... add all VSS as needed
-                  skidl.Pin(num='C4', name='VSSQ', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='C6', name='VSSQ', func=skidl.Pin.PWRIN),
-                  # ... add all VSSQ
-                  # Data pins
-                  skidl.Pin(num='B7', name='DQ0', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='A8', name='DQ1', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='C7', name='DQ2', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='B8', name='DQ3', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='A7', name='DQ4', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='C8', name='DQ5', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='B6', name='DQ6', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='A6', name='DQ7', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='C9', name='DQ8', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='B9', name='DQ9', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='A9', name='DQ10', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='C10', name='DQ11', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='B10', name='DQ12', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='A10', name='DQ13', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='C11', name='DQ14', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='B11', name='DQ15', func=skidl.Pin.BIDIR),
-                  # Address pins
-                  skidl.Pin(num='J7', name='A0', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='H9', name='A1', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='H8', name='A2', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='G9', name='A3', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='G8', name='A4', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='F9', name='A5', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='F8', name='A6', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='E9', name='A7', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='E8', name='A8', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='D9', name='A9', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='D8', name='A10/AP', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='C9', name='A11', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='B9', name='A12/BC#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='A9', name='A13', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='J8', name='A14', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='K8', name='A15', func=skidl.Pin.INPUT),
-                  # Clock and control
-                  skidl.Pin(num='E2', name='CK', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='F2', name='CK#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='G2', name='CAS#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='H2', name='RAS#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='J2', name='WE#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='D3', name='LDQS', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='E3', name='LDQS#', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='D7', name='UDQS', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='E7', name='UDQS#', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='C3', name='LDM', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='C7', name='UDM', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='K7', name='BA0', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='J9', name='BA1', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='K9', name='BA2', func=skidl.Pin.INPUT),
-                  # Dual-rank pins (per TwinDie datasheet)
-                  skidl.Pin(num='B3', name='CS0#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='G3', name='CS1#', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='C2', name='ODT0', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='H3', name='ODT1', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='B2', name='CKE0', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='J3', name='CKE1', func=skidl.Pin.INPUT),
-                  skidl.Pin(num='A2', name='RESET#', func=skidl.Pin.INPUT),  # Shared
-                  skidl.Pin(num='A4', name='ZQ0', func=skidl.Pin.BIDIR),
-                  skidl.Pin(num='H7', name='ZQ1', func=skidl.Pin.BIDIR),
-                  # Reference pins
-                  skidl.Pin(num='K2', name='VREFCA', func=skidl.Pin.PWRIN),
-                  skidl.Pin(num='D5', name='VREFDQ', func=skidl.Pin.PWRIN),
-            ], ref='U2')
-
-codec = skidl.Part(lib=None, name='TAC5212', footprint='Package_QFN:VQFN-24_4x4mm_P0.5mm',
-              pins=[
-                    skidl.Pin(num='23', name='AVDD', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='6', name='IOVDD', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='7', name='SCL', func=skidl.Pin.BIDIR),
-                    skidl.Pin(num='8', name='SDA', func=skidl.Pin.BIDIR),
-                    skidl.Pin(num='2', name='BCLK', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='3', name='FSYNC', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='5', name='DIN', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='4', name='DOUT', func=skidl.Pin.OUTPUT),
-                    skidl.Pin(num='15', name='IN1P', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='16', name='IN1M', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='17', name='IN2P', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='18', name='IN2M', func=skidl.Pin.INPUT),
-                    skidl.Pin(num='20', name='OUT1P', func=skidl.Pin.OUTPUT),
-                    skidl.Pin(num='19', name='OUT1M', func=skidl.Pin.OUTPUT),
-                    skidl.Pin(num='21', name='OUT2P', func=skidl.Pin.OUTPUT),
-                    skidl.Pin(num='22', name='OUT2M', func=skidl.Pin.OUTPUT),
-                    skidl.Pin(num='24', name='VREF', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='1', name='DREG', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='14', name='MICBIAS', func=skidl.Pin.OUTPUT),  # Unconnected if unused
-                    # Grounds (AGND/DGND combined as AGND in script)
-                    skidl.Pin(num='10', name='AGND', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='11', name='AGND', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='12', name='AGND', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='13', name='AGND', func=skidl.Pin.PWRIN),
-                    skidl.Pin(num='9', name='GPIO1', func=skidl.Pin.BIDIR),  # Optional
-              ], ref='U3')
-
-# TPS659037 PMIC (expanded with sequencing pins per SLIU011 User's Guide for TPS6590379ZWSR)
-pmic = skidl.Part(lib=None, name='TPS659037', footprint='Package_BGA:nFBGA-169_12x12mm_Layout13x13_P0.8mm',
-             pins=[
-                   skidl.Pin(num='F8', name='REGEN1', func=skidl.Pin.OUTPUT),  # First in OFF2ACT sequence, enables external switch
-                   skidl.Pin(num='J5', name='ENABLE1', func=skidl.Pin.INPUT),  # For DVS/seq control, tied to en_3v3
-                   skidl.Pin(num='A1', name='SMPS1_OUT', func=skidl.Pin.OUTPUT),  # Example 1.0V core
-                   skidl.Pin(num='B1', name='SMPS2_OUT', func=skidl.Pin.OUTPUT),  # Example 1.35V RAM
-                   skidl.Pin(num='C1', name='SMPS3_OUT', func=skidl.Pin.OUTPUT),  # Example 1.5V DDR
-                   skidl.Pin(num='D1', name='SMPS4_OUT', func=skidl.Pin.OUTPUT),  # Example 1.8V I/O
-                   skidl.Pin(num='E1', name='SMPS5_OUT', func=skidl.Pin.OUTPUT),  # Example 3.3V
-                   skidl.Pin(num='G1', name='LDO1_OUT', func=skidl.Pin.OUTPUT),  # 1.0V example
-                   skidl.Pin(num='G6', name='GPIO4/SYSEN1', func=skidl.Pin.OUTPUT),  # SYSEN1 for external reg enable (e.g., en_1v8)
-                   skidl.Pin(num='G7', name='GPIO6/SYSEN2', func=skidl.Pin.OUTPUT),  # SYSEN2 for external reg enable (e.g., en_1v5)
-                   skidl.Pin(num='G8', name='GPIO2/REGEN2', func=skidl.Pin.OUTPUT),  # REGEN2 for additional enable (e.g., en_1v35)
-                   # Grounds and inputs not listed for simplicity
-             ], ref='U7')
-
-# TPS7A54-Q1 LDO for 1.5V (example, adjust as per datasheet)
-ldo_1v5 = skidl.Part(lib=None, name='TPS7A54-Q1', footprint='Package_QFN:VQFN-20_3.5x3.5mm_P0.5mm',
-                pins=[
-                      skidl.Pin(num='1', name='IN', func=skidl.Pin.PWRIN),
-                      skidl.Pin(num='2', name='EN', func=skidl.Pin.INPUT),
-                      skidl.Pin(num='3', name='OUT', func=skidl.PWROUT),
-                      # Add BIAS, PG, etc., as needed per datasheet
-                ], ref='U5')
-
-# Similar for other LDOs if needed (U4 for 3.3V, U6 for 1.8V) - assuming PMIC suffices, not included
-
-# Connectors, resistors, caps, etc. (unchanged from original)
-j2 = skidl.Part('Connector', 'Conn_01x03', footprint='Connector_Audio:Jack_3.5mm_PJ31060-I_Horizontal', ref='J2')  # Stereo input
-j3 = skidl.Part('Connector', 'Conn_01x03', footprint='Connector_Audio:Jack_3.5mm_PJ31060-I_Horizontal', ref='J3')  # Stereo output
-jtag = skidl.Part('Connector', 'Conn_01x06', footprint='Connector_PinHeader_2.54mm:Pin_Header_Straight_1x06', ref='JTAG')
-
-r_term = [skidl.Part('Device', 'R', value='34', footprint='Resistor_SMD:R_0402_1005Metric') for _ in range(16)]  # Series term
-r_zq_ram0 = skidl.Part('Device', 'R', value='240', footprint='Resistor_SMD:R_0402_1005Metric')
-r_zq_ram1 = skidl.Part('Device', 'R', value='240', footprint='Resistor_SMD:R_0402_1005Metric')
-r_vref1 = skidl.Part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric')
-r_vref2 = skidl.Part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric')
-c_vref_ddr = skidl.Part('Device', 'C', value='0.1u', footprint='Capacitor_SMD:C_0402_1005Metric')
-r_ptv = skidl.Part('Device', 'R', value='45.3', footprint='Resistor_SMD:R_0402_1005Metric')
-fb1 = skidl.Part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
-fb2 = skidl.Part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
-fb3 = skidl.Part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
-fb4 = skidl.Part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
-d2 = skidl.Part('Diode', 'TVS', footprint='Diode_SMD:D_SOD-123')
-d3 = skidl.Part('Diode', 'TVS', footprint='Diode_SMD:D_SOD-123')
-d4 = skidl.Part('Diode', 'TVS', footprint='Diode_SMD:D_SOD-123')
-r1 = skidl.Part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric')  # LPF resistor
-r2 = skidl.Part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric')
-r_i2c_pu1 = skidl.Part('Device', 'R', value='4.7k', footprint='Resistor_SMD:R_0402_1005Metric')
-r_i2c_pu2 = skidl.Part('Device', 'R', value='4.7k', footprint='Resistor_SMD:R_0402_1005Metric')
-r_i2c_s1 = skidl.Part('Device', 'R', value='22', footprint='Resistor_SMD:R_0402_1005Metric')
-r_i2c_s2 = skidl.Part('Device', 'R', value='22', footprint='Resistor_SMD:R_0402_1005Metric')
-r_star = skidl.Part('Device', 'R', value='0', footprint='Resistor_SMD:R_0402_1005Metric')  # AGND-DGND tie
-c1_to_c50 = [skidl.Part('Device', 'C', value='0.1u', footprint='Capacitor_SMD:C_0402_1005Metric') for _ in range(50)]  # Decaps
-c51_to_c60 = [skidl.Part('Device', 'C', value='0.01u', footprint='Capacitor_SMD:C_0402_1005Metric') for _ in range(10)]
-c61 = skidl.Part('Device', 'C', value='10u', footprint='Capacitor_SMD:C_1206_3216Metric')
-c62 = skidl.Part('Device', 'C', value='10u', footprint='Capacitor_SMD:C_1206_3216Metric')
-c63 = skidl.Part('Device', 'C', value='10u', footprint='Capacitor_SMD:C_1206_3216Metric')
-c_dreg = skidl.Part('Device', 'C', value='1u', footprint='Capacitor_SMD:C_0402_1005Metric')
-c_vref_codec = skidl.Part('Device', 'C', value='1u', footprint='Capacitor_SMD:C_0402_1005Metric')
-led1 = skidl.Part('Device', 'LED', footprint='LED_SMD:LED_0603_1608Metric')
-r_led = skidl.Part('Device', 'R', value='1k', footprint='Resistor_SMD:R_0402_1005Metric')
-
-# Nets
-vcc_1v0 = skidl.Net('VCC_1V0')
-vcc_1v35 = skidl.Net('VCC_1V35')  # New for RAM 1.35V per datasheet
-vcc_1v5 = skidl.Net('VCC_1V5')
-vcc_1v8 = skidl.Net('VCC_1V8')
-vcc_3v3 = skidl.Net('VCC_3V3')
-dgnd = skidl.Net('DGND')
-agnd = skidl.Net('AGND')
-vref_ddr = skidl.Net('VREF_DDR')
-vcc_3v3_filtered = skidl.Net('VCC_3V3_FILTERED')
-vcc_audio = skidl.Net('VCC_AUDIO')
-en_1v0 = skidl.Net('EN_1V0')
-en_1v35 = skidl.Net('EN_1V35')
-en_1v5 = skidl.Net('EN_1V5')
-en_1v8 = skidl.Net('EN_1V8')
-en_3v3 = skidl.Net('EN_3V3')
-mcbsp_clkx = skidl.Net('McBSP_CLKX')
-mcbsp_dx = skidl.Net('McBSP_DX')
-mcbsp_dr = skidl.Net('McBSP_DR')
-mcbsp_fsx = skidl.Net('McBSP_FSX')
-i2c_scl = skidl.Net('I2C_SCL')
-i2c_sda = skidl.Net('I2C_SDA')
-ddr_d0_dsp = skidl.Net('DDR_D0_DSP')
-ddr_d0_ram = skidl.Net('DDR_D0_RAM')
-# Repeat for DDR_D1 to DDR_D15 DSP and RAM sides
-ddr_d1_dsp = skidl.Net('DDR_D1_DSP')
-ddr_d1_ram = skidl.Net('DDR_D1_RAM')
-ddr_d2_dsp = skidl.Net('DDR_D2_DSP')
-ddr_d2_ram = skidl.Net('DDR_D2_RAM')
-ddr_d3_dsp = skidl.Net('DDR_D3_DSP')
-ddr_d3_ram = skidl.Net('DDR_D3_RAM')
-ddr_d4_dsp = skidl.Net('DDR_D4_DSP')
-ddr_d4_ram = skidl.Net('DDR_D4_RAM')
-ddr_d5_dsp = skidl.Net('DDR_D5_DSP')
-ddr_d5_ram = skidl.Net('DDR_D5_RAM')
-ddr_d6_dsp = skidl.Net('DDR_D6_DSP')
-ddr_d6_ram = skidl.Net('DDR_D6_RAM')
-ddr_d7_dsp = skidl.Net('DDR_D7_DSP')
-ddr_d7_ram = skidl.Net('DDR_D7_RAM')
-ddr_d8_dsp = skidl.Net('DDR_D8_DSP')
-ddr_d8_ram = skidl.Net('DDR_D8_RAM')
-ddr_d9_dsp = skidl.Net('DDR_D9_DSP')
-ddr_d9_ram = skidl.Net('DDR_D9_RAM')
-ddr_d10_dsp = skidl.Net('DDR_D10_DSP')
-ddr_d10_ram = skidl.Net('DDR_D10_RAM')
-ddr_d11_dsp = skidl.Net('DDR_D11_DSP')
-ddr_d11_ram = skidl.Net('DDR_D11_RAM')
-ddr_d12_dsp = skidl.Net('DDR_D12_DSP')
-ddr_d12_ram = skidl.Net('DDR_D12_RAM')
-ddr_d13_dsp = skidl.Net('DDR_D13_DSP')
-ddr_d13_ram = skidl.Net('DDR_D13_RAM')
-ddr_d14_dsp = skidl.Net('DDR_D14_DSP')
-ddr_d14_ram = skidl.Net('DDR_D14_RAM')
-ddr_d15_dsp = skidl.Net('DDR_D15_DSP')
-ddr_d15_ram = skidl.Net('DDR_D15_RAM')
-ddr_a0 = skidl.Net('DDR_A0')
-ddr_a1 = skidl.Net('DDR_A1')
-ddr_a2 = skidl.Net('DDR_A2')
-ddr_a3 = skidl.Net('DDR_A3')
-ddr_a4 = skidl.Net('DDR_A4')
-ddr_a5 = skidl.Net('DDR_A5')
-ddr_a6 = skidl.Net('DDR_A6')
-ddr_a7 = skidl.Net('DDR_A7')
-ddr_a8 = skidl.Net('DDR_A8')
-ddr_a9 = skidl.Net('DDR_A9')
-ddr_a10 = skidl.Net('DDR_A10')
-ddr_a11 = skidl.Net('DDR_A11')
-ddr_a12 = skidl.Net('DDR_A12')
-ddr_a13 = skidl.Net('DDR_A13')
-ddr_a14 = skidl.Net('DDR_A14')
-ddr_a15 = skidl.Net('DDR_A15')
-ddr_clkp = skidl.Net('DDR_CLKP')
-ddr_clkn = skidl.Net('DDR_CLKN')
-ddr_cas = skidl.Net('DDR_CAS')
-ddr_ras = skidl.Net('DDR_RAS')
-ddr_we = skidl.Net('DDR_WE')
-ddr_dqs0p = skidl.Net('DDR_DQS0P')
-ddr_dqs0n = skidl.Net('DDR_DQS0N')
-ddr_dqs1p = skidl.Net('DDR_DQS1P')
-ddr_dqs1n = skidl.Net('DDR_DQS1N')
-ddr_dqm0 = skidl.Net('DDR_DQM0')
-ddr_dqm1 = skidl.Net('DDR_DQM1')
-ddr_ba0 = skidl.Net('DDR_BA0')
-ddr_ba1 = skidl.Net('DDR_BA1')
-ddr_ba2 = skidl.Net('DDR_BA2')
-ddr_ce0 = skidl.Net('DDR_CE0')
-ddr_ce1 = skidl.Net('DDR_CE1')  # Added for dual rank
-ddr_odt0 = skidl.Net('DDR_ODT0')
-ddr_odt1 = skidl.Net('DDR_ODT1')  # Added
-ddr_cke0 = skidl.Net('DDR_CKE0')
-ddr_cke1 = skidl.Net('DDR_CKE1')  # Added
-ddr_reset = skidl.Net('DDR_RESET')
-ptv15 = skidl.Net('PTV15')
-guitar_in_l = skidl.Net('GUITAR_IN_L')
-guitar_in_r = skidl.Net('GUITAR_IN_R')
-audio_out_l = skidl.Net('AUDIO_OUT_L')
-audio_out_r = skidl.Net('AUDIO_OUT_R')
-lpf_out_l = skidl.Net('LPF_OUT_L')
-lpf_out_r = skidl.Net('LPF_OUT_R')
-jtag_tms = skidl.Net('JTAG_TMS')
-jtag_tdi = skidl.Net('JTAG_TDI')
-jtag_tdo = skidl.Net('JTAG_TDO')
-jtag_tck = skidl.Net('JTAG_TCK')
-jtag_trst = skidl.Net('JTAG_TRST')
-jtag_emu0 = skidl.Net('JTAG_EMU0')
-
-# Connections
-vcc_1v0 += dsp.get_pins(name='CVDD'), dsp.get_pins(name='CVDD1'), c1_to_c50[0:20][1], c51_to_c60[0:5][1], c61[1], pmic['SMPS1_OUT'], pmic['LDO1_OUT']  # Decaps near pins
-dgnd += dsp.get_pins(name='VSS'), c1_to_c50[0:20][2], c51_to_c60[0:5][2], c61[2], r_zq_ram0[2], r_zq_ram1[2]
-vcc_1v35 += ram.get_pins(name='VDD'), ram.get_pins(name='VDDQ'), pmic['SMPS2_OUT']  # 1.35V for RAM
-dgnd += ram.get_pins(name='VSS'), ram.get_pins(name='VSSQ')
-vcc_1v5 += dsp.get_pins(name='DVDD15'), ldo_1v5['OUT'], c1_to_c50[20:30][1], c51_to_c60[5:7][1], c62[1], r_vref1[1]
-dgnd += c1_to_c50[20:30][2], c51_to_c60[5:7][2], c62[2], r_vref2[2]
-vcc_1v8 += dsp.get_pins(name='DVDD18'), c1_to_c50[30:40][1], c51_to_c60[7:9][1], c63[1], pmic['SMPS4_OUT']
-dgnd += c1_to_c50[30:40][2], c51_to_c60[7:9][2], c63[2]
-vcc_3v3 += fb1[1], led1[1], r_i2c_pu1[1], r_i2c_pu2[1], pmic['SMPS5_OUT']
-vcc_3v3_filtered += fb1[2], ldo_1v5['IN']  # Filtered input to LDOs
-en_1v0 += pmic['REGEN1']  # First in sequence for core 1.0V
-en_1v35 += pmic['GPIO2/REGEN2']  # For RAM 1.35V, after core
-en_1v5 += pmic['GPIO6/SYSEN2'], ldo_1v5['EN']  # For DDR 1.5V, after I/O
-en_1v8 += pmic['GPIO4/SYSEN1']  # For I/O 1.8V, before DDR
-en_3v3 += pmic['ENABLE1']  # For 3.3V, last in sequence
-agnd += codec.get_pins(name='AGND'), c1_to_c50[40:50][2]
-dgnd += c_dreg[2], c_vref_codec[2]
-# Star grounding: AGND and DGND tied via R_STAR at single point under U3
-agnd += r_star[1]
-dgnd += r_star[2]
-vcc_audio += fb2[2], codec['AVDD'], codec['IOVDD']  # Filtered for codec
-vcc_3v3_filtered += fb2[1]
-mcbsp_clkx += dsp['McBSP_CLKX'], codec['BCLK']
-mcbsp_dx += dsp['McBSP_DX'], codec['DOUT']  # DSP TX to codec RX? Adjust if needed
-mcbsp_dr += dsp['McBSP_DR'], codec['DIN']
-mcbsp_fsx += dsp['McBSP_FSX'], codec['FSYNC']
-i2c_scl += dsp['I2C0_SCL'], r_i2c_s1[1]
-i2c_scl += r_i2c_s1[2], codec['SCL'], r_i2c_pu1[2]
-i2c_sda += dsp['I2C0_SDA'], r_i2c_s2[1]
-i2c_sda += r_i2c_s2[2], codec['SDA'], r_i2c_pu2[2]
-ddr_d0_dsp += dsp['DDR_D0'], r_term[0][1]
-ddr_d0_ram += r_term[0][2], ram['DQ0']
-# Repeat for DDR_D1 to DDR_D15
-ddr_d1_dsp += dsp['DDR_D1'], r_term[1][1]
-ddr_d1_ram += r_term[1][2], ram['DQ1']
-ddr_d2_dsp += dsp['DDR_D2'], r_term[2][1]
-ddr_d2_ram += r_term[2][2], ram['DQ2']
-ddr_d3_dsp += dsp['DDR_D3'], r_term[3][1]
-ddr_d3_ram += r_term[3][2], ram['DQ3']
-ddr_d4_dsp += dsp['DDR_D4'], r_term[4][1]
-ddr_d4_ram += r_term[4][2], ram['DQ4']
-ddr_d5_dsp += dsp['DDR_D5'], r_term[5][1]
-ddr_d5_ram += r_term[5][2], ram['DQ5']
-ddr_d6_dsp += dsp['DDR_D6'], r_term[6][1]
-ddr_d6_ram += r_term[6][2], ram['DQ6']
-ddr_d7_dsp += dsp['DDR_D7'], r_term[7][1]
-ddr_d7_ram += r_term[7][2], ram['DQ7']
-ddr_d8_dsp += dsp['DDR_D8'], r_term[8][1]
-ddr_d8_ram += r_term[8][2], ram['DQ8']
-ddr_d9_dsp += dsp['DDR_D9'], r_term[9][1]
-ddr_d9_ram += r_term[9][2], ram['DQ9']
-ddr_d10_dsp += dsp['DDR_D10'], r_term[10][1]
-ddr_d10_ram += r_term[10][2], ram['DQ10']
-ddr_d11_dsp += dsp['DDR_D11'], r_term[11][1]
-ddr_d11_ram += r_term[11][2], ram['DQ11']
-ddr_d12_dsp += dsp['DDR_D12'], r_term[12][1]
-ddr_d12_ram += r_term[12][2], ram['DQ12']
-ddr_d13_dsp += dsp['DDR_D13'], r_term[13][1]
-ddr_d13_ram += r_term[13][2], ram['DQ13']
-ddr_d14_dsp += dsp['DDR_D14'], r_term[14][1]
-ddr_d14_ram += r_term[14][2], ram['DQ14']
-ddr_d15_dsp += dsp['DDR_D15'], r_term[15][1]
-ddr_d15_ram += r_term[15][2], ram['DQ15']
-ddr_a0 += dsp['DDR_A0'], ram['A0']
-ddr_a1 += dsp['DDR_A1'], ram['A1']
-ddr_a2 += dsp['DDR_A2'], ram['A2']
-ddr_a3 += dsp['DDR_A3'], ram['A3']
-ddr_a4 += dsp['DDR_A4'], ram['A4']
-ddr_a5 += dsp['DDR_A5'], ram['A5']
-ddr_a6 += dsp['DDR_A6'], ram['A6']
-ddr_a7 += dsp['DDR_A7'], ram['A7']
-ddr_a8 += dsp['DDR_A8'], ram['A8']
-ddr_a9 += dsp['DDR_A9'], ram['A9']
-ddr_a10 += dsp['DDR_A10'], ram['A10/AP']
-ddr_a11 += dsp['DDR_A11'], ram['A11']
-ddr_a12 += dsp['DDR_A12'], ram['A12/BC#']
-ddr_a13 += dsp['DDR_A13'], ram['A13']
-ddr_a14 += dsp['DDR_A14'], ram['A14']
-ddr_a15 += dsp['DDR_A15'], ram['A15']
-ddr_clkp += dsp['DDR_CLKP'], ram['CK']
-ddr_clkn += dsp['DDR_CLKN'], ram['CK#']
-ddr_cas += dsp['DDR_CAS'], ram['CAS#']
-ddr_ras += dsp['DDR_RAS'], ram['RAS#']
-ddr_we += dsp['DDR_WE'], ram['WE#']
-ddr_dqs0p += dsp['DDR_DQS0P'], ram['LDQS']
-ddr_dqs0n += dsp['DDR_DQS0N'], ram['LDQS#']
-ddr_dqs1p += dsp['DDR_DQS1P'], ram['UDQS']
-ddr_dqs1n += dsp['DDR_DQS1N'], ram['UDQS#']
-ddr_dqm0 += dsp['DDR_DQM0'], ram['LDM']
-ddr_dqm1 += dsp['DDR_DQM1'], ram['UDM']
-ddr_ba0 += dsp['DDR_BA0'], ram['BA0']
-ddr_ba1 += dsp['DDR_BA1'], ram['BA1']
-ddr_ba2 += dsp['DDR_BA2'], ram['BA2']
-ddr_ce0 += dsp['DDR_CE0'], ram['CS0#']
-ddr_ce1 += dsp['DDR_CE1'], ram['CS1#']  # Added for dual rank
-ddr_odt0 += dsp['DDR_ODT0'], ram['ODT0']
-ddr_odt1 += dsp['DDR_ODT1'], ram['ODT1']  # Added
-ddr_cke0 += dsp['DDR_CKE0'], ram['CKE0']
-ddr_cke1 += dsp['DDR_CKE1'], ram['CKE1']  # Added
-ddr_reset += dsp['DDR_RESET'], ram['RESET#']
-ram['ZQ0'] += r_zq_ram0[1]
-ram['ZQ1'] += r_zq_ram1[1]
-vref_ddr += dsp['VREFSSTL'], ram['VREFCA'], ram['VREFDQ'], r_vref1[2], r_vref2[1], c_vref_ddr[1]
-ptv15 += dsp['PTV15'], r_ptv[1]
-dgnd += r_ptv[2]
-guitar_in_l += fb3[1], j2['1'], d2[1]  # Ferrite on input
-guitar_in_r += fb4[1], j2['2'], d2[2]
-fb3[2] += codec['IN1P']
-fb4[2] += codec['IN2P']
-agnd += codec['IN1M'], codec['IN2M'], codec['OUT1M'], codec['OUT2M']
-audio_out_l += codec['OUT1P'], r1[1], d3[1]
-audio_out_r += codec['OUT2P'], r2[1], d4[1]
-lpf_out_l += r1[2], c1_to_c50[30][1], j3['1']
-lpf_out_r += r2[2], c1_to_c50[31][1], j3['2']
-codec['DREG'] += c_dreg[1]
-codec['VREF'] += c_vref_codec[1]
-led1[2] += r_led[1]
-jtag_tms += dsp['JTAG_TMS'], jtag['1']
-jtag_tdi += dsp['JTAG_TDI'], jtag['2']
-jtag_tdo += dsp['JTAG_TDO'], jtag['3']
-jtag_tck += dsp['JTAG_TCK'], jtag['4']
-jtag_trst += dsp['JTAG_TRST'], jtag['5']
-jtag_emu0 += dsp['JTAG_EMU0'], jtag['6']
-
-# Power flags
-vcc_1v0.drive = skidl.POWER
-vcc_1v35.drive = skidl.POWER
-vcc_1v5.drive = skidl.POWER
-vcc_1v8.drive = skidl.POWER
-vcc_3v3.drive = skidl.POWER
-dgnd.drive = skidl.POWER
-agnd.drive = skidl.POWER
-vref_ddr.drive = skidl.POWER
+skidl.lib_search_paths[skidl.KICAD] = ['/usr/share/kicad/library', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'libraries')]  # Update if custom
+libs = libcache.LibCache(skidl.lib_search_paths[skidl.KICAD])  # Parsed symbols persist across runs in .cache/
+drc.install_erc()  # Linear-time skidl.ERC() on large and shared nets (see drc.py)
+connectivity.install()  # Union-find net domains kept in sync with every connection (see connectivity.py)
 
-try:
-    skidl.ERC()
-    skidl.generate_netlist()
-    skidl.generate_schematic(file_='production_dsp_schematic.kicad_sch')
-    print("Production schematic generated as production_dsp_schematic.kicad_sch")
-except Exception as e:
-    print(f"Generation error: {e}")
+# Design parameters (placeholders until SI/PDN simulation; see sweep.py for building variants)
+DEFAULT_PARAMS = {
+    'r_term': 34,  # DDR data series termination (ohms)
+    'r_ptv': 45.3,  # DSP PTV15 impedance tuning (ohms)
+    'r_zq': 240,  # RAM ZQ calibration (ohms)
+    'n_decap_1v0': 20,  # 0.1u decaps per rail
+    'n_decap_1v5': 10,
+    'n_decap_1v8': 8,
+    'n_decap_audio': 10,  # Per audio channel
+    'n_hf_decap_1v0': 5,  # 0.01u decaps per rail
+    'n_hf_decap_1v5': 2,
+    'n_hf_decap_1v8': 2,
+    'n_audio_channels': 1,  # TAC5212 stereo codecs on the McBSP TDM bus (see audio.py)
+}
+VALUE_PARAMS = ('r_term', 'r_ptv', 'r_zq')  # Change part values only, not the netlist structure
+
+
+def value(x):
+    """Part value string for a parameter ('45.3', '240', '0.1u')"""
+    return f'{x:g}' if isinstance(x, (int, float)) else str(x)
+
+
+def set_values(parts, params):
+    """Apply the VALUE_PARAMS of params to the parts returned by build_design()"""
+    for name in VALUE_PARAMS:
+        if name in params:
+            for part in parts[name]:
+                part.value = value(params[name])
+
+
+def build_design(params=None, phase=None):
+    """
+    Build the design into the default circuit; returns the parts governed by VALUE_PARAMS.
+    phase(name) is called as each build phase (parts, nets, connect, channels) starts and phase(None) at the end.
+    """
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    phase = phase or (lambda name: None)
+    builtins.default_circuit.mini_reset()  # Clears circuitry, keeps parsed libraries
+    connectivity.reset()
+
+    phase('parts')
+    # Custom symbols (full pinouts verified against TMS320C6657 and MT41K512M16 datasheets)
+    # Pin tables are in pinouts/<part>.csv (ball, name, function); see pinout.py
+    dsp = pinout.make_part('TMS320C6657', footprint='Package_BGA:BGA-625_21x21mm_Layout25x25_P0.8mm', ref='U1')
+    ram = pinout.make_part('MT41K512M16', footprint='Package_BGA:FBGA-96_9x14mm_Layout9x13_P0.8mm', ref='U2')
+
+    # TPS659037 PMIC (expanded with sequencing pins per SLIU011 User's Guide for TPS6590379ZWSR)
+    pmic = pinout.make_part('TPS659037', footprint='Package_BGA:nFBGA-169_12x12mm_Layout13x13_P0.8mm', ref='U7')
+
+    # TPS7A54-Q1 LDO for 1.5V (example, adjust as per datasheet)
+    ldo_1v5 = pinout.make_part('TPS7A54-Q1', footprint='Package_QFN:VQFN-20_3.5x3.5mm_P0.5mm', ref='U5')
+    pinout.report()
+
+    # Similar for other LDOs if needed (U4 for 3.3V, U6 for 1.8V) - assuming PMIC suffices, not included
+
+    # Connectors, resistors, caps, etc. (unchanged from original)
+    jtag = libs.part('Connector', 'Conn_01x06', footprint='Connector_PinHeader_2.54mm:Pin_Header_Straight_1x06', ref='JTAG')
+
+    r_term = [libs.part('Device', 'R', value=value(p['r_term']), footprint='Resistor_SMD:R_0402_1005Metric') for _ in range(16)]  # Series term
+    r_zq_ram0 = libs.part('Device', 'R', value=value(p['r_zq']), footprint='Resistor_SMD:R_0402_1005Metric')
+    r_zq_ram1 = libs.part('Device', 'R', value=value(p['r_zq']), footprint='Resistor_SMD:R_0402_1005Metric')
+    r_vref1 = libs.part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric')
+    r_vref2 = libs.part('Device', 'R', value='10k', footprint='Resistor_SMD:R_0402_1005Metric')
+    c_vref_ddr = libs.part('Device', 'C', value='0.1u', footprint='Capacitor_SMD:C_0402_1005Metric')
+    r_ptv = libs.part('Device', 'R', value=value(p['r_ptv']), footprint='Resistor_SMD:R_0402_1005Metric')
+    fb1 = libs.part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
+    fb2 = libs.part('Device', 'Ferrite_Bead', value='600@100M', footprint='Inductor_SMD:L_0402_1005Metric')
+    r_i2c_pu1 = libs.part('Device', 'R', value='4.7k', footprint='Resistor_SMD:R_0402_1005Metric')
+    r_i2c_pu2 = libs.part('Device', 'R', value='4.7k', footprint='Resistor_SMD:R_0402_1005Metric')
+    r_i2c_s1 = libs.part('Device', 'R', value='22', footprint='Resistor_SMD:R_0402_1005Metric')
+    r_i2c_s2 = libs.part('Device', 'R', value='22', footprint='Resistor_SMD:R_0402_1005Metric')
+    r_star = libs.part('Device', 'R', value='0', footprint='Resistor_SMD:R_0402_1005Metric')  # AGND-DGND tie
+    def decaps(n, val):
+        return [libs.part('Device', 'C', value=val, footprint='Capacitor_SMD:C_0402_1005Metric') for _ in range(n)]
+
+    decap_1v0 = decaps(p['n_decap_1v0'], '0.1u')  # Decaps, counts from params
+    decap_1v5 = decaps(p['n_decap_1v5'], '0.1u')
+    decap_1v8 = decaps(p['n_decap_1v8'], '0.1u')
+    hf_decap_1v0 = decaps(p['n_hf_decap_1v0'], '0.01u')
+    hf_decap_1v5 = decaps(p['n_hf_decap_1v5'], '0.01u')
+    hf_decap_1v8 = decaps(p['n_hf_decap_1v8'], '0.01u')
+    c61 = libs.part('Device', 'C', value='10u', footprint='Capacitor_SMD:C_1206_3216Metric')
+    c62 = libs.part('Device', 'C', value='10u', footprint='Capacitor_SMD:C_1206_3216Metric')
+    c63 = libs.part('Device', 'C', value='10u', footprint='Capacitor_SMD:C_1206_3216Metric')
+    led1 = libs.part('Device', 'LED', footprint='LED_SMD:LED_0603_1608Metric')
+    r_led = libs.part('Device', 'R', value='1k', footprint='Resistor_SMD:R_0402_1005Metric')
+
+    phase('nets')
+    # Nets
+    vcc_1v0 = skidl.Net('VCC_1V0')
+    vcc_1v35 = skidl.Net('VCC_1V35')  # New for RAM 1.35V per datasheet
+    vcc_1v5 = skidl.Net('VCC_1V5')
+    vcc_1v8 = skidl.Net('VCC_1V8')
+    vcc_3v3 = skidl.Net('VCC_3V3')
+    dgnd = skidl.Net('DGND')
+    agnd = skidl.Net('AGND')
+    vref_ddr = skidl.Net('VREF_DDR')
+    vcc_3v3_filtered = skidl.Net('VCC_3V3_FILTERED')
+    vcc_audio = skidl.Net('VCC_AUDIO')
+    en_1v0 = skidl.Net('EN_1V0')
+    en_1v35 = skidl.Net('EN_1V35')
+    en_1v5 = skidl.Net('EN_1V5')
+    en_1v8 = skidl.Net('EN_1V8')
+    en_3v3 = skidl.Net('EN_3V3')
+    mcbsp_clkx = skidl.Net('McBSP_CLKX')
+    mcbsp_dx = skidl.Net('McBSP_DX')
+    mcbsp_dr = skidl.Net('McBSP_DR')
+    mcbsp_fsx = skidl.Net('McBSP_FSX')
+    i2c_scl = skidl.Net('I2C_SCL')  # DSP side of the series resistors
+    i2c_sda = skidl.Net('I2C_SDA')
+    i2c_scl_bus = skidl.Net('I2C_SCL_BUS')  # Codec side, pulled up
+    i2c_sda_bus = skidl.Net('I2C_SDA_BUS')
+    ptv15 = skidl.Net('PTV15')
+    jtag_tms = skidl.Net('JTAG_TMS')
+    jtag_tdi = skidl.Net('JTAG_TDI')
+    jtag_tdo = skidl.Net('JTAG_TDO')
+    jtag_tck = skidl.Net('JTAG_TCK')
+    jtag_trst = skidl.Net('JTAG_TRST')
+    jtag_emu0 = skidl.Net('JTAG_EMU0')
+
+    phase('connect')
+    # Connections (custom parts use exact-name indexed lookups from bus.py; part['NAME'] also matches ball numbers)
+    pin, pins = bus.pin, bus.pins
+    vcc_1v0 += pins(dsp, 'CVDD'), pins(dsp, 'CVDD1'), [c[1] for c in decap_1v0], [c[1] for c in hf_decap_1v0], c61[1], pin(pmic, 'SMPS1_OUT'), pin(pmic, 'LDO1_OUT')  # Decaps near pins
+    dgnd += pins(dsp, 'VSS'), [c[2] for c in decap_1v0], [c[2] for c in hf_decap_1v0], c61[2], r_zq_ram0[2], r_zq_ram1[2]
+    vcc_1v35 += pins(ram, 'VDD'), pins(ram, 'VDDQ'), pin(pmic, 'SMPS2_OUT')  # 1.35V for RAM
+    dgnd += pins(ram, 'VSS'), pins(ram, 'VSSQ')
+    vcc_1v5 += pins(dsp, 'DVDD15'), pin(ldo_1v5, 'OUT'), [c[1] for c in decap_1v5], [c[1] for c in hf_decap_1v5], c62[1], r_vref1[1]
+    dgnd += [c[2] for c in decap_1v5], [c[2] for c in hf_decap_1v5], c62[2], r_vref2[2]
+    vcc_1v8 += pins(dsp, 'DVDD18'), [c[1] for c in decap_1v8], [c[1] for c in hf_decap_1v8], c63[1], pin(pmic, 'SMPS4_OUT')
+    dgnd += [c[2] for c in decap_1v8], [c[2] for c in hf_decap_1v8], c63[2]
+    vcc_3v3 += fb1[1], led1[1], r_i2c_pu1[1], r_i2c_pu2[1], pin(pmic, 'SMPS5_OUT')
+    vcc_3v3_filtered += fb1[2], pin(ldo_1v5, 'IN')  # Filtered input to LDOs
+    en_1v0 += pin(pmic, 'REGEN1')  # First in sequence for core 1.0V
+    en_1v35 += pin(pmic, 'GPIO2/REGEN2')  # For RAM 1.35V, after core
+    en_1v5 += pin(pmic, 'GPIO6/SYSEN2'), pin(ldo_1v5, 'EN')  # For DDR 1.5V, after I/O
+    en_1v8 += pin(pmic, 'GPIO4/SYSEN1')  # For I/O 1.8V, before DDR
+    en_3v3 += pin(pmic, 'ENABLE1')  # For 3.3V, last in sequence
+    # Star grounding: AGND and DGND tied via R_STAR at single point under U3
+    agnd += r_star[1]
+    dgnd += r_star[2]
+    vcc_audio += fb2[2]  # Filtered for codecs
+    vcc_3v3_filtered += fb2[1]
+    mcbsp_clkx += pin(dsp, 'McBSP_CLKX')
+    mcbsp_dx += pin(dsp, 'McBSP_DX')  # DSP TX -> codec DIN
+    mcbsp_dr += pin(dsp, 'McBSP_DR')  # Codec DOUT -> DSP RX
+    mcbsp_fsx += pin(dsp, 'McBSP_FSX')
+    i2c_scl += pin(dsp, 'I2C0_SCL'), r_i2c_s1[1]
+    i2c_scl_bus += r_i2c_s1[2], r_i2c_pu1[2]
+    i2c_sda += pin(dsp, 'I2C0_SDA'), r_i2c_s2[1]
+    i2c_sda_bus += r_i2c_s2[2], r_i2c_pu2[2]
+    # DDR3 data: DDR_Dx_DSP -> r_term[x] (series termination) -> DDR_Dx_RAM
+    # Bits within a lane and whole lanes (with their DQS/DM) may be swapped on the RAM side; see dqswap.py
+    dq_map = dqswap.load_map()
+    bus.connect_bus(dsp, bus.bus_names('DDR_D', 16), ram, [dq_map.get(f'DDR_D{i}', f'DQ{i}') for i in range(16)],
+                    series=r_term,
+                    net_names=bus.bus_names('DDR_D', 16, '_DSP'), dst_net_names=bus.bus_names('DDR_D', 16, '_RAM'))
+    bus.connect_bus(dsp, bus.bus_names('DDR_A', 16),
+                    ram, ['A0', 'A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'A9', 'A10/AP', 'A11', 'A12/BC#', 'A13', 'A14', 'A15'],
+                    net_names=bus.bus_names('DDR_A', 16))
+    ddr_ctrl_names = ['DDR_CLKP', 'DDR_CLKN', 'DDR_CAS', 'DDR_RAS', 'DDR_WE', 'DDR_DQS0P', 'DDR_DQS0N', 'DDR_DQS1P', 'DDR_DQS1N',
+                      'DDR_DQM0', 'DDR_DQM1', 'DDR_BA0', 'DDR_BA1', 'DDR_BA2', 'DDR_CE0', 'DDR_CE1',  # CE1/ODT1/CKE1 for dual rank
+                      'DDR_ODT0', 'DDR_ODT1', 'DDR_CKE0', 'DDR_CKE1', 'DDR_RESET']
+    ddr_ctrl_ram = ['CK', 'CK#', 'CAS#', 'RAS#', 'WE#', 'LDQS', 'LDQS#', 'UDQS', 'UDQS#',
+                    'LDM', 'UDM', 'BA0', 'BA1', 'BA2', 'CS0#', 'CS1#',
+                    'ODT0', 'ODT1', 'CKE0', 'CKE1', 'RESET#']
+    bus.connect_bus(dsp, ddr_ctrl_names, ram, [dq_map.get(n, r) for n, r in zip(ddr_ctrl_names, ddr_ctrl_ram)],
+                    net_names=ddr_ctrl_names)
+    r_zq_ram0[1] += pin(ram, 'ZQ0')
+    r_zq_ram1[1] += pin(ram, 'ZQ1')
+    vref_ddr += pin(dsp, 'VREFSSTL'), pin(ram, 'VREFCA'), pin(ram, 'VREFDQ'), r_vref1[2], r_vref2[1], c_vref_ddr[1]
+    ptv15 += pin(dsp, 'PTV15'), r_ptv[1]
+    dgnd += r_ptv[2]
+    led1[2] += r_led[1]
+    jtag_tms += pin(dsp, 'JTAG_TMS'), jtag['1']
+    jtag_tdi += pin(dsp, 'JTAG_TDI'), jtag['2']
+    jtag_tdo += pin(dsp, 'JTAG_TDO'), jtag['3']
+    jtag_tck += pin(dsp, 'JTAG_TCK'), jtag['4']
+    jtag_trst += pin(dsp, 'JTAG_TRST'), jtag['5']
+    jtag_emu0 += pin(dsp, 'JTAG_EMU0'), jtag['6']
+
+    phase('channels')
+    # Audio channels (codec, input protection, output LPF, jacks), one subcircuit per codec
+    link = {'bclk': mcbsp_clkx, 'fsync': mcbsp_fsx, 'dx': mcbsp_dx, 'dr': mcbsp_dr, 'scl': i2c_scl_bus, 'sda': i2c_sda_bus}
+    rails = {'vcc': vcc_audio, 'agnd': agnd, 'dgnd': dgnd}
+    for k in range(p['n_audio_channels']):
+        audio.audio_channel(k, libs, link, rails, p['n_decap_audio'])
+    libs.save()
+    libs.report()
+
+    # Power flags
+    vcc_1v0.drive = skidl.POWER
+    vcc_1v35.drive = skidl.POWER
+    vcc_1v5.drive = skidl.POWER
+    vcc_1v8.drive = skidl.POWER
+    vcc_3v3.drive = skidl.POWER
+    dgnd.drive = skidl.POWER
+    agnd.drive = skidl.POWER
+    vref_ddr.drive = skidl.POWER
+    phase(None)
+
+    return {'r_term': r_term, 'r_ptv': [r_ptv], 'r_zq': [r_zq_ram0, r_zq_ram1]}
+
+
+# Output stages are skipped when the design fingerprint is unchanged (see incremental.py)
+SCRIPT_NAME = os.path.splitext(os.path.basename(__file__))[0]
+ERC_FILE = SCRIPT_NAME + '.erc'
+NETLIST_FILE = SCRIPT_NAME + '.net'
+SCHEMATIC_FILE = 'production_dsp_schematic.kicad_sch'
+PCB_FILE = 'production_dsp.kicad_pcb'
+DRC_FILE = 'drc_report.json'
+NETDB_FILE = SCRIPT_NAME + '.db'
+OUTPUTS_FILE = SCRIPT_NAME + '.outputs'  # Files this run produced, one per line (see artifacts.py)
+
+
+def main(params=None):
+    """Run generate() under an instrument.Recorder; the per-phase record is written even when the run fails"""
+    phase = instrument.Recorder()
+    error = None
+    try:
+        return generate(params, phase)
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        phase.write(error=error)
+
+
+def generate(params=None, phase=None):
+    """Build the design, check it and generate (or restore) every output"""
+    phase = phase or (lambda name: None)
+    build_design(params, phase)
+    phase('snapshot')
+    design = incremental.Fingerprint(snapshot.take_snapshot())
+    phase('drc')
+    drc.write_report(drc.check(design.snap), DRC_FILE)
+    # Star-ground and supply-filter rules from the connectivity domains built during the connect phase
+    connectivity.write_report(connectivity.check())
+    stages = incremental.StageCache()
+    print(f"Design {design.design[:12]}, changed subsystems: {', '.join(stages.dirty_subsystems(design)) or 'none'}")
+    stages.record(design)
+
+    phase('netdb')
+    # Indexed parts/pins/nets for BOM, review and rail-audit scripts (see netdb.py)
+    stages.run('netdb', design.key('netdb', extra=[libcache.file_sha256(netdb.__file__)]), [NETDB_FILE],
+               lambda: netdb.write(design.snap, NETDB_FILE, design.design))
+
+    phase('pdn')
+    # PDN only reads the rails, so it keys on the power/audio subsystems, the capacitor models and pdn.py itself
+    pdn_key = design.key('pdn', ['power', 'audio'], extra=[libcache.file_sha256(f) for f in (pdn.PARTS_FILE, pdn.__file__)])
+    if stages.run('pdn', pdn_key, [pdn.REPORT_FILE], lambda: pdn.run(design.snap)):
+        with open(pdn.REPORT_FILE, encoding='utf-8') as f:
+            pdn.summary(json.load(f))
+
+    phase('powerseq')
+    # Sequencing reads the regulators and enables only; the timing model and powerseq.py are part of the key
+    seq_key = design.key('powerseq', ['power'],
+                         extra=[libcache.file_sha256(f) for f in (powerseq.CONFIG_FILE, powerseq.__file__)])
+    if stages.run('powerseq', seq_key, [powerseq.REPORT_FILE], lambda: powerseq.run(design.snap)):
+        with open(powerseq.REPORT_FILE, encoding='utf-8') as f:
+            powerseq.summary(json.load(f))
+
+    phase('audiopath')
+    # The analog paths are all in the audio subsystem; the models/limits and audiopath.py are part of the key
+    audio_key = design.key('audiopath', ['audio'],
+                           extra=[libcache.file_sha256(f) for f in (audiopath.CONFIG_FILE, audiopath.__file__)])
+    if stages.run('audiopath', audio_key, [audiopath.REPORT_FILE], lambda: audiopath.run(design.snap)):
+        with open(audiopath.REPORT_FILE, encoding='utf-8') as f:
+            audiopath.summary(json.load(f))
+
+    phase('si')
+    # The data lines and their r_term are DDR nets/parts; routed lengths come from ddrlen's report when there is one
+    si_extra = [libcache.file_sha256(si.__file__)]
+    if os.path.isfile(ddrlen.REPORT_FILE):
+        si_extra.append(libcache.file_sha256(ddrlen.REPORT_FILE))
+    if stages.run('si', design.key('si', ['ddr'], extra=si_extra), [si.REPORT_FILE], lambda: si.run(design.snap)):
+        with open(si.REPORT_FILE, encoding='utf-8') as f:
+            si.summary(json.load(f))
+
+    phase('erc')
+    # drc.install_erc() decides what skidl.ERC checks and reports, so drc.py and the skidl version are part of the key
+    erc_key = design.key('erc', extra=[libcache.file_sha256(drc.__file__), skidl.__version__])
+    try:
+        if stages.run('erc', erc_key, [ERC_FILE], skidl.ERC):
+            with open(ERC_FILE, encoding='utf-8') as f:
+                print(f.read(), end='')
+    except Exception as e:
+        print(f"ERC error: {e}")
+
+    phase('outputs')
+    # Netlist first; schematic and kinet2pcb board then run in parallel workers (see outputs.py).
+    # The board gets an initial placement before it is cached (see placement.py); courtyard.py checks it afterwards
+    # ECHOFORGE_SHEETS=1 splits the schematic into per-subsystem sheets generated in parallel (see sheets.py)
+    if os.environ.get('ECHOFORGE_SHEETS') == '1':
+        sheets.summary(design, SCHEMATIC_FILE)
+        schematic_stages = sheets.stages(design, SCHEMATIC_FILE)
+    else:
+        schematic_stages = [outputs.Stage('schematic', design.key('schematic'), [SCHEMATIC_FILE],
+                                          lambda: outputs.generate_schematic(SCHEMATIC_FILE))]
+    pcb_key = design.key('pcb', extra=outputs.FP_LIB_DIRS + [libcache.file_sha256(f) for f in (placement.__file__, sexpr.__file__)])
+    results = outputs.run_pipeline(
+        stages,
+        outputs.Stage('netlist', design.key('netlist', extra=[libcache.file_sha256(artifacts.__file__)]), [NETLIST_FILE],
+                      lambda: outputs.generate_netlist(NETLIST_FILE)),
+        schematic_stages + [
+            outputs.Stage('pcb', pcb_key, [PCB_FILE], lambda: outputs.generate_pcb(NETLIST_FILE, PCB_FILE)),
+        ],
+    )
+    if results[-1]['ok']:
+        phase('courtyard')
+        # Overlap/keep-out check of the placed board, keyed on the board file so a cached pcb is still checked
+        if stages.run('courtyard', courtyard.stage_key(design, PCB_FILE), [courtyard.REPORT_FILE],
+                      lambda: courtyard.run(PCB_FILE)):
+            with open(courtyard.REPORT_FILE, encoding='utf-8') as f:
+                courtyard.summary(json.load(f), courtyard.REPORT_FILE)
+    phase(None)
+    # Parallel stages ran in workers, so their outputs come from the results rather than from stages.produced
+    produced = [DRC_FILE, connectivity.REPORT_FILE] + stages.produced + [o for r in results if r['ok'] for o in r['outputs']]
+    artifacts.write_list(OUTPUTS_FILE, [f for f in produced if os.path.isfile(f)])
+    if all(r['ok'] for r in results[1:1 + len(schematic_stages)]):
+        print(f"Production schematic generated as {SCHEMATIC_FILE}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
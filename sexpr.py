@@ -0,0 +1,106 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Minimal S-expression reader for the KiCad files the tools read back (netlists, boards).
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: One regex pass tokenizes the text; quoted atoms are unescaped, bare atoms stay strings (no number conversion). A node is a list whose first item is its keyword.
+Note: spans() and end() find nodes by text offset without building them, for tools that rewrite or read a few nodes of a large file.
+"""
+
+import re
+
+_TOKEN_RE = re.compile(r'[()]|"[^"\\]*(?:\\.[^"\\]*)*"|[^\s()"]+')  # Unrolled string loop
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def atom(token):
+    """Token text -> atom string (quotes removed and escapes resolved)"""
+    if token[0] == '"':
+        token = token[1:-1]
+        return _ESCAPE_RE.sub(r'\1', token) if '\\' in token else token
+    return token
+
+
+def parse(text):
+    """First top-level expression of text as nested lists"""
+    stack = []
+    node = []
+    for token in _TOKEN_RE.findall(text):
+        if token == '(':
+            stack.append(node)
+            node = []
+        elif token == ')':
+            if not stack:
+                raise ValueError("Unbalanced ')' in S-expression")
+            parent = stack.pop()
+            parent.append(node)
+            if not stack:
+                return node
+            node = parent
+        elif token[0] == '"':
+            node.append(atom(token))
+        else:
+            node.append(token)
+    raise ValueError("Unterminated S-expression" if stack else "No S-expression found")
+
+
+def spans(text, key, depth=2):
+    """(start, end) text offsets of the nodes with the given keyword at a nesting depth (1 = the root, 2 = its children)"""
+    found = []
+    level = 0
+    opened = None  # Offset of a '(' whose keyword is the next token
+    start = None
+    for m in _TOKEN_RE.finditer(text):
+        token = m.group()
+        if token == '(':
+            level += 1
+            opened = m.start()
+        elif token == ')':
+            if start is not None and level == depth:
+                found.append((start, m.end()))
+                start = None
+            level -= 1
+            opened = None
+        else:
+            if opened is not None and level == depth and token == key:
+                start = opened
+            opened = None
+    return found
+
+
+def end(text, start):
+    """Offset just past the expression that opens at text[start]"""
+    level = 0
+    for m in _TOKEN_RE.finditer(text, start):
+        if m.group() == '(':
+            level += 1
+        elif m.group() == ')':
+            level -= 1
+            if not level:
+                return m.end()
+    raise ValueError("Unterminated S-expression")
+
+
+def read(path):
+    """parse() of a file"""
+    with open(path, encoding='utf-8') as f:
+        return parse(f.read())
+
+
+def find(node, key):
+    """First child node with the given keyword, or None"""
+    for child in node[1:]:
+        if isinstance(child, list) and child and child[0] == key:
+            return child
+    return None
+
+
+def findall(node, key):
+    """All child nodes with the given keyword"""
+    return [child for child in node[1:] if isinstance(child, list) and child and child[0] == key]
+
+
+def value(node, key, default=None):
+    """First atom of the child with the given keyword: value((comp (ref "U1")), 'ref') -> 'U1'"""
+    child = find(node, key)
+    return child[1] if child is not None and len(child) > 1 and not isinstance(child[1], list) else default
@@ -0,0 +1,196 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Hierarchical schematic for schematic.py: one sub-sheet per subsystem, each placed and routed in its own worker, tied together by a top sheet.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Parts go to the sheet of their incremental.py subsystem (power/PMIC, DDR3, audio, JTAG); parts that span several subsystems (the DSP) get a sheet of their own. Nets with pins on more than one sheet are drawn as hierarchical labels.
+Note: Each sheet worker is forked from the built design, removes every part of the other sheets from its copy of the circuit and runs skidl's generator on what is left, so generation time follows the largest sheet rather than the board.
+Note: The top sheet is written directly: one sheet symbol per sub-sheet with a pin per boundary net, and a label on every pin so pins of the same net connect. Each sheet is its own cached stage.
+Enable with ECHOFORGE_SHEETS=1 when running schematic.py; `python sheets.py` builds the design and generates the sheets standalone.
+"""
+
+import builtins
+import hashlib
+import os
+import re
+import time
+import uuid
+
+SHEETS = (
+    ('dsp', 'DSP'),
+    ('power', 'Power / PMIC'),
+    ('ddr', 'DDR3'),
+    ('audio', 'Audio'),
+    ('jtag', 'JTAG / debug'),
+)
+GRID = 2.54  # mm; sheet pins and labels sit on the 100 mil grid
+CHAR_W = 1.27  # Approximate label character width (mm)
+PAPER = (('A4', 297, 210), ('A3', 420, 297), ('A2', 594, 420), ('A1', 841, 594), ('A0', 1189, 841))
+
+_GLOBAL_RE = re.compile(r'\(global_label "((?:[^"\\]|\\.)*)"')
+
+
+def _uuid(*names):
+    """Deterministic UUID, so unchanged sheets regenerate byte-identical"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, 'echoforge:' + ':'.join(names)))
+
+
+def _natural(name):
+    """Sort key that puts DDR_A2 before DDR_A10"""
+    return [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', name)]
+
+
+def _q(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def partition(design, path):
+    """Sheets of a design (incremental.Fingerprint): [{'name', 'title', 'file', 'refs', 'boundary', 'digest'}]"""
+    snap = design.snap
+    home = []
+    for part in range(snap.n_parts):
+        subs = {design.net_subsystem[snap.pin_net[p]] for p in snap.part_pins(part) if snap.pin_net[p] >= 0}
+        subs.discard('power')
+        home.append('dsp' if len(subs) > 1 else design.part_subsystem[part])
+    stem = os.path.splitext(path)[0]
+    sheets = {name: {'name': name, 'title': title, 'file': f'{stem}_{name}.kicad_sch', 'refs': [], 'boundary': set()}
+              for name, title in SHEETS}
+    for part, name in enumerate(home):
+        sheets[name]['refs'].append(snap.part_ref[part])
+    for net in range(snap.n_nets):
+        on = {home[snap.pin_part[p]] for p in snap.net_pins(net)}
+        if len(on) > 1:
+            for name in on:
+                sheets[name]['boundary'].add(snap.net_name[net])
+    result = []
+    for name, _ in SHEETS:
+        sheet = sheets[name]
+        if not sheet['refs']:
+            continue
+        sheet['refs'].sort()
+        sheet['boundary'] = sorted(sheet['boundary'], key=_natural)
+        refs = set(sheet['refs'])
+        content = sorted((snap.part_ref[snap.pin_part[p]], snap.part_name[snap.pin_part[p]],
+                          snap.part_value[snap.pin_part[p]], snap.part_fp[snap.pin_part[p]], snap.pin_num[p],
+                          snap.net_name[snap.pin_net[p]] if snap.pin_net[p] >= 0 else '')
+                         for p in range(snap.n_pins) if snap.part_ref[snap.pin_part[p]] in refs)
+        sheet['digest'] = hashlib.sha256(repr([sheet['title'], content, sheet['boundary']]).encode()).hexdigest()
+        result.append(sheet)
+    return result
+
+
+def generate_sheet(sheet):
+    """Place and route one sheet: drop the other sheets' parts from this process's circuit, then run skidl"""
+    circuit = builtins.default_circuit
+    keep = set(sheet['refs'])
+    circuit.rmv_parts(*[part for part in circuit.parts if part.ref not in keep])
+    boundary = set(sheet['boundary'])
+    for net in circuit.nets:
+        if net.name in boundary and net.pins:
+            net.stub = True  # Drawn as a label at each pin instead of a wire to the sheet edge
+    directory, name = os.path.split(os.path.abspath(sheet['file']))
+    circuit.generate_schematic(filepath=directory, top_name=os.path.splitext(name)[0], title=sheet['title'],
+                               flatness=1.0)
+    hierarchical_labels(sheet['file'], boundary)
+
+
+def hierarchical_labels(path, names):
+    """Turn skidl's global labels for the given nets into hierarchical labels; returns how many changed"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    count = 0
+
+    def swap(m):
+        nonlocal count
+        if m.group(1).replace('\\"', '"').replace('\\\\', '\\') not in names:
+            return m.group(0)
+        count += 1
+        return f'(hierarchical_label "{m.group(1)}"'
+
+    text = _GLOBAL_RE.sub(swap, text)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return count
+
+
+def write_top(path, sheets, title='EchoForge DSP'):
+    """Top sheet: a sheet symbol per sub-sheet with one pin per boundary net, each pin carrying a net label"""
+    root = _uuid(path)
+    project = os.path.splitext(os.path.basename(path))[0]
+    x, y = 2 * GRID * 10, 2 * GRID * 10
+    items, right, bottom = [], 0.0, 0.0
+    for page, sheet in enumerate(sheets, 2):
+        longest = max((len(n) for n in sheet['boundary']), default=0)
+        x += round((longest * CHAR_W + 4 * GRID) / GRID) * GRID  # Room for the labels left of the pins
+        w = round((max(longest, len(sheet['title'])) + 6) * CHAR_W / GRID) * GRID  # Pin names are drawn inside
+        h = (len(sheet['boundary']) + 2) * GRID
+        sid = _uuid(path, sheet['name'])
+        lines = [f'  (sheet (at {x:.2f} {y:.2f}) (size {w:.2f} {h:.2f}) (fields_autoplaced)',
+                 '    (stroke (width 0.1524) (type solid)) (fill (color 0 0 0 0.0000))',
+                 f'    (uuid {sid})',
+                 f'    (property "Sheetname" {_q(sheet["title"])} (at {x:.2f} {y - 0.71:.2f} 0)'
+                 ' (effects (font (size 1.27 1.27)) (justify left bottom)))',
+                 f'    (property "Sheetfile" {_q(os.path.basename(sheet["file"]))} (at {x:.2f} {y + h + 0.58:.2f} 0)'
+                 ' (effects (font (size 1.27 1.27)) (justify left top)))']
+        labels = []
+        for i, net in enumerate(sheet['boundary'], 1):
+            py = y + i * GRID
+            lines.append(f'    (pin {_q(net)} bidirectional (at {x:.2f} {py:.2f} 180)'
+                         f' (effects (font (size 1.27 1.27)) (justify left)) (uuid {_uuid(path, sheet["name"], net)}))')
+            labels.append(f'  (label {_q(net)} (at {x:.2f} {py:.2f} 180) (fields_autoplaced)'
+                          f' (effects (font (size 1.27 1.27)) (justify right bottom)) (uuid {_uuid(path, "label", sheet["name"], net)}))')
+        lines.append(f'    (instances (project {_q(project)} (path "/{root}" (page "{page}"))))')
+        lines.append('  )')
+        items += lines + labels
+        x += w
+        right, bottom = max(right, x), max(bottom, y + h)
+    paper = next((name for name, pw, ph in PAPER if right + 20 <= pw and bottom + 20 <= ph), PAPER[-1][0])
+    text = '\n'.join([
+        '(kicad_sch (version 20230409) (generator echoforge)',
+        f'  (uuid {root})',
+        f'  (paper "{paper}")',
+        f'  (title_block (title {_q(title)}))',
+        '  (lib_symbols)',
+        *items,
+        '  (sheet_instances (path "/" (page "1")))',
+        ')',
+    ])
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+    os.replace(tmp, path)
+
+
+def stages(design, path):
+    """outputs.Stage list: the top sheet first, then one stage per sub-sheet"""
+    import outputs
+
+    sheets = partition(design, path)
+    top_key = hashlib.sha256(repr([(s['title'], s['file'], s['boundary']) for s in sheets]).encode()).hexdigest()
+    result = [outputs.Stage('schematic', design.key('schematic_top', [], extra=[top_key]), [path],
+                            lambda: write_top(path, sheets))]
+    for sheet in sheets:
+        result.append(outputs.Stage(f"sheet_{sheet['name']}", design.key('sheet', [], extra=[sheet['digest']]),
+                                    [sheet['file']], lambda sheet=sheet: generate_sheet(sheet)))
+    return result
+
+
+def summary(design, path):
+    """Print parts and boundary nets per sheet"""
+    for sheet in partition(design, path):
+        print(f"Sheet {sheet['title']}: {len(sheet['refs'])} parts, {len(sheet['boundary'])} hierarchical labels "
+              f"({sheet['file']})")
+
+
+if __name__ == '__main__':
+    import incremental
+    import outputs
+    import schematic
+    import snapshot
+
+    schematic.build_design()
+    design = incremental.Fingerprint(snapshot.take_snapshot())
+    summary(design, schematic.SCHEMATIC_FILE)
+    start = time.perf_counter()
+    results = outputs.run_parallel(incremental.StageCache(), stages(design, schematic.SCHEMATIC_FILE))
+    outputs.report(results, time.perf_counter() - start)
@@ -0,0 +1,358 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Signal-integrity sweep for the DDR3 data lines (DDR_Dx_DSP -> r_term -> DDR_Dx_RAM).
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Each line is modelled as driver (r_drv) + series r_term + lossless Z0 trace + ODT (Thevenin to VTT = VDDQ/2) + receiver capacitance. Sweep axes are r_term, trace length and ODT.
+Note: With InSpice and ngspice available (--spice) each point is a transient run; otherwise a NumPy ABCD-matrix solver computes all points at once in the frequency domain and IFFTs the edge response.
+Note: Points are deduplicated and cached by a hash of model + point parameters in .cache/si/results.json; chunks run in a process pool.
+Note: In schematic.py this is the 'si' stage: the lines and the fitted r_term come from the design snapshot (every part between a DDR_Dx_DSP and its DDR_Dx_RAM net), and when ddrlen.py has written its report for the board each routed line is simulated at its routed length instead of the length_mm axis. Run alone, the 16 lines of the reference design are swept.
+Note: Lines without a length of their own (routed length or offset) give identical rows, so one of them is swept for all; the report keeps the worst case per (ODT, r_term), with every row only when asked for (--points).
+Usage: python si.py [r_term=15:60:1] [length_mm=10:100:5] [odt=0,120,60,40] [--lengths offsets.json] [--spice] [-j N] [--points]
+Per-line length offsets ({"DDR_D3_DSP": 2.5, ...} in mm, added to length_mm) can be given with --lengths.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import ddrlen
+from libcache import CACHE_DIR
+
+SI_CACHE = os.path.join(CACHE_DIR, 'si', 'results.json')
+REPORT_FILE = 'si_report.json'
+
+LINES = [(f'DDR_D{i}_DSP', f'DDR_D{i}_RAM') for i in range(16)]  # Standalone runs; the stage reads them from the design
+
+# Typical values for TMS320C6657 DDR3 outputs driving MT41K512M16 (DDR3L) inputs
+MODEL = {
+    'vddq': 1.35,  # V
+    'r_drv': 34.0,  # Driver output impedance (ohms)
+    'z0': 50.0,  # Trace impedance (ohms)
+    'tpd_ps_mm': 6.7,  # Stripline delay in FR-4
+    'c_rx_pf': 2.0,  # DQ input + pad capacitance
+    'rise_ps': 150.0,  # 0-100% driver edge
+    'window_ns': 40.0,  # Simulated period (rising edge at 1 ns, falling at window/2 + 1 ns)
+    'samples': 4096,
+}
+AXES = {
+    'r_term': list(range(15, 61)),
+    'length_mm': list(range(10, 101, 5)),
+    'odt': [0, 120, 60, 40],  # RTT_NOM, 0 = off
+}
+METRICS = ('delay_ps', 'rise_ps', 'overshoot_pct', 'ringback_pct', 'settle_ps', 'v_low', 'v_high')
+
+
+def point_key(model, point, solver):
+    """Cache key for one physical point"""
+    return hashlib.sha1(json.dumps([solver, model, point], sort_keys=True).encode()).hexdigest()[:20]
+
+
+def source_wave(model):
+    """Time axis and the periodic driver pulse (0 -> VDDQ -> 0)"""
+    n = model['samples']
+    t = np.arange(n) * (model['window_ns'] * 1e-9 / n)
+    tr = model['rise_ps'] * 1e-12
+    t0, t1 = 1e-9, model['window_ns'] * 1e-9 / 2 + 1e-9
+    v = np.clip((t - t0) / tr, 0, 1) - np.clip((t - t1) / tr, 0, 1)
+    return t, v * model['vddq']
+
+
+def solve_numpy(model, points):
+    """Receiver waveforms for an array of points (r_term, length_mm, odt), shape (P, samples)"""
+    t, vs = source_wave(model)
+    f = np.fft.rfftfreq(len(t), t[1] - t[0])
+    w = 2 * np.pi * f[None, :]
+    r_term, length, odt = (np.asarray(col, dtype=float)[:, None] for col in zip(*points))
+    zs = model['r_drv'] + r_term
+    z0 = model['z0']
+    bl = w * length * model['tpd_ps_mm'] * 1e-12
+    a = np.cos(bl)
+    b = 1j * z0 * np.sin(bl)
+    c = 1j * np.sin(bl) / z0
+    y_load = 1j * w * model['c_rx_pf'] * 1e-12 + np.where(odt > 0, 1 / np.where(odt > 0, odt, 1), 0)
+    # V_rx / V_src for source impedance zs into ABCD line terminated by y_load (ZL = 1 / y_load)
+    h = 1 / (a + b * y_load + zs * (c + (a * y_load)))
+    v = np.fft.irfft(np.fft.rfft(vs)[None, :] * h, n=len(t))
+    # ODT pulls the line towards VTT; at DC the trace is a wire, so add VTT through the zs/odt divider
+    vtt = np.where(odt > 0, model['vddq'] / 2 * zs / (zs + np.where(odt > 0, odt, 1)), 0)
+    return t, v + vtt
+
+
+def solve_spice(model, points):
+    """Receiver waveforms from ngspice via InSpice, one transient run per point"""
+    from InSpice.Spice.Netlist import Circuit
+    from InSpice.Unit import u_ns, u_Ohm, u_pF, u_ps, u_V
+
+    t, _ = source_wave(model)
+    half = model['window_ns'] / 2
+    waves = []
+    for r_term, length, odt in points:
+        circuit = Circuit('ddr_dq')
+        circuit.PulseVoltageSource('drv', 'src', circuit.gnd, initial_value=0 @ u_V, pulsed_value=model['vddq'] @ u_V,
+                                   delay_time=1 @ u_ns, rise_time=model['rise_ps'] @ u_ps,
+                                   fall_time=model['rise_ps'] @ u_ps, pulse_width=(half - model['rise_ps'] / 1e3) @ u_ns,
+                                   period=model['window_ns'] @ u_ns)
+        circuit.R('drv', 'src', 'pad', model['r_drv'] @ u_Ohm)
+        circuit.R('term', 'pad', 'tx', r_term @ u_Ohm)
+        circuit.LosslessTransmissionLine('trace', 'tx', circuit.gnd, 'rx', circuit.gnd, impedance=model['z0'],
+                                         time_delay=(length * model['tpd_ps_mm']) @ u_ps)
+        circuit.C('rx', 'rx', circuit.gnd, model['c_rx_pf'] @ u_pF)
+        if odt > 0:
+            circuit.V('tt', 'vtt', circuit.gnd, model['vddq'] / 2 @ u_V)
+            circuit.R('odt', 'rx', 'vtt', odt @ u_Ohm)
+        sim = circuit.simulator()
+        analysis = sim.transient(step_time=(t[1] - t[0]) * 1e12 @ u_ps, end_time=model['window_ns'] @ u_ns)
+        waves.append(np.interp(t, np.array(analysis.time), np.array(analysis['rx'])))
+    return t, np.array(waves)
+
+
+def measure(model, t, v):
+    """Per-point metrics (columns in METRICS order) from rising-edge waveforms"""
+    n = len(t)
+    dt = t[1] - t[0]
+    i0 = int(1e-9 / dt) - 1  # Just before the rising edge
+    half = n // 2 + i0  # Just before the falling edge
+    v_low, v_high = v[:, i0], v[:, half]
+    swing = np.maximum(v_high - v_low, 1e-9)
+    edge = v[:, i0:half]
+    norm = (edge - v_low[:, None]) / swing[:, None]
+
+    def cross(level):
+        above = norm >= level
+        k = np.clip(np.argmax(above, axis=1), 1, None)
+        rows = np.arange(len(norm))
+        y0, y1 = norm[rows, k - 1], norm[rows, k]
+        return (k - 1 + (level - y0) / np.where(y1 != y0, y1 - y0, 1)) * dt
+
+    t_edge = 1e-9 - i0 * dt  # Edge start relative to sample i0
+    delay = cross(0.5) - (t_edge + model['rise_ps'] * 1e-12 / 2)
+    rise = cross(0.8) - cross(0.2)
+    peak_idx = np.argmax(norm, axis=1)
+    overshoot = np.maximum(norm.max(axis=1) - 1, 0)
+    after_peak = np.where(np.arange(norm.shape[1])[None, :] > peak_idx[:, None], norm, np.inf)
+    ringback = np.maximum(1 - after_peak.min(axis=1), 0)  # Peak on the last sample gives -inf -> 0
+    outside = np.abs(norm - 1) > 0.05
+    last = norm.shape[1] - 1 - np.argmax(outside[:, ::-1], axis=1)
+    settle = (last + 1) * dt - t_edge
+    return np.column_stack([delay * 1e12, rise * 1e12, overshoot * 100, ringback * 100, settle * 1e12, v_low, v_high])
+
+
+def _solve_chunk(model, points, solver):
+    t, v = (solve_spice if solver == 'spice' else solve_numpy)(model, points)
+    return measure(model, t, v).round(4).tolist()
+
+
+def spice_available():
+    """True if InSpice imports and can reach ngspice"""
+    try:
+        from InSpice.Spice.Netlist import Circuit
+
+        Circuit('probe').simulator()
+        return True
+    except Exception:
+        return False
+
+
+def _natural(net):
+    return int(net[len('DDR_D'):-len('_DSP')])
+
+
+def design_lines(snap):
+    """(DSP net, RAM net, series part value) for every part joining a DDR_Dx_DSP net to its DDR_Dx_RAM net"""
+    found = []
+    for part in range(snap.n_parts):
+        nets = sorted(snap.net_name[snap.pin_net[p]] for p in snap.part_pins(part) if snap.pin_net[p] >= 0)
+        if (len(nets) == 2 and nets[0].startswith('DDR_D') and nets[0].endswith('_DSP')
+                and nets[1] == nets[0][:-len('_DSP')] + '_RAM'):
+            found.append((nets[0], nets[1], snap.part_value[part]))
+    return sorted(found, key=lambda line: _natural(line[0]))
+
+
+def routed_lengths(report):
+    """DSP net -> routed length (mm) of each routed split line in a ddrlen report"""
+    return {f'{line}_DSP': entry['length_mm'] for line, entry in report['lines'].items()
+            if entry.get('routed') and f'{line}_DSP' in entry['nets']}
+
+
+def swept_lines(lines, distinct):
+    """Lines to sweep: those with a length of their own plus one for all the rest; and the names of the rest"""
+    same = [line for line in lines if line[0] not in distinct]
+    return [line for line in lines if line[0] in distinct] + same[:1], [line[0] for line in same]
+
+
+def run_sweep(axes=None, offsets=None, model=None, solver='numpy', jobs=None, cache_file=SI_CACHE, lines=None,
+              lengths=None):
+    """Sweep every line over the axes; returns the list of result rows (one per line and point)
+
+    lines: (DSP net, RAM net) pairs, LINES by default; lengths: DSP net -> mm, used instead of the length_mm axis
+    """
+    axes = dict(AXES, **(axes or {}))
+    model = dict(MODEL, **(model or {}))
+    offsets = offsets or {}
+    lengths = lengths or {}
+    start = time.perf_counter()
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    rows, todo = [], {}
+    for dsp_net, ram_net in lines or LINES:
+        for r_term in axes['r_term']:
+            for length in [lengths[dsp_net]] if dsp_net in lengths else axes['length_mm']:
+                for odt in axes['odt']:
+                    point = (float(r_term), round(float(length) + offsets.get(dsp_net, 0.0), 3), float(odt))
+                    key = point_key(model, point, solver)
+                    if key not in cache:
+                        todo[key] = point
+                    rows.append({'line': dsp_net, 'ram_net': ram_net, 'r_term': r_term, 'length_mm': point[1],
+                                 'odt': odt, 'key': key})
+    n_cached = len({r['key'] for r in rows}) - len(todo)
+    if todo:
+        keys = list(todo)
+        per_chunk = 64 if solver == 'spice' else 512
+        chunks = [keys[i:i + per_chunk] for i in range(0, len(keys), per_chunk)]
+        jobs = jobs or os.cpu_count()
+        if jobs == 1 or len(chunks) == 1:
+            solved = [_solve_chunk(model, [todo[k] for k in chunk], solver) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(jobs) as pool:
+                solved = list(pool.map(_solve_chunk, [model] * len(chunks),
+                                       [[todo[k] for k in chunk] for chunk in chunks], [solver] * len(chunks)))
+        for chunk, metrics in zip(chunks, solved):
+            cache.update(zip(chunk, metrics))
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(tmp, cache_file)
+    for row in rows:
+        row.update(zip(METRICS, cache[row.pop('key')]))
+    print(f"SI: {len(rows)} line-points ({len(todo)} solved with {solver}, {n_cached} cached) "
+          f"in {time.perf_counter() - start:.2f} s")
+    return rows
+
+
+def summarize(rows, overshoot_limit=10.0):
+    """Worst case over lines and lengths per (odt, r_term), and the r_term with the fastest settling per ODT"""
+    table = {}
+    for r in rows:
+        key = (r['odt'], r['r_term'])
+        worst = table.setdefault(key, {'odt': r['odt'], 'r_term': r['r_term'], 'overshoot_pct': 0.0,
+                                       'ringback_pct': 0.0, 'settle_ps': 0.0, 'swing_v': float('inf')})
+        worst['overshoot_pct'] = max(worst['overshoot_pct'], r['overshoot_pct'])
+        worst['ringback_pct'] = max(worst['ringback_pct'], r['ringback_pct'])
+        worst['settle_ps'] = max(worst['settle_ps'], r['settle_ps'])
+        worst['swing_v'] = min(worst['swing_v'], round(r['v_high'] - r['v_low'], 4))
+    best = {}
+    for w in table.values():
+        if w['overshoot_pct'] <= overshoot_limit:
+            b = best.get(w['odt'])
+            if b is None or w['settle_ps'] < b['settle_ps']:
+                best[w['odt']] = w
+    return list(table.values()), [best[o] for o in sorted(best)]
+
+
+def report(rows, solver, fitted=None, lengths=None, lines=None, same=(), points=False):
+    """Report dict; with the design's fitted r_term values, the worst case at each of them per ODT
+
+    same: lines swept once as the first of them; points: keep every row (tens of thousands for the full axes)
+    """
+    table, best = summarize(rows)
+    rep = {'model': dict(MODEL), 'solver': solver, 'lines': lines or sorted({r['line'] for r in rows}, key=_natural),
+           'routed_lengths_mm': lengths or {}, 'same_rows': list(same), 'best': best, 'worst_case': table}
+    if points:
+        rep['points'] = rows
+    if fitted:
+        rep['fitted'] = fitted
+        rep['current'] = sorted((w for w in table if w['r_term'] in fitted.values()),
+                                key=lambda w: (w['odt'], w['r_term']))
+    return rep
+
+
+def write_report(rep, path=REPORT_FILE):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(rep, f, indent=1)
+    os.replace(tmp, path)
+    summary(rep)
+    print(f"Report written to {path}")
+
+
+def summary(rep):
+    """Best r_term per ODT and, for a design, how its fitted r_term compares"""
+    for b in rep['best']:
+        print(f"ODT {'off' if not b['odt'] else int(b['odt'])}: r_term {b['r_term']:g} ohm settles in {b['settle_ps']:.0f} ps "
+              f"(overshoot {b['overshoot_pct']:.1f}%, ringback {b['ringback_pct']:.1f}%, swing {b['swing_v']:.3f} V)")
+    for c in rep.get('current', []):
+        print(f"ODT {'off' if not c['odt'] else int(c['odt'])}: fitted r_term {c['r_term']:g} ohm settles in "
+              f"{c['settle_ps']:.0f} ps (overshoot {c['overshoot_pct']:.1f}%, ringback {c['ringback_pct']:.1f}%)")
+    if len(rep.get('same_rows', [])) > 1:
+        print(f"SI: {len(rep['same_rows'])} lines without a length of their own swept once as {rep['same_rows'][0]}")
+    routed = len(rep.get('routed_lengths_mm', {}))
+    print(f"SI: {len(rep['lines'])} lines, {routed} at routed lengths from {ddrlen.REPORT_FILE}" if routed
+          else f"SI: {len(rep['lines'])} lines over length_mm (no routed lengths)")
+
+
+def run(snap, report_file=REPORT_FILE, ddrlen_file=ddrlen.REPORT_FILE, jobs=None, points=False):
+    """Sweep the design's data lines around its fitted r_term and write the report"""
+    found = design_lines(snap)
+    fitted = {}
+    for dsp_net, _, value in found:
+        try:
+            fitted[dsp_net] = float(value)
+        except ValueError:  # A value like '34R' is not swept, only the line
+            pass
+    axes = {'r_term': sorted(set(AXES['r_term']) | set(fitted.values()))}
+    try:
+        with open(ddrlen_file, encoding='utf-8') as f:
+            lengths = routed_lengths(json.load(f))
+    except (OSError, ValueError):  # No board routed yet
+        lengths = {}
+    lines = [(dsp_net, ram_net) for dsp_net, ram_net, _ in found]
+    lengths = {n: mm for n, mm in lengths.items() if n in dict(lines)}
+    swept, same = swept_lines(lines, lengths)
+    rows = run_sweep(axes, jobs=jobs, lines=swept, lengths=lengths)
+    rep = report(rows, 'numpy', fitted, lengths, [n for n, _ in lines], same, points)
+    write_report(rep, report_file)
+    return rep
+
+
+def parse_axis(text):
+    """'15:60:5' (inclusive range) or '22,34,40'"""
+    if ':' in text:
+        lo, hi, step = (float(x) for x in text.split(':'))
+        return [round(x, 6) for x in np.arange(lo, hi + step / 2, step)]
+    return [float(x) for x in text.split(',')]
+
+
+if __name__ == '__main__':
+    axes, offsets, solver, jobs, points = {}, {}, 'numpy', None, False
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg == '--spice':
+            solver = 'spice'
+        elif arg == '--lengths':
+            with open(next(args), encoding='utf-8') as f:
+                offsets = json.load(f)
+        elif arg == '--points':
+            points = True
+        elif arg == '-j':
+            jobs = int(next(args))
+        else:
+            name, _, values = arg.partition('=')
+            if name not in AXES:
+                raise SystemExit(f"Unknown axis {name!r}; one of {', '.join(AXES)}")
+            axes[name] = parse_axis(values)
+    if solver == 'spice' and not spice_available():
+        print("InSpice/ngspice not available, using the NumPy solver")
+        solver = 'numpy'
+    swept, same = swept_lines(LINES, offsets)
+    rows = run_sweep(axes, offsets, solver=solver, jobs=jobs, lines=swept)
+    write_report(report(rows, solver, lines=[n for n, _ in LINES], same=same, points=points))
@@ -0,0 +1,115 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Flat, column-wise snapshot of a built skidl circuit (parts, pins, nets) for the analysis and caching tools.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Taking a snapshot walks the circuit once; everything downstream works on plain tuples/arrays and never touches skidl again.
+"""
+
+import builtins
+from array import array
+
+from pinout import FUNC_CODE, PIN_FUNCS
+
+NOCONNECT = '__NOCONNECT'
+POWER_DRIVE = 8  # skidl.Pin.drives.POWER
+
+
+class Snapshot:
+    """Parts, pins and nets of a design stored as parallel columns"""
+
+    def __init__(self):
+        # Parts
+        self.part_ref = []
+        self.part_name = []
+        self.part_value = []
+        self.part_fp = []
+        # Pins (pin_net is -1 for unconnected pins)
+        self.pin_part = array('i')
+        self.pin_num = []
+        self.pin_name = []
+        self.pin_func = array('B')
+        self.pin_net = array('i')
+        # Nets (implicit nets keep skidl's N$ name)
+        self.net_name = []
+        self.net_drive = array('B')
+        self.net_implicit = array('B')
+        self._net_pins = None
+        self._part_pins = None
+
+    @property
+    def n_parts(self):
+        return len(self.part_ref)
+
+    @property
+    def n_pins(self):
+        return len(self.pin_num)
+
+    @property
+    def n_nets(self):
+        return len(self.net_name)
+
+    def part_pins(self, part):
+        """Pin indexes of a part"""
+        if self._part_pins is None:
+            self._part_pins = [[] for _ in range(self.n_parts)]
+            for pin, p in enumerate(self.pin_part):
+                self._part_pins[p].append(pin)
+        return self._part_pins[part]
+
+    def net_pins(self, net):
+        """Pin indexes on a net"""
+        if self._net_pins is None:
+            self._net_pins = [[] for _ in range(self.n_nets)]
+            for pin, n in enumerate(self.pin_net):
+                if n >= 0:
+                    self._net_pins[n].append(pin)
+        return self._net_pins[net]
+
+    def net_index(self):
+        """Net name -> net index"""
+        return {name: i for i, name in enumerate(self.net_name)}
+
+    def part_index(self):
+        """Ref -> part index"""
+        return {ref: i for i, ref in enumerate(self.part_ref)}
+
+    def pin_func_name(self, pin):
+        return PIN_FUNCS[self.pin_func[pin]]
+
+    def pin_desc(self, pin):
+        """Human-readable 'REF/num/name' for a pin"""
+        return f"{self.part_ref[self.pin_part[pin]]}/{self.pin_num[pin]}/{self.pin_name[pin]}"
+
+
+def take_snapshot(circuit=None):
+    """Snapshot the given (or default) skidl circuit"""
+    circuit = circuit or builtins.default_circuit
+    snap = Snapshot()
+    net_ids = {}
+    for part_idx, part in enumerate(circuit.parts):
+        snap.part_ref.append(part.ref)
+        snap.part_name.append(part.name)
+        snap.part_value.append(str(getattr(part, 'value', '') or ''))
+        snap.part_fp.append(getattr(part, 'footprint', '') or '')
+        for pin in part.pins:
+            snap.pin_part.append(part_idx)
+            snap.pin_num.append(str(pin.num))
+            snap.pin_name.append(str(pin.name))
+            snap.pin_func.append(FUNC_CODE.get(pin.func.name, FUNC_CODE['UNSPEC']))
+            net_idx = -1
+            if pin.is_connected():
+                net = pin.net
+                net_idx = net_ids.get(id(net))
+                if net_idx is None:
+                    net_idx = len(snap.net_name)
+                    segments = net.nets
+                    for segment in segments:
+                        net_ids[id(segment)] = net_idx
+                    # Shorted named nets get skidl's arbitrary pick; use the lowest name instead
+                    names = sorted(seg.name for seg in segments if not seg.is_implicit())
+                    snap.net_name.append(names[0] if names else min(seg.name for seg in segments))
+                    snap.net_drive.append(min(int(net.drive), 255))
+                    snap.net_implicit.append(0 if names else 1)
+            snap.pin_net.append(net_idx)
+    return snap
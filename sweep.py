@@ -0,0 +1,121 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Parameter sweep: builds design variants of schematic.py in a process pool, one netlist per variant.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: The parent builds the default design once, then forks the pool, so workers inherit parsed libraries, pin tables and the built circuit.
+Note: Variants that differ only in VALUE_PARAMS (r_term, r_ptv, r_zq) re-value the parts of the circuit the worker already holds; other parameters rebuild the circuit from the warm caches.
+Note: Netlists go through incremental.StageCache, so a variant whose design is unchanged since an earlier sweep is restored, not regenerated.
+Usage: python sweep.py r_term=22,34,40 r_zq=240 n_decap_1v0=10,20 [-j 8] [-o sweep]
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import artifacts
+import incremental
+import libcache
+import outputs
+import schematic
+import snapshot
+
+SWEEP_DIR = 'sweep'
+
+_current = {}  # Per process: structure key and parts of the circuit held in memory
+
+
+def grid(axes):
+    """Cartesian product of {param: [values]} as a list of param dicts"""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def variant_id(params):
+    """Short stable id for a parameter set"""
+    full = dict(schematic.DEFAULT_PARAMS, **params)
+    return hashlib.sha1(json.dumps(full, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def structure_key(params):
+    """Parameters that change the netlist structure (everything but VALUE_PARAMS)"""
+    full = dict(schematic.DEFAULT_PARAMS, **params)
+    return tuple(sorted((k, v) for k, v in full.items() if k not in schematic.VALUE_PARAMS))
+
+
+def build_variant(params, out_dir=SWEEP_DIR):
+    """Build (or re-value) one variant and write its netlist; returns a result dict"""
+    start = time.perf_counter()
+    key = structure_key(params)
+    rebuilt = _current.get('key') != key
+    if rebuilt:
+        _current['parts'] = schematic.build_design(params)
+        _current['key'] = key
+    schematic.set_values(_current['parts'], dict(schematic.DEFAULT_PARAMS, **params))
+    vid = variant_id(params)
+    netlist = os.path.join(out_dir, vid, schematic.NETLIST_FILE)
+    os.makedirs(os.path.dirname(netlist), exist_ok=True)
+    design = incremental.Fingerprint(snapshot.take_snapshot())
+    stage = outputs.Stage('netlist', design.key('netlist', extra=[libcache.file_sha256(artifacts.__file__)]), [netlist],
+                          lambda: outputs.generate_netlist(netlist))
+    result = outputs.run_stage(incremental.StageCache(), stage)
+    result.update(id=vid, params=params, design=design.design[:12], rebuilt=rebuilt,
+                  seconds=round(time.perf_counter() - start, 3))
+    return result
+
+
+def _init_worker():
+    sys.stdout = open(os.devnull, 'w')  # skidl is chatty; results come back to the parent
+
+
+def sweep(variants, jobs=None, out_dir=SWEEP_DIR):
+    """Build every variant, writing <out_dir>/<id>/ netlists and <out_dir>/index.json; returns the results"""
+    start = time.perf_counter()
+    variants = list({variant_id(v): v for v in variants}.values())
+    variants.sort(key=lambda v: repr(structure_key(v)))  # Same-structure variants share a worker's circuit
+    _current['parts'] = schematic.build_design()
+    _current['key'] = structure_key({})
+    if jobs == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        results = [build_variant(v, out_dir) for v in variants]
+    else:
+        jobs = jobs or os.cpu_count()
+        chunk = max(1, len(variants) // (jobs * 2))
+        with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context('fork'), initializer=_init_worker) as pool:
+            results = list(pool.map(build_variant, variants, itertools.repeat(out_dir), chunksize=chunk))
+    wall = time.perf_counter() - start
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({'defaults': schematic.DEFAULT_PARAMS, 'seconds': round(wall, 3), 'variants': results}, f, indent=1)
+    for r in results:
+        state = 'cached' if r['cached'] else 'rebuilt' if r['rebuilt'] else 're-valued'
+        print(f"{r['id']} {r['params']}: {'ok' if r['ok'] else 'FAILED'} ({state}, {r['seconds']:.2f} s)"
+              + (f" {r['error']}" if r['error'] else ''))
+    print(f"Sweep: {sum(r['ok'] for r in results)}/{len(results)} variants in {wall:.2f} s -> {out_dir}/index.json")
+    return results
+
+
+def parse_args(argv):
+    """name=v1,v2 axes plus -j N and -o DIR"""
+    axes, jobs, out_dir = {}, None, SWEEP_DIR
+    args = iter(argv)
+    for arg in args:
+        if arg == '-j':
+            jobs = int(next(args))
+        elif arg == '-o':
+            out_dir = next(args)
+        else:
+            name, _, values = arg.partition('=')
+            if name not in schematic.DEFAULT_PARAMS:
+                raise SystemExit(f"Unknown parameter {name!r}; one of {', '.join(schematic.DEFAULT_PARAMS)}")
+            axes[name] = [int(float(v)) if float(v).is_integer() else float(v) for v in values.split(',')]
+    return axes, jobs, out_dir
+
+
+if __name__ == '__main__':
+    axes, jobs, out_dir = parse_args(sys.argv[1:])
+    sweep(grid(axes), jobs, out_dir)
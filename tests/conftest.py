@@ -0,0 +1,11 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+pytest setup: the tools are flat modules at the repository root.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+The union-find fed by Net.connect against Connectivity.rebuild() of the same circuit.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+"""
+
+import random
+
+import pytest
+
+import connectivity
+
+skidl = pytest.importorskip('skidl')
+from skidl.logger import stop_log_file_output  # noqa: E402
+from skidl.net import NCNet  # noqa: E402
+
+stop_log_file_output()  # skidl opens <script>.log/.erc on import; removing the handlers removes them
+
+
+def _partition(conn, circuit):
+    """Net names grouped by domain, for the nets of one circuit"""
+    groups = {}
+    for net in circuit.nets:
+        if not isinstance(net, NCNet):
+            groups.setdefault(conn.domain(net), set()).add(net.name)
+    return sorted(sorted(g) for g in groups.values())
+
+
+def test_tracker_matches_rebuild():
+    connectivity.install()
+    rng = random.Random(3)
+    for _ in range(5):
+        connectivity.reset()
+        circuit = skidl.Circuit()
+        parts = [skidl.Part(tool=skidl.SKIDL, name='R', ref_prefix='R', circuit=circuit,
+                            pins=[skidl.Pin(num=1, name='A'), skidl.Pin(num=2, name='B')]) for _ in range(8)]
+        nets = [skidl.Net(f'N{i}', circuit=circuit) for i in range(12)]
+        for _ in range(10):
+            net = rng.choice(nets)
+            if rng.random() < 0.3:
+                net += rng.choice(nets)
+            else:
+                net += rng.choice(parts)[rng.choice((1, 2))]
+        rebuilt = connectivity.Connectivity()
+        rebuilt.rebuild(circuit)
+        assert _partition(connectivity.tracker(), circuit) == _partition(rebuilt, circuit)
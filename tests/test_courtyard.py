@@ -0,0 +1,59 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+courtyard.GridIndex against brute force, and Checker.move on a two-footprint board.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+"""
+
+import random
+
+import courtyard
+import placement
+
+BOARD = '''(kicad_pcb
+ (footprint "R_0402" (layer "F.Cu") (at 0 0) (property "Reference" "R1")
+  (fp_rect (start -1 -0.5) (end 1 0.5) (layer "F.CrtYd")))
+ (footprint "R_0402" (layer "F.Cu") (at 10 0) (property "Reference" "R2")
+  (fp_rect (start -1 -0.5) (end 1 0.5) (layer "F.CrtYd"))))
+'''
+
+
+def _box(rng):
+    x, y = rng.uniform(-20, 20), rng.uniform(-20, 20)
+    return (x, y, x + rng.uniform(0.1, 8), y + rng.uniform(0.1, 8))
+
+
+def _brute(boxes, box):
+    return sorted(k for k, b in boxes.items() if courtyard._overlap(b, box))
+
+
+def test_grid_query_and_move():
+    rng = random.Random(7)
+    index = courtyard.GridIndex(2.0)
+    boxes = {k: _box(rng) for k in range(200)}
+    for k, box in boxes.items():
+        index.insert(k, box)
+    for _ in range(200):
+        box = _box(rng)
+        assert sorted(index.query(box)) == _brute(boxes, box)
+    for k in rng.sample(sorted(boxes), 50):  # Move = remove + insert, as Checker.move does
+        index.remove(k)
+        boxes[k] = _box(rng)
+        index.insert(k, boxes[k])
+    for _ in range(200):
+        box = _box(rng)
+        assert sorted(index.query(box)) == _brute(boxes, box)
+    assert index.query((100, 100, 101, 101)) == []
+    edge = (boxes[0][2], boxes[0][1], boxes[0][2] + 1, boxes[0][3])  # Touching on the right edge only
+    assert 0 not in index.query(edge)
+
+
+def test_checker_move(tmp_path):
+    path = tmp_path / 'board.kicad_pcb'
+    path.write_text(BOARD)
+    checker = courtyard.Checker(placement.Board(str(path)), {'cell_mm': 2.0, 'clearance_mm': 0.0}, ([], {}))
+    assert checker.report()['overlaps'] == []
+    assert checker.move(0, (9.5, 0)) == ['R2']
+    assert checker.report()['overlaps'] == [['R1', 'R2', 'F']]
+    assert checker.move(0, (-5, 0)) == []
+    assert checker.report()['status'] == 'pass'
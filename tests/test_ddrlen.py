@@ -0,0 +1,39 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+ddrlen track lengths and board copper reading.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+"""
+
+import math
+
+import numpy as np
+
+import ddrlen
+
+
+def _tracks(*segments):
+    return {key: np.array([s[i] for s in segments], float) for i, key in enumerate(('start', 'mid', 'end'))}
+
+
+def test_arc_length():
+    r = math.sqrt(0.5)
+    tracks = _tracks(((0, 0), (1, 1), (2, 0)),  # Half circle, radius 1
+                     ((1, 0), (r, r), (0, 1)),  # Quarter circle, radius 1
+                     ((0, 0), (1, 0), (2, 0)),  # Arc with its mid point on the chord
+                     ((0, 0), (0, 0), (3, 4)))  # Straight segment
+    lengths = ddrlen.track_lengths(tracks, np.array([True, True, True, False]))
+    assert np.allclose(lengths, [math.pi, math.pi / 2, 2, 5])
+
+
+def test_read_copper_nested_via():
+    board = '''(kicad_pcb (net 0 "") (net 1 "DDR_D0_DSP")
+     (segment (start 0 0) (end 10 0) (width 0.1) (layer "F.Cu") (net 1))
+     (arc (start 10 0) (mid 11 1) (end 12 0) (width 0.1) (layer "B.Cu") (net 1))
+     (via (at 12 0) (size 0.6) (layers "F.Cu" "B.Cu") (padstack (mode front_inner_back) (layer "F.Cu" (size 0.6))) (net 1))
+     (via (at 20 0) (size 0.6) (layers "F.Cu" "B.Cu") (net "DDR_D0_DSP"))
+     (gr_text "(via 1" (at 1 1)))'''
+    tracks, vias, nets = ddrlen.read_copper(board, {'DDR_D0_DSP'})
+    assert tracks['layer'] == ['F.Cu', 'B.Cu']
+    assert vias == [('DDR_D0_DSP', 12.0, 0.0), ('DDR_D0_DSP', 20.0, 0.0)]
+    assert nets == {'', 'DDR_D0_DSP'}
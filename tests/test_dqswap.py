@@ -0,0 +1,23 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+dqswap.assign against brute force over every permutation.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+"""
+
+import itertools
+
+import numpy as np
+
+import dqswap
+
+
+def test_assign_brute_force():
+    rng = np.random.default_rng(1)
+    for n in range(1, 7):
+        for _ in range(20):
+            cost = rng.integers(0, 10, (n, n)).astype(float) if n % 2 else rng.random((n, n))
+            col = dqswap.assign(cost)
+            assert sorted(col) == list(range(n))
+            best = min(sum(cost[i, p[i]] for i in range(n)) for p in itertools.permutations(range(n)))
+            assert np.isclose(cost[np.arange(n), col].sum(), best)
@@ -0,0 +1,38 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+netdiff.diff on small hand-built netlists.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+"""
+
+import netdiff
+
+
+def _netlist():
+    return netdiff.Netlist({'R1': ('R', '10k', 'R_0402'), 'R2': ('R', '1k', 'R_0402'), 'C1': ('C', '0.1u', 'C_0402')},
+                           {'VCC': [('R1', '1'), ('C1', '1')], 'OUT': [('R1', '2'), ('R2', '1')],
+                            'GND': [('R2', '2'), ('C1', '2')]})
+
+
+def test_identical():
+    assert not netdiff.changed(netdiff.diff(_netlist(), _netlist()))
+
+
+def test_value_change():
+    new = _netlist()
+    new.parts['R1'] = ('R', '4k7', 'R_0402')
+    result = netdiff.diff(_netlist(), new)
+    assert result['values'] == [{'symbol': 'R', 'footprint': 'R_0402', 'old': '10k', 'new': '4k7', 'count': 1,
+                                 'refs': ['R1']}]
+    assert not result['parts'] and not result['added'] and not result['removed'] and not result['moved']
+
+
+def test_removal():
+    new = _netlist()
+    del new.parts['R2']
+    new.nets['OUT'] = [('R1', '2')]
+    new.nets['GND'] = [('C1', '2')]
+    result = netdiff.diff(_netlist(), new)
+    assert result['parts'] == [{'symbol': 'R', 'value': '1k', 'footprint': 'R_0402', 'count': -1, 'refs': ['R2']}]
+    assert sorted((c['net'], c['pin']) for c in result['removed']) == [('GND', '2'), ('OUT', '1')]
+    assert not result['values'] and not result['added']
@@ -0,0 +1,158 @@
+"""
+Copyright © 2025 DeMoD LLC and Asher LeRoy.
+Watch mode for schematic.py: one warm interpreter that rebuilds the design and its netlist whenever a source changes.
+Licensed under CERN Open Hardware Licence Strongly Reciprocal (CERN-OHL-S) v2.
+See LICENSE file in repository root for full terms.
+Note: Polls schematic.py, the design helper modules, pinouts/, libraries/ and the DQ swap map by mtime (no extra dependency). Changed modules are reloaded in place; skidl's parsed libraries and the LibCache index survive the reload.
+Note: Each rebuild runs build_design() in a reset skidl circuit and writes output/<netlist> first; with --all the schematic and kinet2pcb board follow through incremental.StageCache.
+Usage: python watch.py [-o output] [--all] [--interval 0.3]   (docker: ./run.sh --watch)
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+
+from skidl.schlib import SchLib
+
+import courtyard
+import dqswap
+import incremental
+import outputs
+import libcache
+import pinout
+import placement
+import schematic
+import sexpr
+import snapshot
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODULES = ['pinout', 'bus', 'audio', 'dqswap', 'schematic']  # Reload order: helpers before the design that uses them
+WATCH_DIRS = [pinout.PINOUT_DIR, os.path.join(ROOT, 'libraries')]
+WATCH_FILES = [dqswap.MAP_FILE]  # Design inputs outside the watched directories
+OUTPUT_DIR = 'output'
+
+
+def scan():
+    """{path: mtime_ns} of every watched file"""
+    files = [os.path.join(ROOT, name + '.py') for name in MODULES] + WATCH_FILES
+    for top in WATCH_DIRS:
+        for dirpath, _, names in os.walk(top):
+            files += [os.path.join(dirpath, n) for n in names]
+    state = {}
+    for path in files:
+        try:
+            state[path] = os.stat(path).st_mtime_ns
+        except OSError:  # Deleted between listing and stat
+            pass
+    return state
+
+
+def changes(before, after):
+    """Paths added, removed or modified between two scans"""
+    return sorted(p for p in before.keys() | after.keys() if before.get(p) != after.get(p))
+
+
+def reload_modules(changed):
+    """Reload the changed design modules (and schematic.py after any of them), keeping the warm library caches"""
+    changed = {os.path.splitext(os.path.basename(p))[0] for p in changed if p.endswith('.py')}
+    if not changed:
+        return []
+    libs, parsed = schematic.libs, dict(SchLib._cache)
+    reloaded = [name for name in MODULES if name in changed or name == 'schematic']
+    for name in reloaded:
+        module = sys.modules[name]
+        try:  # The .pyc check is mtime (1 s) + size, so a quick same-size edit would reload stale bytecode
+            os.remove(importlib.util.cache_from_source(module.__file__))
+        except OSError:
+            pass
+        importlib.reload(module)
+    schematic.libs = libs  # Module-level skidl.reset() and LibCache() ran again; put the warm ones back
+    SchLib._cache.update(parsed)
+    return reloaded
+
+
+def rebuild(out_dir, changed=(), all_outputs=False):
+    """Reload what changed, rebuild the design and write the netlist; False on error (the watcher keeps running)"""
+    start = time.perf_counter()
+    try:
+        reload_modules(changed)
+        if any(p.startswith(pinout.PINOUT_DIR) for p in changed):
+            pinout._tables.clear()
+        schematic.build_design()
+        built = time.perf_counter()
+        netlist = os.path.join(out_dir, schematic.NETLIST_FILE)
+        outputs.generate_netlist(netlist)
+    except Exception:
+        traceback.print_exc()
+        print(f"Watch: build failed after {time.perf_counter() - start:.2f} s; waiting for the next change")
+        return False
+    done = time.perf_counter()
+    print(f"Watch: {netlist} in {done - start:.2f} s (build {built - start:.2f} s, netlist {done - built:.2f} s)")
+    if all_outputs:
+        design = incremental.Fingerprint(snapshot.take_snapshot())
+        stages = incremental.StageCache()
+        sch, pcb = os.path.join(out_dir, schematic.SCHEMATIC_FILE), os.path.join(out_dir, schematic.PCB_FILE)
+        pcb_key = design.key('pcb', extra=outputs.FP_LIB_DIRS + [libcache.file_sha256(f) for f in (placement.__file__,
+                                                                                                 sexpr.__file__)])
+        results = outputs.run_parallel(stages, [
+            outputs.Stage('schematic', design.key('schematic'), [sch], lambda: outputs.generate_schematic(sch)),
+            outputs.Stage('pcb', pcb_key, [pcb], lambda: outputs.generate_pcb(netlist, pcb)),
+        ])
+        outputs.report(results, time.perf_counter() - done)
+        report = os.path.join(out_dir, courtyard.REPORT_FILE)
+        if results[-1]['ok'] and stages.run('courtyard', courtyard.stage_key(design, pcb), [report],
+                                            lambda: courtyard.run(pcb, report)):
+            with open(report, encoding='utf-8') as f:
+                courtyard.summary(json.load(f), report)
+    return True
+
+
+def watch(out_dir=OUTPUT_DIR, all_outputs=False, interval=0.3):
+    """Build once, then rebuild on every change until interrupted"""
+    os.makedirs(out_dir, exist_ok=True)
+    state = scan()
+    rebuild(out_dir, all_outputs=all_outputs)
+    print(f"Watch: {len(state)} files under {ROOT}; Ctrl-C to stop")
+    while True:
+        time.sleep(interval)
+        current = scan()
+        changed = changes(state, current)
+        if not changed:
+            continue
+        while True:  # Let editors finish writing (save = truncate + write, or several files at once)
+            time.sleep(interval)
+            settled = scan()
+            if settled == current:
+                break
+            changed = sorted(set(changed) | set(changes(current, settled)))
+            current = settled
+        state = current
+        print(f"Watch: changed {', '.join(os.path.relpath(p, ROOT) for p in changed)}")
+        rebuild(out_dir, changed, all_outputs)
+
+
+def parse_args(argv):
+    """-o DIR, --all and --interval SECONDS"""
+    out_dir, all_outputs, interval = OUTPUT_DIR, False, 0.3
+    args = iter(argv)
+    for arg in args:
+        if arg == '-o':
+            out_dir = next(args)
+        elif arg == '--all':
+            all_outputs = True
+        elif arg == '--interval':
+            interval = float(next(args))
+        else:
+            raise SystemExit(f"Unknown argument {arg!r}; usage: python watch.py [-o DIR] [--all] [--interval S]")
+    return out_dir, all_outputs, interval
+
+
+if __name__ == '__main__':
+    try:
+        watch(*parse_args(sys.argv[1:]))
+    except KeyboardInterrupt:
+        print("Watch: stopped")